@@ -1,7 +1,15 @@
+from numba import njit as jit
 import numpy as np
 from scipy.interpolate import interp1d
 
-__all__ = ["interp1d", "spline_interp", "sinc_interp"]
+__all__ = [
+    "interp1d",
+    "spline_interp",
+    "sinc_interp",
+    "chebyshev_fit",
+    "chebyshev_nodes",
+    "chebyshev_piecewise",
+]
 
 
 def spline_interp(y, x, u, *, kind="cubic"):
@@ -31,3 +39,81 @@ def sinc_interp(y, x, u):
     y_u = y @ np.sinc(sincM / T)
 
     return y_u
+
+
+def chebyshev_nodes(degree):
+    """Chebyshev nodes of the first kind in [-1, 1], in increasing order."""
+    return -np.cos(np.pi * (np.arange(degree + 1) + 0.5) / (degree + 1))
+
+
+def chebyshev_fit(func, bounds, degree):
+    """Fits piecewise Chebyshev series to a function.
+
+    Parameters
+    ----------
+    func : callable
+        Vectorized function receiving an array of points of shape (p,)
+        and returning its values with shape (p, m).
+    bounds : numpy.ndarray
+        Increasing boundaries of the segments, shape (n + 1,).
+    degree : int
+        Degree of the series of every segment.
+
+    Returns
+    -------
+    numpy.ndarray
+        Coefficients of the series of each segment, shape (n, degree + 1, m).
+
+    Notes
+    -----
+    The function is evaluated only once, at the Chebyshev nodes of all
+    the segments at the same time.
+
+    """
+    nodes = chebyshev_nodes(degree)
+    centers = (bounds[:-1] + bounds[1:]) / 2
+    half_widths = np.diff(bounds) / 2
+    points = centers[:, None] + half_widths[:, None] * nodes
+
+    values = np.asarray(func(points.ravel()))
+    values = values.reshape(len(bounds) - 1, degree + 1, -1)
+
+    return np.ascontiguousarray(
+        [np.polynomial.chebyshev.chebfit(nodes, y, degree) for y in values]
+    )
+
+
+@jit
+def chebyshev_piecewise(t, bounds, coeffs):
+    """Evaluates a piecewise Chebyshev series with the Clenshaw recurrence.
+
+    Parameters
+    ----------
+    t : float
+        Evaluation point, values outside of the bounds are extrapolated.
+    bounds : numpy.ndarray
+        Increasing boundaries of the segments, shape (n + 1,).
+    coeffs : numpy.ndarray
+        Coefficients of the series of each segment, shape (n, degree + 1, m).
+
+    Returns
+    -------
+    numpy.ndarray
+        Value of the series, shape (m,).
+
+    """
+    idx = np.searchsorted(bounds, t, side="right") - 1
+    idx = min(max(idx, 0), coeffs.shape[0] - 1)
+
+    # Map the segment to [-1, 1]
+    x = (2 * t - bounds[idx] - bounds[idx + 1]) / (
+        bounds[idx + 1] - bounds[idx]
+    )
+
+    c = coeffs[idx]
+    b1 = np.zeros(c.shape[1])
+    b2 = np.zeros(c.shape[1])
+    for j in range(c.shape[0] - 1, 0, -1):
+        b1, b2 = 2 * x * b1 - b2 + c[j], b1
+
+    return x * b1 - b2 + c[0]
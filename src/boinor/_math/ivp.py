@@ -1,3 +1,470 @@
+import sys
+
+from numba import njit as jit, prange
+import numpy as np
 from scipy.integrate import DOP853, solve_ivp
 
-__all__ = ["DOP853", "solve_ivp"]
+from boinor._math.optimize import brentq_fast
+
+__all__ = [
+    "DOP853",
+    "solve_ivp",
+    "dop853",
+    "dop853_events",
+    "dop853_dense_output",
+    "dop853_dense_output_many",
+]
+
+# Same tableau as scipy, so that both engines take the same steps
+_N_STAGES = DOP853.n_stages
+_ERROR_ORDER = DOP853.error_estimator_order
+_ERROR_EXPONENT = -1 / (_ERROR_ORDER + 1)
+_A = np.ascontiguousarray(DOP853.A)
+_B = np.ascontiguousarray(DOP853.B)
+_C = np.ascontiguousarray(DOP853.C)
+_E3 = np.ascontiguousarray(DOP853.E3)
+_E5 = np.ascontiguousarray(DOP853.E5)
+_D = np.ascontiguousarray(DOP853.D)
+_A_EXTRA = np.ascontiguousarray(DOP853.A_EXTRA)
+_C_EXTRA = np.ascontiguousarray(DOP853.C_EXTRA)
+
+_SAFETY = 0.9
+_MIN_FACTOR = 0.2
+_MAX_FACTOR = 10.0
+
+_EPS = np.finfo(float).eps
+_EVENT_MAXITER = 100
+_NO_EVENTS = np.empty(0)
+
+
+@jit
+def _rms_norm(x):
+    return np.sqrt(x @ x / x.shape[0])
+
+
+@jit
+def _stage_state(K, a, num, h, y):
+    dy = np.zeros_like(y)
+    for j in range(num):
+        dy += a[j] * K[j]
+    return y + h * dy
+
+
+@jit
+def _select_initial_step(f, t0, y0, t_bound, f0, direction, rtol, atol, args):
+    interval_length = abs(t_bound - t0)
+    if interval_length == 0.0:
+        return 0.0
+
+    scale = atol + np.abs(y0) * rtol
+    d0 = _rms_norm(y0 / scale)
+    d1 = _rms_norm(f0 / scale)
+    if d0 < 1e-5 or d1 < 1e-5:
+        h0 = 1e-6
+    else:
+        h0 = 0.01 * d0 / d1
+    h0 = min(h0, interval_length)
+
+    y1 = y0 + h0 * direction * f0
+    f1 = f(t0 + h0 * direction, y1, *args)
+    d2 = _rms_norm((f1 - f0) / scale) / h0
+
+    if d1 <= 1e-15 and d2 <= 1e-15:
+        h1 = max(1e-6, h0 * 1e-3)
+    else:
+        h1 = (0.01 / max(d1, d2)) ** (1 / (_ERROR_ORDER + 1))
+
+    return min(100 * h0, h1, interval_length)
+
+
+@jit
+def _dense_step(t, t_old, h, y_old, F):
+    """Evaluates the interpolant of a single step of :py:func:`dop853`."""
+    if h == 0:
+        return y_old.copy()
+
+    x = (t - t_old) / h
+    y = np.zeros(F.shape[1])
+    for i in range(F.shape[0]):
+        y += F[F.shape[0] - 1 - i]
+        if i % 2 == 0:
+            y *= x
+        else:
+            y *= 1 - x
+
+    return y + y_old
+
+
+@jit
+def _event_value(t, g, g_args, i, t_old, h, y_old, F):
+    """Evaluates the i-th event function at a time within a step."""
+    return g(t, _dense_step(t, t_old, h, y_old, F), *g_args)[i]
+
+
+@jit
+def _event_root(g, g_args, i, t_a, t_b, g_a, g_b, t_old, h, y_old, F):
+    """Locates the root of the i-th event function within a step
+    with Brent's method, evaluating the state with the step interpolant.
+
+    It uses the same tolerances as :py:func:`scipy.integrate.solve_ivp`
+    to locate events.
+
+    """
+    return brentq_fast(
+        _event_value,
+        (g, g_args, i, t_old, h, y_old, F),
+        t_a,
+        t_b,
+        g_a,
+        g_b,
+        4 * _EPS,
+        4 * _EPS,
+        _EVENT_MAXITER,
+    )
+
+
+@jit
+def dop853(f, t0, y0, t_bound, args, rtol, atol):
+    """Integrates an ODE system with the Dormand & Prince method of order 8(5,3).
+
+    This is a compiled version of :py:class:`scipy.integrate.DOP853`, with the
+    same coefficients, step size control and dense output, so that the whole
+    stepping loop runs without returning to Python.
+
+    Parameters
+    ----------
+    f : callable
+        Jitted right-hand side of the system, with signature ``f(t, y, *args)``.
+    t0 : float
+        Initial time.
+    y0 : numpy.ndarray
+        Initial state.
+    t_bound : float
+        Final time, it also determines the direction of the integration.
+    args : tuple
+        Additional arguments passed to ``f``.
+    rtol : float
+        Relative tolerance.
+    atol : float
+        Absolute tolerance.
+
+    Returns
+    -------
+    ts : numpy.ndarray
+        Times of the accepted steps, including ``t0``, shape (n_steps + 1,).
+    ys : numpy.ndarray
+        States at the beginning of each step, shape (n_steps, n).
+    Fs : numpy.ndarray
+        Interpolation coefficients of each step, shape (n_steps, 7, n).
+    success : bool
+        Whether the integration reached ``t_bound``.
+
+    Notes
+    -----
+    The solution at any time within the integration interval can be evaluated
+    with :py:func:`dop853_dense_output`.
+
+    """
+    result = _dop853(
+        f, t0, y0, t_bound, args, rtol, atol, None, (), _NO_EVENTS, _NO_EVENTS
+    )
+    return result[0], result[1], result[2], result[3]
+
+
+@jit
+def dop853_events(
+    f, t0, y0, t_bound, args, rtol, atol, g, g_args, directions, terminal
+):
+    """Integrates an ODE system with :py:func:`dop853`, locating events.
+
+    The event functions are evaluated after every step, and the times where
+    they change sign are located with Brent's method on the interpolant of the
+    step, like :py:func:`scipy.integrate.solve_ivp` does, but without leaving
+    compiled code.
+
+    Parameters
+    ----------
+    f : callable
+        Jitted right-hand side of the system, with signature ``f(t, y, *args)``.
+    t0 : float
+        Initial time.
+    y0 : numpy.ndarray
+        Initial state.
+    t_bound : float
+        Final time, it also determines the direction of the integration.
+    args : tuple
+        Additional arguments passed to ``f``.
+    rtol : float
+        Relative tolerance.
+    atol : float
+        Absolute tolerance.
+    g : callable
+        Jitted event functions, with signature ``g(t, y, *g_args)``,
+        returning the values of all the events as an array of shape (m,).
+    g_args : tuple
+        Additional arguments passed to ``g``.
+    directions : numpy.ndarray
+        Direction of the zero crossings of each event, shape (m,).
+        Positive values only detect increasing crossings,
+        negative values only decreasing ones and zero both.
+    terminal : numpy.ndarray
+        Whether each event stops the integration, shape (m,).
+
+    Returns
+    -------
+    ts : numpy.ndarray
+        Times of the accepted steps, including ``t0``, shape (n_steps + 1,).
+    ys : numpy.ndarray
+        States at the beginning of each step, shape (n_steps, n).
+    Fs : numpy.ndarray
+        Interpolation coefficients of each step, shape (n_steps, 7, n).
+    success : bool
+        Whether the integration reached ``t_bound`` or a terminal event.
+    t_events : numpy.ndarray
+        Times of the events, in the order they happened, shape (p,).
+    i_events : numpy.ndarray
+        Index of the event function of each of them, shape (p,).
+    t_end : float
+        Final time of the integration, which is the time of the terminal
+        event that stopped it, if any. The interpolant of the last step
+        extends beyond it.
+
+    """
+    return _dop853(
+        f, t0, y0, t_bound, args, rtol, atol, g, g_args, directions, terminal
+    )
+
+
+@jit
+def _dop853(
+    f, t0, y0, t_bound, args, rtol, atol, g, g_args, directions, terminal
+):
+    n = y0.shape[0]
+    direction = 1.0 if t_bound >= t0 else -1.0
+
+    t = t0
+    y = y0.astype(np.float64)
+    fy = f(t, y, *args)
+    h_abs = _select_initial_step(
+        f, t0, y, t_bound, fy, direction, rtol, atol, args
+    )
+
+    K = np.empty((_A_EXTRA.shape[1], n))
+    capacity = 64
+    ts = np.empty(capacity + 1)
+    ys = np.empty((capacity, n))
+    Fs = np.empty((capacity, _D.shape[0] + 3, n))
+    ts[0] = t0
+    num_steps = 0
+
+    num_events = directions.shape[0]
+    t_events = np.empty(8)
+    i_events = np.empty(8, dtype=np.int64)
+    count = 0
+    if g is not None:
+        g_old = g(t, y, *g_args)
+
+    success = True
+    while direction * (t - t_bound) < 0:
+        min_step = 10 * abs(np.nextafter(t, direction * np.inf) - t)
+        if h_abs < min_step:
+            h_abs = min_step
+
+        step_accepted = False
+        step_rejected = False
+        while not step_accepted:
+            if h_abs < min_step:
+                success = False
+                break
+
+            h = h_abs * direction
+            t_new = t + h
+            if direction * (t_new - t_bound) > 0:
+                t_new = t_bound
+            h = t_new - t
+            h_abs = abs(h)
+
+            K[0] = fy
+            for s in range(1, _N_STAGES):
+                K[s] = f(t + _C[s] * h, _stage_state(K, _A[s], s, h, y), *args)
+            y_new = _stage_state(K, _B, _N_STAGES, h, y)
+            f_new = f(t + h, y_new, *args)
+            K[_N_STAGES] = f_new
+
+            scale = atol + np.maximum(np.abs(y), np.abs(y_new)) * rtol
+            err5 = np.zeros(n)
+            err3 = np.zeros(n)
+            for s in range(_N_STAGES + 1):
+                err5 += _E5[s] * K[s]
+                err3 += _E3[s] * K[s]
+            err5_norm_2 = np.sum((err5 / scale) ** 2)
+            err3_norm_2 = np.sum((err3 / scale) ** 2)
+            if err5_norm_2 == 0 and err3_norm_2 == 0:
+                error_norm = 0.0
+            else:
+                denom = err5_norm_2 + 0.01 * err3_norm_2
+                error_norm = abs(h) * err5_norm_2 / np.sqrt(denom * n)
+
+            if error_norm < 1:
+                if error_norm == 0:
+                    factor = _MAX_FACTOR
+                else:
+                    factor = min(
+                        _MAX_FACTOR, _SAFETY * error_norm**_ERROR_EXPONENT
+                    )
+                if step_rejected:
+                    factor = min(1.0, factor)
+                h_abs *= factor
+                step_accepted = True
+            else:
+                h_abs *= max(
+                    _MIN_FACTOR, _SAFETY * error_norm**_ERROR_EXPONENT
+                )
+                step_rejected = True
+
+        if not success:
+            break
+
+        # Extra stages for the dense output
+        for s in range(_A_EXTRA.shape[0]):
+            stage = _N_STAGES + 1 + s
+            K[stage] = f(
+                t + _C_EXTRA[s] * h,
+                _stage_state(K, _A_EXTRA[s], stage, h, y),
+                *args,
+            )
+
+        if num_steps == capacity:
+            capacity *= 2
+            new_ts = np.empty(capacity + 1)
+            new_ys = np.empty((capacity, n))
+            new_Fs = np.empty((capacity, Fs.shape[1], n))
+            new_ts[: num_steps + 1] = ts[: num_steps + 1]
+            new_ys[:num_steps] = ys[:num_steps]
+            new_Fs[:num_steps] = Fs[:num_steps]
+            ts, ys, Fs = new_ts, new_ys, new_Fs
+
+        delta_y = y_new - y
+        F = Fs[num_steps]
+        F[0] = delta_y
+        F[1] = h * K[0] - delta_y
+        F[2] = 2 * delta_y - h * (f_new + K[0])
+        for i in range(_D.shape[0]):
+            F[3 + i] = h * _stage_state(K, _D[i], K.shape[0], 1.0, 0 * y)
+        ys[num_steps] = y
+        ts[num_steps + 1] = t_new
+        num_steps += 1
+
+        terminated = False
+        if g is not None:
+            g_new = g(t_new, y_new, *g_args)
+            roots = np.empty(num_events)
+            active = np.empty(num_events, dtype=np.int64)
+            num_active = 0
+            for i in range(num_events):
+                up = g_old[i] <= 0 and g_new[i] >= 0
+                down = g_old[i] >= 0 and g_new[i] <= 0
+                if (
+                    (up and directions[i] > 0)
+                    or (down and directions[i] < 0)
+                    or ((up or down) and directions[i] == 0)
+                ):
+                    roots[num_active] = _event_root(
+                        g, g_args, i, t, t_new, g_old[i], g_new[i], t, h, y, F
+                    )
+                    active[num_active] = i
+                    num_active += 1
+
+            # Events are recorded in the order they happen,
+            # up to the first terminal one
+            order = np.argsort(direction * roots[:num_active])
+            for j in order:
+                if count == t_events.shape[0]:
+                    t_events = np.concatenate((t_events, np.empty(count)))
+                    i_events = np.concatenate(
+                        (i_events, np.empty_like(i_events))
+                    )
+                t_events[count] = roots[j]
+                i_events[count] = active[j]
+                count += 1
+                if terminal[active[j]]:
+                    t_new = roots[j]
+                    y_new = _dense_step(t_new, t, h, y, F)
+                    terminated = True
+                    break
+            g_old = g_new
+
+        t = t_new
+        y = y_new
+        fy = f_new
+        if terminated:
+            break
+
+    if num_steps == 0:
+        # Empty interval, keep a constant solution
+        ys[0] = y
+        Fs[0] = 0.0
+        ts[1] = t
+        num_steps = 1
+
+    return (
+        ts[: num_steps + 1],
+        ys[:num_steps],
+        Fs[:num_steps],
+        success,
+        t_events[:count],
+        i_events[:count],
+        t,
+    )
+
+
+@jit
+def dop853_dense_output(t, ts, ys, Fs):
+    """Evaluates the solution computed by :py:func:`dop853` at a given time.
+
+    Parameters
+    ----------
+    t : float
+        Time, values outside of the integration interval are extrapolated.
+    ts : numpy.ndarray
+        Times of the accepted steps.
+    ys : numpy.ndarray
+        States at the beginning of each step.
+    Fs : numpy.ndarray
+        Interpolation coefficients of each step.
+
+    """
+    num_steps = ys.shape[0]
+
+    # Same segment selection as scipy.integrate.OdeSolution
+    direction = 1.0 if ts[-1] >= ts[0] else -1.0
+    idx = np.searchsorted(direction * ts, direction * t) - 1
+    idx = min(max(idx, 0), num_steps - 1)
+
+    return _dense_step(t, ts[idx], ts[idx + 1] - ts[idx], ys[idx], Fs[idx])
+
+
+@jit(parallel=sys.maxsize > 2**31)
+def dop853_dense_output_many(t, ts, ys, Fs, out):
+    """Evaluates the solution computed by :py:func:`dop853` at several times.
+
+    Parameters
+    ----------
+    t : numpy.ndarray
+        Times, shape (n,).
+    ts : numpy.ndarray
+        Times of the accepted steps.
+    ys : numpy.ndarray
+        States at the beginning of each step.
+    Fs : numpy.ndarray
+        Interpolation coefficients of each step.
+    out : numpy.ndarray
+        Preallocated array of shape (n, m) where the states are written.
+        It is also returned.
+
+    """
+    # Disabling pylint warning, see https://github.com/PyCQA/pylint/issues/2910
+    for i in prange(t.shape[0]):  # pylint: disable=not-an-iterable
+        out[i, :] = dop853_dense_output(t[i], ts, ys, Fs)
+
+    return out
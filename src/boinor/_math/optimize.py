@@ -1,3 +1,90 @@
+from numba import njit as jit
 from scipy.optimize import brentq
 
-__all__ = ["brentq"]
+__all__ = ["brentq", "brentq_fast"]
+
+
+@jit
+def brentq_fast(f, args, xa, xb, fa, fb, xtol, rtol, maxiter):
+    """Finds a root of a function in a bracketing interval with Brent's method.
+
+    This is a compiled version of :py:func:`scipy.optimize.brentq`,
+    which also takes the values of the function at the ends of the interval
+    to avoid evaluating them again, like the event location
+    of :py:func:`~boinor._math.ivp.dop853_events`, which uses it too.
+
+    Parameters
+    ----------
+    f : callable
+        Jitted function ``f(x, *args)`` returning a float.
+    args : tuple
+        Extra arguments of the function.
+    xa, xb : float
+        Ends of the interval.
+    fa, fb : float
+        Values of the function at the ends, of different sign.
+    xtol, rtol : float
+        Absolute and relative tolerances of the root.
+    maxiter : int
+        Maximum number of iterations.
+
+    Returns
+    -------
+    float
+        Root of the function.
+
+    """
+    xpre, xcur = xa, xb
+    fpre, fcur = fa, fb
+    if fpre == 0:
+        return xpre
+    if fcur == 0:
+        return xcur
+
+    xblk = fblk = spre = scur = 0.0
+    for _ in range(maxiter):
+        if fpre != 0 and fcur != 0 and (fpre < 0) != (fcur < 0):
+            xblk = xpre
+            fblk = fpre
+            spre = scur = xcur - xpre
+        if abs(fblk) < abs(fcur):
+            xpre, xcur, xblk = xcur, xblk, xcur
+            fpre, fcur, fblk = fcur, fblk, fcur
+
+        delta = (xtol + rtol * abs(xcur)) / 2
+        sbis = (xblk - xcur) / 2
+        if fcur == 0 or abs(sbis) < delta:
+            break
+
+        if abs(spre) > delta and abs(fcur) < abs(fpre):
+            if xpre == xblk:
+                # Secant
+                stry = -fcur * (xcur - xpre) / (fcur - fpre)
+            else:
+                # Inverse quadratic interpolation
+                dpre = (fpre - fcur) / (xpre - xcur)
+                dblk = (fblk - fcur) / (xblk - xcur)
+                stry = (
+                    -fcur
+                    * (fblk * dblk - fpre * dpre)
+                    / (dblk * dpre * (fblk - fpre))
+                )
+            if 2 * abs(stry) < min(abs(spre), 3 * abs(sbis) - delta):
+                spre = scur
+                scur = stry
+            else:
+                # Bisection
+                spre = scur = sbis
+        else:
+            spre = scur = sbis
+
+        xpre = xcur
+        fpre = fcur
+        if abs(scur) > delta:
+            xcur += scur
+        else:
+            xcur += delta if sbis > 0 else -delta
+
+        fcur = f(xcur, *args)
+
+    return xcur
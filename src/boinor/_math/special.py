@@ -86,3 +86,51 @@ def stumpff_c3(psi):
             delta = (-psi) ** k / gamma(2 * k + 3 + 1)
 
     return res
+
+
+@jit
+def stumpff_c4(psi):
+    r"""Fourth Stumpff function.
+
+    .. math::
+
+        c_4(\psi) = \frac{1/2 - c_2(\psi)}{\psi}
+
+    """
+    eps = 1.0
+    if abs(psi) > eps:
+        res = (1.0 / 2.0 - stumpff_c2(psi)) / psi
+    else:
+        res = 1.0 / 24.0
+        delta = (-psi) / gamma(2 + 4 + 1)
+        k = 1
+        while res + delta != res:
+            res = res + delta
+            k += 1
+            delta = (-psi) ** k / gamma(2 * k + 4 + 1)
+
+    return res
+
+
+@jit
+def stumpff_c5(psi):
+    r"""Fifth Stumpff function.
+
+    .. math::
+
+        c_5(\psi) = \frac{1/6 - c_3(\psi)}{\psi}
+
+    """
+    eps = 1.0
+    if abs(psi) > eps:
+        res = (1.0 / 6.0 - stumpff_c3(psi)) / psi
+    else:
+        res = 1.0 / 120.0
+        delta = (-psi) / gamma(2 + 5 + 1)
+        k = 1
+        while res + delta != res:
+            res = res + delta
+            k += 1
+            delta = (-psi) ** k / gamma(2 * k + 5 + 1)
+
+    return res
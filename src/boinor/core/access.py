@@ -0,0 +1,249 @@
+import sys
+
+from numba import njit as jit, prange
+import numpy as np
+
+from boinor._math.optimize import brentq_fast
+from boinor.core.elements import coe2rv
+from boinor.core.events import event_values
+from boinor.core.propagation.farnocchia import farnocchia_coe
+from boinor.core.propagation.j2_secular import j2_secular_coe
+
+_EPS = np.finfo(float).eps
+_ROOT_MAXITER = 100
+
+
+@jit
+def _analytic_state(k, p, ecc, inc, raan, argp, nu, tof, J2, R):
+    if J2 == 0:
+        nu = farnocchia_coe(k, p, ecc, inc, raan, argp, nu, tof)
+    else:
+        raan, argp, nu = j2_secular_coe(
+            k, p, ecc, inc, raan, argp, nu, tof, J2, R
+        )
+
+    r, v = coe2rv(k, p, ecc, inc, raan, argp, nu)
+    u_ = np.empty(6)
+    u_[:3] = r
+    u_[3:] = v
+    return u_
+
+
+@jit
+def _values(t, k, coe, t0, J2, R, kinds, params, bounds, coeffs):
+    p, ecc, inc, raan, argp, nu = coe
+    u_ = _analytic_state(k, p, ecc, inc, raan, argp, nu, t - t0, J2, R)
+    return event_values(t, u_, k, kinds, params, bounds, coeffs)
+
+
+@jit
+def _value(t, i, k, coe, t0, J2, R, kinds, params, bounds, coeffs):
+    return _values(t, k, coe, t0, J2, R, kinds, params, bounds, coeffs)[i]
+
+
+@jit
+def _orbit_events(
+    k,
+    coe,
+    t0,
+    t_min,
+    t_max,
+    step,
+    J2,
+    R,
+    kinds,
+    params,
+    directions,
+    terminal,
+    bounds,
+    coeffs,
+    fill,
+    t_out,
+    i_out,
+):
+    """Brackets the crossings of the events of one orbit on a uniform grid
+    and, if ``fill`` is True, locates them, writing the times and the
+    indices of the events to ``t_out`` and ``i_out``.
+
+    Returns the number of crossings, the ones after the first terminal
+    event being written as NaN.
+
+    """
+    num_steps = max(int(np.ceil((t_max - t_min) / step)), 1)
+    h = (t_max - t_min) / num_steps
+    args = (k, coe, t0, J2, R, kinds, params, bounds, coeffs)
+
+    count = 0
+    t_a = t_min
+    g_a = _values(t_a, *args)
+    for s in range(1, num_steps + 1):
+        t_b = t_max if s == num_steps else t_min + s * h
+        g_b = _values(t_b, *args)
+
+        first = count
+        t_stop = np.inf
+        for i in range(kinds.shape[0]):
+            # Same convention as scipy.integrate.solve_ivp
+            up = g_a[i] <= 0 and g_b[i] >= 0
+            down = g_a[i] >= 0 and g_b[i] <= 0
+            if not (
+                (up and directions[i] >= 0) or (down and directions[i] <= 0)
+            ):
+                continue
+
+            if fill:
+                t_root = brentq_fast(
+                    _value,
+                    (i,) + args,
+                    t_a,
+                    t_b,
+                    g_a[i],
+                    g_b[i],
+                    4 * _EPS,
+                    4 * _EPS,
+                    _ROOT_MAXITER,
+                )
+                t_out[count] = t_root
+                i_out[count] = i
+                if terminal[i]:
+                    t_stop = min(t_stop, t_root)
+            elif terminal[i]:
+                t_stop = t_b
+            count += 1
+
+        if t_stop < np.inf:
+            for j in range(first, count):
+                if fill and t_out[j] > t_stop:
+                    t_out[j] = np.nan
+            break
+
+        t_a, g_a = t_b, g_b
+
+    return count
+
+
+@jit(parallel=sys.maxsize > 2**31)
+def find_events_many(
+    k,
+    p,
+    ecc,
+    inc,
+    raan,
+    argp,
+    nu,
+    t0,
+    t_min,
+    t_max,
+    steps,
+    J2,
+    R,
+    kinds,
+    params,
+    directions,
+    terminal,
+    bounds,
+    coeffs,
+):
+    """Finds the crossings of compiled events for several orbits
+    propagated analytically.
+
+    The event functions are sampled on a uniform grid of each orbit to
+    bracket their sign changes, which are then located with Brent's method
+    on the analytically propagated state, so no integration is needed.
+    Orbits are propagated with Farnocchia's method if ``J2`` is zero,
+    and with the secular J2 rates otherwise.
+
+    Parameters
+    ----------
+    k : float
+        Standard gravitational parameter (km^3 / s^2).
+    p, ecc, inc, raan, argp, nu : numpy.ndarray
+        Classical orbital elements of each orbit (km, rad), shape (n,).
+    t0 : numpy.ndarray
+        Times of the elements (s), shape (n,).
+    t_min : float
+        Beginning of the search (s), with the same origin as ``t0``.
+    t_max : float
+        End of the search (s), with the same origin as ``t0``.
+    steps : numpy.ndarray
+        Step of the sampling grid of each orbit (s), shape (n,), short enough
+        for every event to change sign at most once per step.
+    J2 : float
+        Oblateness factor, zero for unperturbed motion.
+    R : float
+        Attractor radius (km).
+    kinds, params, directions, terminal, bounds, coeffs : numpy.ndarray
+        Compiled events, see :py:class:`~boinor.core.events.CompiledEvents`,
+        evaluated with the same time origin as ``t0``.
+
+    Returns
+    -------
+    orbit_indices : numpy.ndarray
+        Index of the orbit of each crossing.
+    event_indices : numpy.ndarray
+        Index of the event of each crossing.
+    t_events : numpy.ndarray
+        Time of each crossing (s). Crossings of each orbit come after
+        the ones of the previous orbits, in increasing order of the steps
+        of the grid, and stop at the first terminal event.
+
+    """
+    n = p.shape[0]
+    counts = np.empty(n, dtype=np.int64)
+    no_t = np.empty(0)
+    no_i = np.empty(0, dtype=np.int64)
+
+    # Counts the crossings first, so that every orbit
+    # can write its own slice of the outputs in parallel
+    # Disabling pylint warning, see https://github.com/PyCQA/pylint/issues/2910
+    for i in prange(n):  # pylint: disable=not-an-iterable
+        counts[i] = _orbit_events(
+            k,
+            (p[i], ecc[i], inc[i], raan[i], argp[i], nu[i]),
+            t0[i],
+            t_min,
+            t_max,
+            steps[i],
+            J2,
+            R,
+            kinds,
+            params,
+            directions,
+            terminal,
+            bounds,
+            coeffs,
+            False,
+            no_t,
+            no_i,
+        )
+
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum(counts)
+    t_events = np.empty(offsets[-1])
+    event_indices = np.empty(offsets[-1], dtype=np.int64)
+
+    # Disabling pylint warning, see https://github.com/PyCQA/pylint/issues/2910
+    for i in prange(n):  # pylint: disable=not-an-iterable
+        _orbit_events(
+            k,
+            (p[i], ecc[i], inc[i], raan[i], argp[i], nu[i]),
+            t0[i],
+            t_min,
+            t_max,
+            steps[i],
+            J2,
+            R,
+            kinds,
+            params,
+            directions,
+            terminal,
+            bounds,
+            coeffs,
+            True,
+            t_events[offsets[i] : offsets[i + 1]],
+            event_indices[offsets[i] : offsets[i + 1]],
+        )
+
+    orbit_indices = np.repeat(np.arange(n), counts)
+    found = ~np.isnan(t_events)
+    return orbit_indices[found], event_indices[found], t_events[found]
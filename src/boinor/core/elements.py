@@ -425,6 +425,26 @@ def rv2coe(k, r, v, tol=1e-8):
     return p, ecc, inc, raan, argp, nu
 
 
+@jit(parallel=sys.maxsize > 2**31)
+def rv2coe_many(k, r, v, tol=1e-8):
+    """Parallel version of rv2coe."""
+    n = r.shape[0]
+    p = np.zeros(n)
+    ecc = np.zeros(n)
+    inc = np.zeros(n)
+    raan = np.zeros(n)
+    argp = np.zeros(n)
+    nu = np.zeros(n)
+
+    # Disabling pylint warning, see https://github.com/PyCQA/pylint/issues/2910
+    for i in prange(n):  # pylint: disable=not-an-iterable
+        p[i], ecc[i], inc[i], raan[i], argp[i], nu[i] = rv2coe(
+            k[i], r[i], v[i], tol
+        )
+
+    return p, ecc, inc, raan, argp, nu
+
+
 @jit
 def mee2coe(p, f, g, h, k, L):
     r"""Converts from modified equinoctial orbital elements to classical
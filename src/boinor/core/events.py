@@ -1,10 +1,20 @@
 from numba import njit as jit
 import numpy as np
 
+from boinor._math.interpolate import chebyshev_piecewise
 from boinor._math.linalg import norm
 from boinor.core.elements import coe_rotation_matrix, rv2coe
+from boinor.core.spheroid_location import cartesian_to_ellipsoidal
 from boinor.core.util import planetocentric_to_AltAz
 
+# Kinds of the compiled events, see event_values
+ALTITUDE_EVENT = 0
+LATITUDE_EVENT = 1
+NODE_EVENT = 2
+PENUMBRA_EVENT = 3
+UMBRA_EVENT = 4
+LOS_EVENT = 5
+
 
 @jit
 def eclipse_function(k, u_, r_sec, R_sec, R_primary, umbra=True):
@@ -135,3 +145,138 @@ def elevation_function(k, u_, phi, theta, R, R_p, H):
     el = np.arcsin(new_rho[-1])
 
     return el
+
+
+@jit
+def _table_position(t, param, bounds, coeffs):
+    j, n = int(param[0]), int(param[1])
+    return chebyshev_piecewise(t, bounds[j, : n + 1], coeffs[j, :n])
+
+
+@jit
+def event_values(t, u_, k, kinds, params, bounds, coeffs):
+    """Evaluates several compiled event functions at once.
+
+    Parameters
+    ----------
+    t : float
+        Time (s).
+    u_ : numpy.ndarray
+        Satellite position and velocity vector with respect to the primary body.
+    k : float
+        Standard gravitational parameter (km^3 / s^2).
+    kinds : numpy.ndarray
+        Kind of each event, shape (m,), one of the ``*_EVENT`` constants.
+    params : numpy.ndarray
+        Parameters of each event, shape (m, p):
+
+        * ``ALTITUDE_EVENT``: threshold radius (km).
+        * ``LATITUDE_EVENT``: equatorial and polar radii of the attractor
+          and threshold latitude (deg).
+        * ``NODE_EVENT``: none.
+        * ``PENUMBRA_EVENT``, ``UMBRA_EVENT``: index and number of segments
+          of the table of positions of the secondary body, its radius and
+          the one of the primary body (km).
+        * ``LOS_EVENT``: index and number of segments of the table of
+          positions of the other body and radius of the attractor (km).
+
+    bounds : numpy.ndarray
+        Boundaries of the segments of each table of positions,
+        shape (q, n + 1), only the first ones are used by shorter tables.
+    coeffs : numpy.ndarray
+        Tables of positions (km) with respect to the primary body, as
+        piecewise Chebyshev series, shape (q, n, degree + 1, 3),
+        see :py:func:`~boinor._math.interpolate.chebyshev_piecewise`.
+
+    Returns
+    -------
+    numpy.ndarray
+        Values of the event functions, shape (m,).
+
+    """
+    values = np.empty(kinds.shape[0])
+    for i in range(kinds.shape[0]):
+        kind = kinds[i]
+        param = params[i]
+        if kind == ALTITUDE_EVENT:
+            values[i] = norm(u_[:3]) - param[0]
+        elif kind == LATITUDE_EVENT:
+            pos_on_body = u_[:3] / norm(u_[:3]) * param[0]
+            _, lat, _ = cartesian_to_ellipsoidal(
+                param[0],
+                param[1],
+                pos_on_body[0],
+                pos_on_body[1],
+                pos_on_body[2],
+            )
+            values[i] = np.rad2deg(lat) - param[2]
+        elif kind == NODE_EVENT:
+            values[i] = u_[2]
+        elif kind == PENUMBRA_EVENT or kind == UMBRA_EVENT:
+            r_sec = _table_position(t, param, bounds, coeffs)
+            values[i] = eclipse_function(
+                k, u_, r_sec, param[2], param[3], kind == UMBRA_EVENT
+            )
+        elif kind == LOS_EVENT:
+            r_other = _table_position(t, param, bounds, coeffs)
+            values[i] = line_of_sight(u_[:3], r_other, param[2])
+        else:
+            values[i] = np.nan
+
+    return values
+
+
+class CompiledEvents:
+    """Events evaluated by :py:func:`event_values` inside the compiled integrator.
+
+    Instead of creating them directly, use
+    :py:func:`~boinor.twobody.events.compile_events`.
+
+    Parameters
+    ----------
+    kinds : numpy.ndarray
+        Kind of each event, shape (m,).
+    params : numpy.ndarray
+        Parameters of each event, shape (m, p).
+    directions : numpy.ndarray
+        Direction of the zero crossings detected for each event, shape (m,).
+    terminal : numpy.ndarray
+        Whether each event stops the integration, shape (m,).
+    bounds : numpy.ndarray
+        Boundaries of the segments of each table of positions, shape (q, n + 1).
+    coeffs : numpy.ndarray
+        Tables of positions, shape (q, n, degree + 1, 3).
+
+    Attributes
+    ----------
+    t_events : list
+        Times (s) of the zero crossings of each event found by
+        the last integration.
+    last_t : float
+        Final time (s) of the last integration, which is the time of the
+        terminal event that stopped it, if any.
+
+    """
+
+    def __init__(self, kinds, params, directions, terminal, bounds, coeffs):
+        self.kinds = np.asarray(kinds, dtype=np.int64)
+        self.params = np.asarray(params, dtype=np.float64)
+        self.directions = np.asarray(directions, dtype=np.float64)
+        self.terminal = np.asarray(terminal, dtype=np.bool_)
+        self.bounds = np.asarray(bounds, dtype=np.float64)
+        self.coeffs = np.asarray(coeffs, dtype=np.float64)
+
+        self.t_events = [np.empty(0) for _ in self.kinds]
+        self.last_t = None
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def g_args(self, k):
+        """Arguments of :py:func:`event_values` after the state."""
+        return (k, self.kinds, self.params, self.bounds, self.coeffs)
+
+    def record(self, t_events, i_events, last_t):
+        """Stores the events found by an integration."""
+        self.t_events = [t_events[i_events == i] for i in range(len(self))]
+        self.last_t = last_t
@@ -5,6 +5,9 @@ import numpy as np
 from numpy import cross
 
 from boinor._math.linalg import norm
+from boinor._math.optimize import brentq_fast
+
+_ROOT_MAXITER = 100
 
 
 @jit
@@ -69,3 +72,87 @@ def compute_flyby(v_spacecraft, v_body, k, r_p, theta):
     v_spacecraft_out = v_inf_2 + v_body
 
     return v_spacecraft_out, delta
+
+
+@jit
+def _turn_residual(r_p, v_inf_in, v_inf_out, k, alpha):
+    """Difference between the turn angle of a flyby with an impulse
+    at periapsis ``r_p`` and the required one.
+
+    """
+    ecc_in = 1 + r_p * v_inf_in**2 / k
+    ecc_out = 1 + r_p * v_inf_out**2 / k
+    return np.arcsin(1 / ecc_in) + np.arcsin(1 / ecc_out) - alpha
+
+
+@jit
+def powered_flyby(v_inf_in, v_inf_out, k, r_p_min):
+    """Computes the impulse at periapsis needed to connect an inbound
+    and an outbound hyperbolic excess velocity with a flyby.
+
+    The periapsis radius is the one for which the inbound and outbound
+    hyperbolas, sharing their periapsis, turn the excess velocity by the
+    angle between both vectors. The impulse is the difference of their
+    velocities at periapsis, zero for unpowered flybys, which only
+    need both excess velocities to have the same magnitude.
+
+    Parameters
+    ----------
+    v_inf_in : numpy.ndarray
+        Inbound hyperbolic excess velocity (km / s).
+    v_inf_out : numpy.ndarray
+        Outbound hyperbolic excess velocity (km / s).
+    k : float
+        Standard gravitational parameter of the body (km^3 / s^2).
+    r_p_min : float
+        Minimum radius of periapsis, measured from the center
+        of the body (km).
+
+    Returns
+    -------
+    dv : float
+        Impulse at periapsis (km / s), NaN if the body cannot turn the
+        excess velocity enough without going below ``r_p_min``.
+    r_p : float
+        Radius of periapsis (km), NaN if the flyby is not feasible.
+
+    """
+    v_in = norm(v_inf_in)
+    v_out = norm(v_inf_out)
+    cos_alpha = v_inf_in @ v_inf_out / (v_in * v_out)
+    alpha = np.arccos(min(max(cos_alpha, -1.0), 1.0))
+    args = (v_in, v_out, k, alpha)
+
+    # The turn angle decreases with the radius of periapsis
+    r_a, f_a = r_p_min, _turn_residual(r_p_min, *args)
+    if not f_a >= 0:
+        return np.nan, np.nan
+
+    r_b, f_b = r_a, f_a
+    for _ in range(_ROOT_MAXITER):
+        if f_b <= 0:
+            break
+        r_a, f_a = r_b, f_b
+        r_b *= 2
+        f_b = _turn_residual(r_b, *args)
+
+    if f_b > 0:
+        # Almost no turn, the impulse tends to the difference of speeds
+        r_p = r_b
+    else:
+        r_p = brentq_fast(
+            _turn_residual,
+            args,
+            r_a,
+            r_b,
+            f_a,
+            f_b,
+            1e-12 * r_p_min,
+            4 * np.finfo(np.float64).eps,
+            _ROOT_MAXITER,
+        )
+
+    dv = abs(
+        np.sqrt(v_out**2 + 2 * k / r_p) - np.sqrt(v_in**2 + 2 * k / r_p)
+    )
+    return dv, r_p
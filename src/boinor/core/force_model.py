@@ -0,0 +1,172 @@
+"""Composition of perturbations into a single compiled right-hand side."""
+
+import functools
+import inspect
+
+from numba import njit as jit
+from numba.extending import is_jitted
+import numpy as np
+
+from boinor.core.propagation.base import func_twobody
+
+
+@jit
+def _no_acceleration(t0, state, k, params):
+    return np.zeros(3)
+
+
+@functools.lru_cache(maxsize=None)
+def _compiled(func):
+    return func if is_jitted(func) else jit(func)
+
+
+@functools.lru_cache(maxsize=None)
+def _acceleration(funcs):
+    """Sum of the accelerations of ``funcs``, whose parameters are passed
+    at runtime as a tuple with the arguments of each of them, so that it is
+    compiled once for every combination of functions and parameter types.
+
+    """
+    if not funcs:
+        return _no_acceleration
+
+    func, rest = funcs[0], _acceleration(funcs[1:])
+
+    @jit
+    def acceleration(t0, state, k, params):
+        return func(t0, state, k, *params[0]) + rest(
+            t0, state, k, params[1:]
+        )
+
+    return acceleration
+
+
+@functools.lru_cache(maxsize=None)
+def _rhs(funcs):
+    acceleration = _acceleration(funcs)
+
+    @jit
+    def f(t0, u_, k, params):
+        du = func_twobody(t0, u_, k)
+        du[3:] += acceleration(t0, u_, k, params)
+        return du
+
+    return f
+
+
+def _bind(f, params):
+    @jit
+    def bound(t0, u_, k):
+        return f(t0, u_, k, params)
+
+    return bound
+
+
+@functools.lru_cache(maxsize=None)
+def _bind_cached(f, params):
+    return _bind(f, params)
+
+
+def _bound_rhs(funcs, params):
+    f = _rhs(funcs)
+    try:
+        return _bind_cached(f, params)
+    except TypeError:
+        # Unhashable parameters, like arrays
+        return _bind(f, params)
+
+
+class ForceModel:
+    """Two-body dynamics plus a set of perturbing accelerations.
+
+    The perturbations are functions with the signature of the ones in
+    :py:mod:`boinor.core.perturbations`, that is ``func(t0, state, k, **params)``,
+    returning the acceleration in km / s2. Their parameters are fixed when they
+    are added to the model, and all of them are compiled into a single jitted
+    right-hand side, so that one call computes the whole acceleration.
+    The compiled code only depends on the functions and the types of their
+    parameters, so models that differ in the values of the parameters reuse it,
+    and models with the same hashable parameters share their right-hand side.
+
+    Parameters
+    ----------
+    perturbations : list, optional
+        Pairs of perturbation function and dictionary of parameters.
+
+    Examples
+    --------
+    >>> from astropy import units as u
+    >>> from boinor.bodies import Earth
+    >>> from boinor.core.perturbations import J2_perturbation
+    >>> model = ForceModel().add(
+    ...     J2_perturbation, J2=Earth.J2.value, R=Earth.R.to_value(u.km)
+    ... )
+
+    Notes
+    -----
+    Perturbations that are not jitted, like
+    :py:func:`~boinor.core.perturbations.third_body`, are compiled when added,
+    so any callable parameter (for instance the position of the perturbing body)
+    must be a jitted function too, like the ones built by
+    :py:func:`~boinor.ephem.build_chebyshev_interpolant`.
+
+    """
+
+    def __init__(self, perturbations=()):
+        self._perturbations = []
+        funcs, args = [], []
+        for func, params in perturbations:
+            args.append(self._bind_params(func, params))
+            funcs.append(_compiled(func))
+            self._perturbations.append((func, dict(params)))
+
+        self._f = _bound_rhs(tuple(funcs), tuple(args))
+
+    @staticmethod
+    def _bind_params(func, params):
+        signature = inspect.signature(getattr(func, "py_func", func))
+        try:
+            bound = signature.bind(None, None, None, **params)
+        except TypeError as e:
+            raise ValueError(
+                f"Wrong parameters for {func.__name__}: {e}"
+            ) from None
+
+        args = bound.args[3:]
+        for name, value in zip(list(signature.parameters)[3:], args):
+            if callable(value) and not is_jitted(value):
+                raise ValueError(
+                    f"Parameter {name} of {func.__name__} must be a jitted function"
+                )
+
+        return args
+
+    @property
+    def perturbations(self):
+        """Pairs of perturbation function and parameters of the model."""
+        return list(self._perturbations)
+
+    @property
+    def f(self):
+        """Jitted right-hand side, with signature ``f(t0, u_, k)``."""
+        return self._f
+
+    def add(self, func, **params):
+        """Returns a new model including an additional perturbation.
+
+        Parameters
+        ----------
+        func : callable
+            Perturbation function, with signature ``func(t0, state, k, **params)``.
+        **params
+            Parameters of the perturbation.
+
+        """
+        return ForceModel(self._perturbations + [(func, params)])
+
+    def __call__(self, t0, u_, k):
+        return self._f(t0, u_, k)
+
+    def __repr__(self):
+        names = ", ".join(func.__name__ for func, _ in self._perturbations)
+        return f"ForceModel([{names}])"
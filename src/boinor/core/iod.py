@@ -1,10 +1,19 @@
-from numba import njit as jit
+import sys
+
+from numba import njit as jit, prange
 import numpy as np
 from numpy import cross, pi
 
 from boinor._math.linalg import norm
 from boinor._math.special import hyp2f1b, stumpff_c2 as c2, stumpff_c3 as c3
 
+# Status of the solutions of the Lambert solvers, see izzo_many and vallado_many
+LAMBERT_CONVERGED = 0
+LAMBERT_NOT_CONVERGED = 1
+LAMBERT_NO_SOLUTION = 2
+LAMBERT_DEGENERATE = 3
+LAMBERT_INVALID = 4
+
 
 @jit
 def vallado(k, r0, r, tof, M, prograde, lowpath, numiter, rtol):
@@ -101,12 +110,32 @@ def vallado(k, r0, r, tof, M, prograde, lowpath, numiter, rtol):
     in the same book under name Example 5.2.
 
     """
+    v0, v, status = _vallado(
+        k, r0, r, tof, M, prograde, lowpath, numiter, rtol
+    )
+
     # TODO: expand for the multi-revolution case.
     # Issue: https://github.com/poliastro/poliastro/issues/858
-    if M > 0:
+    if status == LAMBERT_NO_SOLUTION:
         raise NotImplementedError(
             "Multi-revolution scenario not supported for Vallado. See issue https://github.com/poliastro/poliastro/issues/858"
         )
+    if status == LAMBERT_DEGENERATE:
+        raise RuntimeError("Cannot compute orbit, phase angle is 180 degrees")
+    if status == LAMBERT_NOT_CONVERGED:
+        raise RuntimeError("Maximum number of iterations reached")
+
+    return v0, v
+
+
+@jit
+def _vallado(k, r0, r, tof, M, prograde, lowpath, numiter, rtol):
+    """Solves the Lambert's problem with Vallado's algorithm,
+    returning a status instead of raising, see :py:func:`vallado`.
+
+    """
+    if M > 0:
+        return np.full(3, np.nan), np.full(3, np.nan), LAMBERT_NO_SOLUTION
 
     t_m = 1 if prograde else -1
 
@@ -120,7 +149,7 @@ def vallado(k, r0, r, tof, M, prograde, lowpath, numiter, rtol):
     A = t_m * (norm_r * norm_r0 * (1 + cos_dnu)) ** 0.5
 
     if A == 0.0:
-        raise RuntimeError("Cannot compute orbit, phase angle is 180 degrees")
+        return np.full(3, np.nan), np.full(3, np.nan), LAMBERT_DEGENERATE
 
     psi = 0.0
     psi_low = -4 * np.pi**2
@@ -159,7 +188,7 @@ def vallado(k, r0, r, tof, M, prograde, lowpath, numiter, rtol):
 
         psi = (psi_up + psi_low) / 2
     else:
-        raise RuntimeError("Maximum number of iterations reached")
+        return np.full(3, np.nan), np.full(3, np.nan), LAMBERT_NOT_CONVERGED
 
     f = 1 - y / norm_r0
     g = A * np.sqrt(y / k)
@@ -169,7 +198,41 @@ def vallado(k, r0, r, tof, M, prograde, lowpath, numiter, rtol):
     v0 = (r - f * r0) / g
     v = (gdot * r - r0) / g
 
-    return v0, v
+    return v0, v, LAMBERT_CONVERGED
+
+
+@jit(parallel=sys.maxsize > 2**31)
+def vallado_many(k, r1, r2, tof, M, prograde, lowpath, numiter, rtol):
+    """Parallel version of vallado.
+
+    The position vectors are arrays of shape (n, 3) and the times of flight
+    an array of shape (n,), one entry per case, while the rest of the
+    arguments are shared. Instead of raising, the status of each case
+    is returned, one of the ``LAMBERT_*`` constants, and the velocity
+    vectors of the cases which did not converge are NaN.
+
+    Returns
+    -------
+    v1 : numpy.ndarray
+        Initial velocity vectors, shape (n, 3).
+    v2 : numpy.ndarray
+        Final velocity vectors, shape (n, 3).
+    status : numpy.ndarray
+        Status of each case, shape (n,).
+
+    """
+    n = tof.shape[0]
+    v1 = np.empty((n, 3))
+    v2 = np.empty((n, 3))
+    status = np.empty(n, dtype=np.int64)
+
+    # Disabling pylint warning, see https://github.com/PyCQA/pylint/issues/2910
+    for i in prange(n):  # pylint: disable=not-an-iterable
+        v1[i], v2[i], status[i] = _vallado(
+            k, r1[i], r2[i], tof[i], M, prograde, lowpath, numiter, rtol
+        )
+
+    return v1, v2, status
 
 
 @jit
@@ -210,12 +273,68 @@ def izzo(k, r1, r2, tof, M, prograde, lowpath, numiter, rtol):
     assert tof > 0
     assert k > 0
 
-    # Check collinearity of r1 and r2
-    if not cross(r1, r2).any():
+    v1, v2, status = _izzo(k, r1, r2, tof, M, prograde, lowpath, numiter, rtol)
+
+    if status == LAMBERT_DEGENERATE:
         raise ValueError(
             "Lambert solution cannot be computed for collinear vectors"
         )
+    if status == LAMBERT_NO_SOLUTION:
+        raise ValueError("No feasible solution, try lower M")
+    if status == LAMBERT_NOT_CONVERGED:
+        raise RuntimeError("Failed to converge")
+
+    return v1, v2
+
+
+@jit
+def _izzo(k, r1, r2, tof, M, prograde, lowpath, numiter, rtol):
+    """Solves the Lambert's problem with Izzo's algorithm,
+    returning a status instead of raising, see :py:func:`izzo`.
+
+    """
+    v1, v2, _, status = _izzo_warm(
+        k, r1, r2, tof, M, prograde, lowpath, numiter, rtol, np.nan
+    )
+    return v1, v2, status
+
+
+@jit
+def _izzo_warm(k, r1, r2, tof, M, prograde, lowpath, numiter, rtol, x_0):
+    """Solves the Lambert's problem with Izzo's algorithm starting
+    the iterations from ``x_0``, if it is not NaN, for instance the
+    solution of a close problem, and also returns the solution ``x``.
+
+    """
+    if not (tof > 0 and k > 0):
+        return np.full(3, np.nan), np.full(3, np.nan), np.nan, LAMBERT_INVALID
+
+    # Check collinearity of r1 and r2
+    if not cross(r1, r2).any():
+        return (
+            np.full(3, np.nan),
+            np.full(3, np.nan),
+            np.nan,
+            LAMBERT_DEGENERATE,
+        )
+
+    ll, T, geometry = _izzo_geometry(k, r1, r2, tof, prograde)
+
+    # Find solutions
+    x, y, status = _find_xy(ll, T, M, numiter, lowpath, rtol, x_0)
+    if status != LAMBERT_CONVERGED:
+        return np.full(3, np.nan), np.full(3, np.nan), np.nan, status
+
+    v1, v2 = _izzo_velocities(x, y, ll, geometry)
+    return v1, v2, x, LAMBERT_CONVERGED
 
+
+@jit
+def _izzo_geometry(k, r1, r2, tof, prograde):
+    """Computes the non dimensional transfer angle parameter and time
+    of flight, and the quantities needed to reconstruct the velocities.
+
+    """
     # Chord
     c = r2 - r1
     c_norm, r1_norm, r2_norm = norm(c), norm(r1), norm(r2)
@@ -244,26 +363,130 @@ def izzo(k, r1, r2, tof, M, prograde, lowpath, numiter, rtol):
     # Non dimensional time of flight
     T = np.sqrt(2 * k / s**3) * tof
 
-    # Find solutions
-    x, y = _find_xy(ll, T, M, numiter, lowpath, rtol)
-
-    # Reconstruct
     gamma = np.sqrt(k * s / 2)
     rho = (r1_norm - r2_norm) / c_norm
     sigma = np.sqrt(1 - rho**2)
 
+    return ll, T, (r1_norm, r2_norm, i_r1, i_r2, i_t1, i_t2, gamma, rho, sigma)
+
+
+@jit
+def _izzo_velocities(x, y, ll, geometry):
+    """Reconstructs the initial and final velocity vectors."""
+    r1_norm, r2_norm, i_r1, i_r2, i_t1, i_t2, gamma, rho, sigma = geometry
+
     # Compute the radial and tangential components at r0 and r
     V_r1, V_r2, V_t1, V_t2 = _reconstruct(
         x, y, r1_norm, r2_norm, ll, gamma, rho, sigma
     )
 
     # Solve for the initial and final velocity
-    v1 = V_r1 * (r1 / r1_norm) + V_t1 * i_t1
-    v2 = V_r2 * (r2 / r2_norm) + V_t2 * i_t2
+    v1 = V_r1 * i_r1 + V_t1 * i_t1
+    v2 = V_r2 * i_r2 + V_t2 * i_t2
 
     return v1, v2
 
 
+@jit
+def _izzo_min_dv(k, r1, r2, tof, v1_ref, v2_ref, M, prograde, numiter, rtol):
+    """Solves all the branches of the Lambert's problem with Izzo's algorithm
+    up to ``M`` revolutions, keeping the one with the smallest sum of
+    the norms of the departure and arrival impulses.
+
+    The impulses are the differences between the velocities of the
+    transfer and the reference velocities ``v1_ref`` and ``v2_ref``.
+    The geometry and the maximum number of revolutions are computed once,
+    and the single revolution branch is solved only once,
+    since its solution does not depend on the path.
+
+    Returns
+    -------
+    v1, v2 : numpy.ndarray
+        Initial and final velocity vectors of the best branch.
+    status : int
+        Status of the best branch, or the one of the single revolution
+        branch if none converged.
+    revs : int
+        Number of revolutions of the best branch, -1 if none converged.
+    lowpath : bool
+        Path of the best branch.
+
+    """
+    v1_best, v2_best = np.full(3, np.nan), np.full(3, np.nan)
+    if not (tof > 0 and k > 0):
+        return v1_best, v2_best, LAMBERT_INVALID, -1, True
+    if not cross(r1, r2).any():
+        return v1_best, v2_best, LAMBERT_DEGENERATE, -1, True
+
+    ll, T, geometry = _izzo_geometry(k, r1, r2, tof, prograde)
+    if not abs(ll) < 1:
+        return v1_best, v2_best, LAMBERT_DEGENERATE, -1, True
+    M_max = _max_revolutions(ll, T, numiter, rtol)
+
+    status = LAMBERT_NOT_CONVERGED
+    dv_best = np.inf
+    revs_best, lowpath_best = -1, True
+    for revs in range(int(min(M, M_max)) + 1):
+        for lowpath in (True, False):
+            if revs == 0 and not lowpath:
+                continue
+
+            x = _householder(
+                _initial_guess(T, ll, revs, lowpath),
+                T,
+                ll,
+                revs,
+                rtol,
+                numiter,
+            )
+            if np.isnan(x):
+                continue
+
+            v1, v2 = _izzo_velocities(x, _compute_y(x, ll), ll, geometry)
+            dv = norm(v1 - v1_ref) + norm(v2_ref - v2)
+            if dv < dv_best:
+                dv_best = dv
+                v1_best, v2_best = v1, v2
+                revs_best, lowpath_best = revs, lowpath
+                status = LAMBERT_CONVERGED
+
+    return v1_best, v2_best, status, revs_best, lowpath_best
+
+
+@jit(parallel=sys.maxsize > 2**31)
+def izzo_many(k, r1, r2, tof, M, prograde, lowpath, numiter, rtol):
+    """Parallel version of izzo.
+
+    The position vectors are arrays of shape (n, 3) and the times of flight
+    an array of shape (n,), one entry per case, while the rest of the
+    arguments are shared. Instead of raising, the status of each case
+    is returned, one of the ``LAMBERT_*`` constants, and the velocity
+    vectors of the cases which did not converge are NaN.
+
+    Returns
+    -------
+    v1 : numpy.ndarray
+        Initial velocity vectors, shape (n, 3).
+    v2 : numpy.ndarray
+        Final velocity vectors, shape (n, 3).
+    status : numpy.ndarray
+        Status of each case, shape (n,).
+
+    """
+    n = tof.shape[0]
+    v1 = np.empty((n, 3))
+    v2 = np.empty((n, 3))
+    status = np.empty(n, dtype=np.int64)
+
+    # Disabling pylint warning, see https://github.com/PyCQA/pylint/issues/2910
+    for i in prange(n):  # pylint: disable=not-an-iterable
+        v1[i], v2[i], status[i] = _izzo(
+            k, r1[i], r2[i], tof[i], M, prograde, lowpath, numiter, rtol
+        )
+
+    return v1, v2, status
+
+
 @jit
 def _reconstruct(x, y, r1, r2, ll, gamma, rho, sigma):
     """Reconstruct solution velocity vectors."""
@@ -275,34 +498,60 @@ def _reconstruct(x, y, r1, r2, ll, gamma, rho, sigma):
 
 
 @jit
-def _find_xy(ll, T, M, numiter, lowpath, rtol):
-    """Computes all x, y for given number of revolutions."""
-    # For abs(ll) == 1 the derivative is not continuous
-    assert abs(ll) < 1
-    assert T > 0  # Mistake in the original paper
+def _find_xy(ll, T, M, numiter, lowpath, rtol, x_0=np.nan):
+    """Computes all x, y for given number of revolutions,
+    and the status of the solution.
 
-    M_max = np.floor(T / pi)
-    T_00 = np.arccos(ll) + ll * np.sqrt(1 - ll**2)  # T_xM
+    The iterations start from ``x_0``, or from the initial guess
+    of the paper if it is NaN.
 
-    # Refine maximum number of revolutions if necessary
-    if T < T_00 + M_max * pi and M_max > 0:
-        _, T_min = _compute_T_min(ll, M_max, numiter, rtol)
-        if T < T_min:
-            M_max -= 1
+    """
+    # For abs(ll) == 1 the derivative is not continuous
+    if not abs(ll) < 1:
+        return np.nan, np.nan, LAMBERT_DEGENERATE
+    if not T > 0:  # Mistake in the original paper
+        return np.nan, np.nan, LAMBERT_INVALID
+
+    M_max = _max_revolutions(ll, T, numiter, rtol)
+    if M_max < 0:
+        return np.nan, np.nan, LAMBERT_NOT_CONVERGED
 
     # Check if a feasible solution exist for the given number of revolutions
     # This departs from the original paper in that we do not compute all solutions
     if M > M_max:
-        raise ValueError("No feasible solution, try lower M")
+        return np.nan, np.nan, LAMBERT_NO_SOLUTION
 
     # Initial guess
-    x_0 = _initial_guess(T, ll, M, lowpath)
+    if np.isnan(x_0):
+        x_0 = _initial_guess(T, ll, M, lowpath)
 
     # Start Householder iterations from x_0 and find x, y
     x = _householder(x_0, T, ll, M, rtol, numiter)
+    if np.isnan(x):
+        return np.nan, np.nan, LAMBERT_NOT_CONVERGED
     y = _compute_y(x, ll)
 
-    return x, y
+    return x, y, LAMBERT_CONVERGED
+
+
+@jit
+def _max_revolutions(ll, T, numiter, rtol):
+    """Computes the maximum number of revolutions of the solutions,
+    or -1 if the minimum time of flight did not converge.
+
+    """
+    M_max = np.floor(T / pi)
+    T_00 = np.arccos(ll) + ll * np.sqrt(1 - ll**2)  # T_xM
+
+    # Refine maximum number of revolutions if necessary
+    if T < T_00 + M_max * pi and M_max > 0:
+        _, T_min = _compute_T_min(ll, M_max, numiter, rtol)
+        if np.isnan(T_min):
+            return -1.0
+        if T < T_min:
+            M_max -= 1
+
+    return M_max
 
 
 @jit
@@ -443,7 +692,8 @@ def _halley(p0, T0, ll, tol, maxiter):
     Notes
     -----
     This function is private because it assumes a calling convention specific to
-    this module and is not really reusable.
+    this module and is not really reusable. It returns NaN if it fails
+    to converge, so that it can run in parallel loops.
 
     """
     for _ii in range(maxiter):
@@ -451,7 +701,8 @@ def _halley(p0, T0, ll, tol, maxiter):
         fder = _tof_equation_p(p0, y, T0, ll)
         fder2 = _tof_equation_p2(p0, y, T0, fder, ll)
         if fder2 == 0:
-            raise RuntimeError("Derivative was zero")
+            # Derivative was zero
+            return np.nan
         fder3 = _tof_equation_p3(p0, y, T0, fder, fder2, ll)
 
         # Halley step (cubic)
@@ -461,7 +712,7 @@ def _halley(p0, T0, ll, tol, maxiter):
             return p
         p0 = p
 
-    raise RuntimeError("Failed to converge")
+    return np.nan
 
 
 @jit
@@ -471,7 +722,8 @@ def _householder(p0, T0, ll, M, tol, maxiter):
     Notes
     -----
     This function is private because it assumes a calling convention specific to
-    this module and is not really reusable.
+    this module and is not really reusable. It returns NaN if it fails
+    to converge, so that it can run in parallel loops.
 
     """
     for _ii in range(maxiter):
@@ -492,4 +744,4 @@ def _householder(p0, T0, ll, M, tol, maxiter):
             return p
         p0 = p
 
-    raise RuntimeError("Failed to converge")
+    return np.nan
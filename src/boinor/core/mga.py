@@ -0,0 +1,172 @@
+"""Low level search of multiple gravity assist trajectories."""
+from numba import njit as jit
+import numpy as np
+
+from boinor._math.linalg import norm
+from boinor.core.flybys import powered_flyby
+
+
+@jit
+def _leg_costs(d, path, v_dep, v_arr, num_dates, k, r_p_min, costs):
+    """Writes to ``costs`` the impulse needed to start the leg ``d`` towards
+    each date of the next body, given the dates of the previous ones.
+
+    """
+    b = path[d]
+    for c in range(num_dates[d + 1]):
+        if d == 0:
+            costs[c] = norm(v_dep[0, b, c])
+        else:
+            costs[c] = powered_flyby(
+                v_arr[d - 1, path[d - 1], b], v_dep[d, b, c], k[d], r_p_min[d]
+            )[0]
+
+        if np.isnan(costs[c]):
+            costs[c] = np.inf
+
+
+@jit(nogil=True)
+def mga_search(
+    v_dep,
+    v_arr,
+    num_dates,
+    k,
+    r_p_min,
+    starts,
+    include_arrival,
+    bound,
+    num_solutions,
+):
+    """Finds the multiple gravity assist trajectories with the smallest
+    total impulse over grids of encounter dates with branch and bound.
+
+    Trajectories are built leg by leg in depth first order, trying the
+    cheapest next dates first. As every impulse is positive, a partial
+    trajectory whose cumulative impulse is not below the one of the worst
+    of the ``num_solutions`` best complete trajectories, or below
+    ``bound`` until there are enough of them, is discarded with all
+    the trajectories which would extend it.
+
+    The GIL is released, so that several searches over different
+    launch dates can run at once in a pool of threads.
+
+    Parameters
+    ----------
+    v_dep : numpy.ndarray
+        Hyperbolic excess velocity at the beginning of each leg (km / s),
+        for each date of its departure and arrival bodies,
+        shape (legs, n, n, 3).
+    v_arr : numpy.ndarray
+        Hyperbolic excess velocity at the end of each leg (km / s),
+        shape (legs, n, n, 3).
+    num_dates : numpy.ndarray
+        Number of dates of each body, shape (legs + 1,), at most n.
+    k : numpy.ndarray
+        Standard gravitational parameter of each body (km^3 / s^2),
+        shape (legs + 1,).
+    r_p_min : numpy.ndarray
+        Minimum radius of periapsis of the flyby of each body (km),
+        shape (legs + 1,).
+    starts : numpy.ndarray
+        Indices of the launch dates to search from.
+    include_arrival : bool
+        Whether to add the norm of the arrival excess velocity
+        to the total impulse.
+    bound : float
+        Upper bound of the total impulse (km / s), can be infinite.
+    num_solutions : int
+        Number of trajectories to keep.
+
+    Returns
+    -------
+    costs : numpy.ndarray
+        Total impulse of the best trajectories (km / s), in increasing
+        order, shape (num_solutions,), ``bound`` if not enough were found.
+    paths : numpy.ndarray
+        Indices of the dates of each body of the best trajectories,
+        shape (num_solutions, legs + 1), -1 if not found.
+    impulses : numpy.ndarray
+        Launch impulse, impulse of each flyby and arrival impulse
+        of the best trajectories (km / s), shape (num_solutions, legs + 1).
+    nodes : int
+        Number of partial trajectories explored.
+
+    """
+    legs, n = v_dep.shape[0], v_dep.shape[1]
+    costs = np.full(num_solutions, bound)
+    paths = np.full((num_solutions, legs + 1), -1, dtype=np.int64)
+    impulses = np.full((num_solutions, legs + 1), np.nan)
+
+    path = np.empty(legs + 1, dtype=np.int64)
+    steps = np.zeros(legs + 1)
+    cumulative = np.zeros(legs + 1)
+    child_costs = np.empty((legs, n))
+    children = np.empty((legs, n), dtype=np.int64)
+    position = np.zeros(legs, dtype=np.int64)
+    nodes = 0
+
+    for start in starts:
+        path[0] = start
+        d = 0
+        _leg_costs(
+            d, path, v_dep, v_arr, num_dates, k, r_p_min, child_costs[d]
+        )
+        children[d, : num_dates[1]] = np.argsort(
+            child_costs[d, : num_dates[1]]
+        )
+        position[d] = 0
+
+        while d >= 0:
+            if position[d] == num_dates[d + 1]:
+                d -= 1
+                continue
+
+            c = children[d, position[d]]
+            step = child_costs[d, c]
+            total = cumulative[d] + step
+            if not total < costs[-1]:
+                # The next dates are not cheaper
+                position[d] = num_dates[d + 1]
+                continue
+
+            position[d] += 1
+            nodes += 1
+            path[d + 1] = c
+            steps[d] = step
+            cumulative[d + 1] = total
+
+            if d + 1 < legs:
+                d += 1
+                _leg_costs(
+                    d,
+                    path,
+                    v_dep,
+                    v_arr,
+                    num_dates,
+                    k,
+                    r_p_min,
+                    child_costs[d],
+                )
+                children[d, : num_dates[d + 1]] = np.argsort(
+                    child_costs[d, : num_dates[d + 1]]
+                )
+                position[d] = 0
+                continue
+
+            steps[legs] = norm(v_arr[legs - 1, path[legs - 1], c])
+            if include_arrival:
+                total += steps[legs]
+            if not total < costs[-1]:
+                continue
+
+            i = num_solutions - 1
+            while i > 0 and total < costs[i - 1]:
+                costs[i] = costs[i - 1]
+                paths[i] = paths[i - 1]
+                impulses[i] = impulses[i - 1]
+                i -= 1
+            costs[i] = total
+            paths[i] = path
+            impulses[i] = steps
+
+    return costs, paths, impulses, nodes
@@ -240,3 +240,180 @@ def radiation_pressure(t0, state, k, R, C_R, A_over_m, Wdivc_s, star):
 
     nu = float(line_of_sight_fast(r_sat, r_star, R) > 0)
     return -nu * P_s * (C_R * A_over_m) * r_star / norm(r_star)
+
+
+def spherical_harmonics_factors(max_degree):
+    """Precomputes the factors used by the spherical harmonics perturbation.
+
+    Parameters
+    ----------
+    max_degree : int
+        Maximum degree of the gravity field.
+
+    Returns
+    -------
+    tuple
+        Coefficients of the recursion of the fully normalized harmonics and
+        ratios between normalization factors, arrays of shape
+        (max_degree + 2, max_degree + 2).
+
+    """
+    size = max_degree + 2
+    ni, mi = np.meshgrid(np.arange(size), np.arange(size), indexing="ij")
+    log_factorial = np.concatenate(
+        ([0.0], np.cumsum(np.log(np.arange(1, 2 * size + 2))))
+    )
+
+    def log_norm(n, m):
+        # Logarithm of the normalization factor of degree n and order m
+        return 0.5 * (
+            np.log(np.where(m == 0, 1.0, 2.0))
+            + np.log(2 * n + 1)
+            + log_factorial[np.maximum(n - m, 0)]
+            - log_factorial[n + m]
+        )
+
+    n, m = ni.astype(float), mi.astype(float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        a = np.sqrt((2 * n + 1) * (2 * n - 1) / ((n - m) * (n + m)))
+        b = np.sqrt(
+            (2 * n + 1)
+            * (n + m - 1)
+            * (n - m - 1)
+            / ((2 * n - 3) * (n + m) * (n - m))
+        )
+
+    ratio_0 = np.exp(log_norm(ni, mi) - log_norm(ni + 1, mi))
+    ratio_plus = np.exp(log_norm(ni, mi) - log_norm(ni + 1, mi + 1))
+    ratio_minus = np.exp(
+        log_norm(ni, mi) - log_norm(ni + 1, np.maximum(mi - 1, 0))
+    )
+
+    valid = m < n
+    a = np.where(valid, a, 0.0)
+    b = np.where(valid & (m < n - 1), b, 0.0)
+    ratio_minus = np.where(m > 0, ratio_minus, 0.0)
+
+    return tuple(
+        np.ascontiguousarray(factor)
+        for factor in (a, b, ratio_0, ratio_plus, ratio_minus)
+    )
+
+
+@jit
+def spherical_harmonics_perturbation(
+    t0,
+    state,
+    k,
+    k_field,
+    R,
+    C,
+    S,
+    factors,
+    max_degree,
+    max_order,
+    theta0,
+    omega,
+):
+    r"""Calculates the acceleration (km/s2) of a spherical harmonics gravity field.
+
+    Only the terms of degree 2 and above are included,
+    since the central term is already part of the two-body acceleration.
+
+    Parameters
+    ----------
+    t0 : float
+        Current time (s).
+    state : numpy.ndarray
+        Six component state vector [x, y, z, vx, vy, vz] (km, km/s).
+    k : float
+        Standard Gravitational parameter (km^3/s^2).
+    k_field : float
+        Standard Gravitational parameter the coefficients are normalized
+        with (km^3/s^2), used instead of ``k``, from which it may differ.
+    R : float
+        Reference radius of the gravity field (km).
+    C : numpy.ndarray
+        Fully normalized cosine coefficients, indexed by degree and order.
+    S : numpy.ndarray
+        Fully normalized sine coefficients, indexed by degree and order.
+    factors : tuple
+        Factors computed by :py:func:`spherical_harmonics_factors`
+        for a degree at least as high as ``max_degree``.
+    max_degree : int
+        Maximum degree of the terms to include.
+    max_order : int
+        Maximum order of the terms to include.
+    theta0 : float
+        Rotation angle of the body-fixed frame at ``t0 = 0`` (rad).
+    omega : float
+        Rotation rate of the body-fixed frame around the z axis (rad/s).
+
+    Notes
+    -----
+    The harmonics are computed with the recursions of :cite:t:`Montenbruck2000`,
+    section 3.2, written for fully normalized coefficients, which avoids
+    the singularity at the poles of the latitude-based formulation.
+    The body-fixed frame is assumed to rotate uniformly around the z axis
+    of the inertial frame, neglecting precession, nutation and polar motion.
+
+    """
+    a, b, ratio_0, ratio_plus, ratio_minus = factors
+    max_order = min(max_order, max_degree)
+
+    # Position in the body-fixed frame
+    theta = theta0 + omega * t0
+    cos_theta, sin_theta = np.cos(theta), np.sin(theta)
+    x = cos_theta * state[0] + sin_theta * state[1]
+    y = -sin_theta * state[0] + cos_theta * state[1]
+    z = state[2]
+
+    r2 = x * x + y * y + z * z
+    rho = R * R / r2
+    x0, y0, z0 = R * x / r2, R * y / r2, R * z / r2
+
+    V = np.zeros((max_degree + 2, max_order + 2))
+    W = np.zeros((max_degree + 2, max_order + 2))
+    V[0, 0] = R / np.sqrt(r2)
+    for m in range(max_order + 2):
+        if m > 0:
+            c = np.sqrt(3.0) if m == 1 else np.sqrt((2 * m + 1) / (2 * m))
+            V[m, m] = c * (x0 * V[m - 1, m - 1] - y0 * W[m - 1, m - 1])
+            W[m, m] = c * (x0 * W[m - 1, m - 1] + y0 * V[m - 1, m - 1])
+        for n in range(m + 1, max_degree + 2):
+            V[n, m] = a[n, m] * z0 * V[n - 1, m]
+            W[n, m] = a[n, m] * z0 * W[n - 1, m]
+            if n - 2 >= m:
+                V[n, m] -= b[n, m] * rho * V[n - 2, m]
+                W[n, m] -= b[n, m] * rho * W[n - 2, m]
+
+    ax = ay = az = 0.0
+    for n in range(2, max_degree + 1):
+        for m in range(min(n, max_order) + 1):
+            Cnm, Snm = C[n, m], S[n, m]
+            V0 = ratio_0[n, m] * V[n + 1, m]
+            W0 = ratio_0[n, m] * W[n + 1, m]
+            Vp = ratio_plus[n, m] * V[n + 1, m + 1]
+            Wp = ratio_plus[n, m] * W[n + 1, m + 1]
+            if m == 0:
+                ax -= Cnm * Vp
+                ay -= Cnm * Wp
+            else:
+                Vm = ratio_minus[n, m] * V[n + 1, m - 1]
+                Wm = ratio_minus[n, m] * W[n + 1, m - 1]
+                fac = (n - m + 2) * (n - m + 1)
+                ax += 0.5 * (
+                    -Cnm * Vp - Snm * Wp + fac * (Cnm * Vm + Snm * Wm)
+                )
+                ay += 0.5 * (
+                    -Cnm * Wp + Snm * Vp + fac * (-Cnm * Wm + Snm * Vm)
+                )
+            az += (n - m + 1) * (-Cnm * V0 - Snm * W0)
+
+    factor = k_field / R**2
+    ax, ay, az = factor * ax, factor * ay, factor * az
+
+    # Back to the inertial frame
+    return np.array(
+        [cos_theta * ax - sin_theta * ay, sin_theta * ax + cos_theta * ay, az]
+    )
@@ -0,0 +1,241 @@
+import sys
+
+from numba import njit as jit, prange
+import numpy as np
+
+from boinor._math.linalg import norm
+from boinor.core.iod import (
+    LAMBERT_CONVERGED,
+    _izzo,
+    _izzo_min_dv,
+    _izzo_warm,
+)
+
+
+@jit(parallel=sys.maxsize > 2**31)
+def porkchop_grid(
+    k,
+    rr_dpt,
+    vv_dpt,
+    t_dpt,
+    rr_arr,
+    vv_arr,
+    t_arr,
+    M,
+    prograde,
+    lowpath,
+    numiter,
+    rtol,
+    all_branches=False,
+):
+    """Solves the Lambert transfers of all the pairs of departure
+    and arrival states with Izzo's algorithm.
+
+    If ``all_branches`` is True, every feasible number of revolutions up to
+    ``M`` is solved, with both paths when there is more than one revolution,
+    and the branch with the smallest total impulse is kept for each pair.
+
+    Parameters
+    ----------
+    k : float
+        Standard gravitational parameter of the attractor (km^3 / s^2).
+    rr_dpt : numpy.ndarray
+        Positions of the departure body (km), shape (n, 3).
+    vv_dpt : numpy.ndarray
+        Velocities of the departure body (km / s), shape (n, 3).
+    t_dpt : numpy.ndarray
+        Departure times (s), shape (n,).
+    rr_arr : numpy.ndarray
+        Positions of the target body (km), shape (m, 3).
+    vv_arr : numpy.ndarray
+        Velocities of the target body (km / s), shape (m, 3).
+    t_arr : numpy.ndarray
+        Arrival times (s), shape (m,), with the same origin as ``t_dpt``.
+    M : int
+        Number of revolutions, or the maximum one if ``all_branches``.
+    prograde : bool
+        Controls the desired inclination of the transfer orbit.
+    lowpath : bool
+        If `True` or `False`, gets the transfer orbit whose vacant focus is
+        below or above the chord line, respectively.
+        Ignored if ``all_branches``.
+    numiter : int
+        Maximum number of iterations.
+    rtol : float
+        Relative tolerance of the algorithm.
+    all_branches : bool, optional
+        Whether to keep the best branch of each pair, default to False.
+
+    Returns
+    -------
+    dv_dpt : numpy.ndarray
+        Norm of the departure impulses (km / s), shape (m, n).
+    dv_arr : numpy.ndarray
+        Norm of the arrival impulses (km / s), shape (m, n).
+    status : numpy.ndarray
+        Status of each transfer, shape (m, n), one of the ``LAMBERT_*``
+        constants of :py:mod:`boinor.core.iod`. The impulses of the
+        transfers which did not converge, including the ones arriving
+        before departure, are NaN.
+    revs : numpy.ndarray
+        Number of revolutions of each transfer, shape (m, n),
+        -1 if it did not converge.
+    lowpaths : numpy.ndarray
+        Path of each transfer, shape (m, n).
+
+    """
+    n, m = t_dpt.shape[0], t_arr.shape[0]
+    dv_dpt = np.full((m, n), np.nan)
+    dv_arr = np.full((m, n), np.nan)
+    status = np.empty((m, n), dtype=np.int64)
+    revs = np.full((m, n), M, dtype=np.int64)
+    lowpaths = np.full((m, n), lowpath)
+
+    # Disabling pylint warning, see https://github.com/PyCQA/pylint/issues/2910
+    for i in prange(m):  # pylint: disable=not-an-iterable
+        for j in range(n):
+            tof = t_arr[i] - t_dpt[j]
+            if all_branches:
+                (
+                    v1,
+                    v2,
+                    status[i, j],
+                    revs[i, j],
+                    lowpaths[i, j],
+                ) = _izzo_min_dv(
+                    k,
+                    rr_dpt[j],
+                    rr_arr[i],
+                    tof,
+                    vv_dpt[j],
+                    vv_arr[i],
+                    M,
+                    prograde,
+                    numiter,
+                    rtol,
+                )
+            else:
+                v1, v2, status[i, j] = _izzo(
+                    k,
+                    rr_dpt[j],
+                    rr_arr[i],
+                    tof,
+                    M,
+                    prograde,
+                    lowpath,
+                    numiter,
+                    rtol,
+                )
+
+            if status[i, j] == LAMBERT_CONVERGED:
+                dv_dpt[i, j] = norm(v1 - vv_dpt[j])
+                dv_arr[i, j] = norm(vv_arr[i] - v2)
+            else:
+                revs[i, j] = -1
+
+    return dv_dpt, dv_arr, status, revs, lowpaths
+
+
+@jit(parallel=sys.maxsize > 2**31)
+def porkchop_cells(
+    k,
+    rr_dpt,
+    vv_dpt,
+    rr_arr,
+    vv_arr,
+    tof,
+    x_0,
+    M,
+    prograde,
+    lowpath,
+    numiter,
+    rtol,
+):
+    """Solves the Lambert transfers of scattered cells of a porkchop grid
+    with Izzo's algorithm, starting the iterations of each cell from
+    the solution of a neighbouring one.
+
+    Cells whose warm started iterations do not converge
+    are solved again from the initial guess of the algorithm.
+
+    Parameters
+    ----------
+    k : float
+        Standard gravitational parameter of the attractor (km^3 / s^2).
+    rr_dpt : numpy.ndarray
+        Positions of the departure body (km), shape (n, 3).
+    vv_dpt : numpy.ndarray
+        Velocities of the departure body (km / s), shape (n, 3).
+    rr_arr : numpy.ndarray
+        Positions of the target body (km), shape (n, 3).
+    vv_arr : numpy.ndarray
+        Velocities of the target body (km / s), shape (n, 3).
+    tof : numpy.ndarray
+        Times of flight (s), shape (n,).
+    x_0 : numpy.ndarray
+        Initial values of the iteration variable of Izzo's algorithm,
+        shape (n,), NaN to use the initial guess of the algorithm.
+    M : int
+        Number of revolutions.
+    prograde : bool
+        Controls the desired inclination of the transfer orbit.
+    lowpath : bool
+        If `True` or `False`, gets the transfer orbit whose vacant focus is
+        below or above the chord line, respectively.
+    numiter : int
+        Maximum number of iterations.
+    rtol : float
+        Relative tolerance of the algorithm.
+
+    Returns
+    -------
+    dv_dpt : numpy.ndarray
+        Norm of the departure impulses (km / s), shape (n,).
+    dv_arr : numpy.ndarray
+        Norm of the arrival impulses (km / s), shape (n,).
+    x : numpy.ndarray
+        Solutions of the iteration variable, shape (n,),
+        to start the iterations of the neighbouring cells.
+    status : numpy.ndarray
+        Status of each transfer, shape (n,), the impulses of the ones which
+        did not converge are NaN, see :py:func:`porkchop_grid`.
+
+    """
+    n = tof.shape[0]
+    dv_dpt = np.full(n, np.nan)
+    dv_arr = np.full(n, np.nan)
+    x = np.empty(n)
+    status = np.empty(n, dtype=np.int64)
+
+    # Disabling pylint warning, see https://github.com/PyCQA/pylint/issues/2910
+    for i in prange(n):  # pylint: disable=not-an-iterable
+        v1, v2, x[i], status[i] = _izzo_warm(
+            k,
+            rr_dpt[i],
+            rr_arr[i],
+            tof[i],
+            M,
+            prograde,
+            lowpath,
+            numiter,
+            rtol,
+            x_0[i],
+        )
+        if status[i] != LAMBERT_CONVERGED and not np.isnan(x_0[i]):
+            v1, v2, x[i], status[i] = _izzo_warm(
+                k,
+                rr_dpt[i],
+                rr_arr[i],
+                tof[i],
+                M,
+                prograde,
+                lowpath,
+                numiter,
+                rtol,
+                np.nan,
+            )
+        if status[i] == LAMBERT_CONVERGED:
+            dv_dpt[i] = norm(v1 - vv_dpt[i])
+            dv_arr[i] = norm(vv_arr[i] - v2)
+
+    return dv_dpt, dv_arr, x, status
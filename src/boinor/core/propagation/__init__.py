@@ -1,35 +1,95 @@
 """Low level propagation algorithms."""
 
-from boinor.core.propagation.base import func_twobody
-from boinor.core.propagation.cowell import cowell
-from boinor.core.propagation.danby import danby, danby_coe
+from boinor.core.propagation.base import func_twobody, func_twobody_jac
+from boinor.core.propagation.cowell import (
+    CowellDenseOutput,
+    cowell,
+    cowell_dense,
+    cowell_grid,
+    cowell_stm,
+)
+from boinor.core.propagation.danby import danby, danby_coe, danby_many
+from boinor.core.propagation.encke import encke, encke_grid
+from boinor.core.propagation.equinoctial import equinoctial
 from boinor.core.propagation.farnocchia import (
     farnocchia_coe,
+    farnocchia_coe_many,
     farnocchia_rv as farnocchia,
+    farnocchia_rv_grid as farnocchia_grid,
+    farnocchia_rv_many as farnocchia_many,
+)
+from boinor.core.propagation.gooding import gooding, gooding_coe, gooding_many
+from boinor.core.propagation.j2_secular import (
+    j2_secular_coe,
+    j2_secular_coe_many,
+    j2_secular_rates,
+    j2_secular_rv_grid,
+    j2_secular_rv_many,
+)
+from boinor.core.propagation.ks import ks
+from boinor.core.propagation.markley import markley, markley_coe, markley_many
+from boinor.core.propagation.mikkola import mikkola, mikkola_coe, mikkola_many
+from boinor.core.propagation.pimienta import (
+    pimienta,
+    pimienta_coe,
+    pimienta_many,
+)
+from boinor.core.propagation.recseries import (
+    recseries,
+    recseries_coe,
+    recseries_many,
+)
+from boinor.core.propagation.vallado import (
+    vallado,
+    vallado_grid,
+    vallado_many,
+    vallado_stm,
+    vallado_stm_many,
 )
-from boinor.core.propagation.gooding import gooding, gooding_coe
-from boinor.core.propagation.markley import markley, markley_coe
-from boinor.core.propagation.mikkola import mikkola, mikkola_coe
-from boinor.core.propagation.pimienta import pimienta, pimienta_coe
-from boinor.core.propagation.recseries import recseries, recseries_coe
-from boinor.core.propagation.vallado import vallado
 
 __all__ = [
     "cowell",
+    "cowell_dense",
+    "CowellDenseOutput",
+    "cowell_grid",
+    "cowell_stm",
     "func_twobody",
+    "func_twobody_jac",
+    "encke",
+    "encke_grid",
+    "equinoctial",
+    "ks",
+    "j2_secular_rates",
+    "j2_secular_coe",
+    "j2_secular_coe_many",
+    "j2_secular_rv_many",
+    "j2_secular_rv_grid",
     "farnocchia_coe",
+    "farnocchia_coe_many",
     "farnocchia",
+    "farnocchia_many",
+    "farnocchia_grid",
     "vallado",
+    "vallado_many",
+    "vallado_grid",
+    "vallado_stm",
+    "vallado_stm_many",
     "mikkola_coe",
     "mikkola",
+    "mikkola_many",
     "markley_coe",
     "markley",
+    "markley_many",
     "pimienta_coe",
     "pimienta",
+    "pimienta_many",
     "gooding_coe",
     "gooding",
+    "gooding_many",
     "danby_coe",
     "danby",
+    "danby_many",
     "recseries_coe",
     "recseries",
+    "recseries_many",
 ]
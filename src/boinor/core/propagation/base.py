@@ -21,3 +21,34 @@ def func_twobody(t0, u_, k):
 
     du = np.array([vx, vy, vz, -k * x / r3, -k * y / r3, -k * z / r3])
     return du
+
+
+@jit
+def func_twobody_jac(t0, u_, k):
+    """Jacobian of the differential equation for the two body problem.
+
+    Parameters
+    ----------
+    t0 : float
+        Time.
+    u_ : numpy.ndarray
+        Six component state vector [x, y, z, vx, vy, vz] (km, km/s).
+    k : float
+        Standard gravitational parameter.
+
+    Returns
+    -------
+    numpy.ndarray
+        Partial derivatives of :py:func:`func_twobody`
+        with respect to the state, shape (6, 6).
+
+    """
+    r = u_[:3]
+    norm_r = np.sqrt(r @ r)
+
+    jac = np.zeros((6, 6))
+    jac[:3, 3:] = np.eye(3)
+    jac[3:, :3] = (
+        -k / norm_r**3 * (np.eye(3) - 3 * np.outer(r, r) / norm_r**2)
+    )
+    return jac
@@ -1,18 +1,111 @@
+import functools
+import sys
+
+from numba import njit as jit, prange
+from numba.extending import is_jitted
 import numpy as np
 
-from boinor._math.ivp import DOP853, solve_ivp
-from boinor.core.propagation.base import func_twobody
+from boinor._math.ivp import (
+    DOP853,
+    dop853,
+    dop853_dense_output,
+    dop853_dense_output_many,
+    dop853_events,
+    solve_ivp,
+)
+from boinor._math.linalg import norm
+from boinor.core.events import CompiledEvents, event_values
+from boinor.core.propagation.base import func_twobody, func_twobody_jac
+
+
+def cowell(
+    k, r, v, tofs, rtol=1e-11, *, events=None, f=func_twobody, engine="scipy"
+):
+    """Propagates an orbit integrating the equations of motion with DOP853.
 
+    Parameters
+    ----------
+    k : float
+        Standard gravitational parameter.
+    r : numpy.ndarray
+        Initial position vector.
+    v : numpy.ndarray
+        Initial velocity vector.
+    tofs : numpy.ndarray
+        Times of flight.
+    rtol : float, optional
+        Relative tolerance, default to 1e-11.
+    events : list or ~boinor.core.events.CompiledEvents, optional
+        Events to track during the integration, a list of event functions
+        for the ``"scipy"`` engine and compiled events for the ``"numba"``
+        one. If a terminal event stops the integration,
+        the times of flight after it are replaced by the time of the event.
+    f : callable, optional
+        Right-hand side of the system, with signature ``f(t0, u_, k)``.
+    engine : str, optional
+        Either ``"scipy"``, which uses :py:func:`scipy.integrate.solve_ivp`,
+        or ``"numba"``, which uses a compiled version of the same method
+        and requires ``f`` to be jitted. Default to ``"scipy"``.
 
-def cowell(k, r, v, tofs, rtol=1e-11, *, events=None, f=func_twobody):
+    Returns
+    -------
+    rr : numpy.ndarray
+        Propagated position vectors, shape (n, 3).
+    vv : numpy.ndarray
+        Propagated velocity vectors, shape (n, 3).
+
+    """
     x, y, z = r
     vx, vy, vz = v
 
     u0 = np.array([x, y, z, vx, vy, vz])
+    tofs = np.asarray(tofs, dtype=np.float64).reshape(-1)
+
+    if engine == "numba":
+        if events is not None and not isinstance(events, CompiledEvents):
+            raise ValueError("The numba engine requires compiled events")
+        if not is_jitted(f):
+            raise ValueError("The numba engine requires a jitted function f")
+
+        if events is None:
+            ts, ys, Fs, success = dop853(
+                f, 0.0, u0, tofs.max(), (k,), rtol, 1e-12
+            )
+        else:
+            ts, ys, Fs, success, t_events, i_events, last_t = dop853_events(
+                f,
+                0.0,
+                u0,
+                tofs.max(),
+                (k,),
+                rtol,
+                1e-12,
+                event_values,
+                events.g_args(k),
+                events.directions,
+                events.terminal,
+            )
+            events.record(t_events, i_events, last_t)
+            if last_t < tofs.max():
+                tofs = np.append(tofs[tofs < last_t], last_t)
+        if not success:
+            raise RuntimeError("Integration failed")
+
+        out = dop853_dense_output_many(
+            tofs, ts, ys, Fs, np.empty((tofs.shape[0], 6))
+        )
+        return np.ascontiguousarray(out[:, :3]), np.ascontiguousarray(
+            out[:, 3:]
+        )
+
+    elif engine != "scipy":
+        raise ValueError(
+            f"Unknown engine {engine!r}, expected 'scipy' or 'numba'"
+        )
 
     result = solve_ivp(
         f,
-        (0, max(tofs)),
+        (0, tofs.max()),
         u0,
         args=(k,),
         rtol=rtol,
@@ -24,27 +117,329 @@ def cowell(k, r, v, tofs, rtol=1e-11, *, events=None, f=func_twobody):
     if not result.success:
         raise RuntimeError("Integration failed")
 
-    if events is not None:
-        # Collect only the terminal events
-        terminal_events = [event for event in events if event.terminal]
+    if result.status == 1:
+        # A terminal event stopped the integration, so the times of flight
+        # after it are replaced by the time of the event
+        last_t = result.t[-1]
+        tofs = np.append(tofs[tofs < last_t], last_t)
 
-        # If there are no terminal events, then the last time of integration is the
-        # greatest one from the original array of propagation times
-        if not terminal_events:
-            last_t = max(tofs)
-        else:
-            # Filter the event which triggered first
-            last_t = min(event._last_t for event in terminal_events)
-            # FIXME: Here last_t has units, but tofs don't
-            tofs = [tof for tof in tofs if tof < last_t] + [last_t]
-
-    rrs = []
-    vvs = []
-    # XXX org:  for i in range(len(tofs)):
-    for i, t in enumerate(tofs):
-        # XXX org: t = tofs[i]
-        y = result.sol(t)
-        rrs.append(y[:3])
-        vvs.append(y[3:])
-
-    return rrs, vvs
+    # All the times are interpolated at once,
+    # which is much faster than calling the interpolant for each one
+    y = result.sol(tofs)
+
+    return np.ascontiguousarray(y[:3].T), np.ascontiguousarray(y[3:].T)
+
+
+@jit
+def _cowell_evaluate(f, k, u0, tofs, out, rtol):
+    # Times of flight of each sign are reached by integrating
+    # forward and backward from the initial state
+    success = True
+    if tofs.max() >= 0.0:
+        ts, ys, Fs, ok = dop853(f, 0.0, u0, tofs.max(), (k,), rtol, 1e-12)
+        success = ok
+        for j in range(tofs.shape[0]):
+            if tofs[j] >= 0.0:
+                out[j, :] = dop853_dense_output(tofs[j], ts, ys, Fs)
+
+    if tofs.min() < 0.0:
+        ts, ys, Fs, ok = dop853(f, 0.0, u0, tofs.min(), (k,), rtol, 1e-12)
+        success = success and ok
+        for j in range(tofs.shape[0]):
+            if tofs[j] < 0.0:
+                out[j, :] = dop853_dense_output(tofs[j], ts, ys, Fs)
+
+    return success
+
+
+@jit(parallel=sys.maxsize > 2**31)
+def cowell_grid(k, rr0, vv0, t0, t, out, rtol, f):
+    """Propagates several orbits to a common grid of times with Cowell's method.
+
+    Each orbit is integrated separately with the compiled DOP853 integrator,
+    so that the error control of one orbit does not affect the others.
+
+    Parameters
+    ----------
+    k : float
+        Standard gravitational parameter.
+    rr0 : numpy.ndarray
+        Initial position vectors, shape (n, 3).
+    vv0 : numpy.ndarray
+        Initial velocity vectors, shape (n, 3).
+    t0 : numpy.ndarray
+        Times of the initial states, shape (n,).
+    t : numpy.ndarray
+        Times of the grid, shape (m,), with the same origin as ``t0``.
+    out : numpy.ndarray
+        Preallocated array of shape (n, m, 6) where the propagated
+        position and velocity vectors are written.
+    rtol : float
+        Relative tolerance.
+    f : callable
+        Jitted right-hand side of the system, with signature ``f(t0, u_, k)``.
+
+    Returns
+    -------
+    out : numpy.ndarray
+        Propagated position and velocity vectors.
+    success : numpy.ndarray
+        Whether the integration of each orbit succeeded, shape (n,).
+
+    Notes
+    -----
+    The loop over the orbits runs in parallel. Grid times before the
+    initial time of an orbit are reached by integrating backwards.
+
+    """
+    success = np.empty(rr0.shape[0], dtype=np.bool_)
+    # Disabling pylint warning, see https://github.com/PyCQA/pylint/issues/2910
+    for i in prange(rr0.shape[0]):  # pylint: disable=not-an-iterable
+        u0 = np.empty(6)
+        u0[:3] = rr0[i]
+        u0[3:] = vv0[i]
+        success[i] = _cowell_evaluate(f, k, u0, t - t0[i], out[i], rtol)
+
+    return out, success
+
+
+class CowellDenseOutput:
+    """Piecewise polynomial interpolant of an orbit integrated with Cowell's method.
+
+    It keeps the dense output of every step of the integration,
+    so that the orbit can be evaluated at any time of its span
+    without integrating again. Instead of creating it directly,
+    use :py:func:`cowell_dense`.
+
+    Parameters
+    ----------
+    forward : tuple
+        Times, states and interpolation coefficients of the steps after the
+        initial time, as returned by :py:func:`~boinor._math.ivp.dop853`.
+    backward : tuple
+        Same for the steps before the initial time.
+
+    """
+
+    def __init__(self, forward, backward):
+        self._forward = forward
+        self._backward = backward
+
+    @property
+    def t_min(self):
+        """Earliest time of the span, with the initial time as origin."""
+        return self._backward[0][-1]
+
+    @property
+    def t_max(self):
+        """Latest time of the span, with the initial time as origin."""
+        return self._forward[0][-1]
+
+    @property
+    def num_steps(self):
+        """Number of steps of the integration."""
+        return self._forward[1].shape[0] + self._backward[1].shape[0]
+
+    def __call__(self, t):
+        """Evaluates the orbit at several times.
+
+        Parameters
+        ----------
+        t : numpy.ndarray
+            Times, with the initial time as origin.
+
+        Returns
+        -------
+        numpy.ndarray
+            Positions and velocities, shape (n, 6).
+
+        """
+        t = np.asarray(t, dtype=np.float64).reshape(-1)
+        if t.size and (t.min() < self.t_min or t.max() > self.t_max):
+            raise ValueError(
+                f"Times must be between {self.t_min} and {self.t_max}"
+            )
+
+        out = np.empty((t.shape[0], 6))
+        forward = t >= 0.0
+        out[forward] = dop853_dense_output_many(
+            t[forward], *self._forward, np.empty((forward.sum(), 6))
+        )
+        out[~forward] = dop853_dense_output_many(
+            t[~forward], *self._backward, np.empty(((~forward).sum(), 6))
+        )
+        return out
+
+
+def cowell_dense(k, r, v, t_min, t_max, rtol=1e-11, *, f=func_twobody):
+    """Integrates an orbit with Cowell's method keeping its dense output.
+
+    Parameters
+    ----------
+    k : float
+        Standard gravitational parameter.
+    r : numpy.ndarray
+        Initial position vector.
+    v : numpy.ndarray
+        Initial velocity vector.
+    t_min : float
+        Earliest time of the span, not positive.
+    t_max : float
+        Latest time of the span, not negative.
+    rtol : float, optional
+        Relative tolerance, default to 1e-11.
+    f : callable, optional
+        Jitted right-hand side of the system, with signature ``f(t0, u_, k)``.
+
+    Returns
+    -------
+    CowellDenseOutput
+        Interpolant of the orbit between ``t_min`` and ``t_max``.
+
+    """
+    if not is_jitted(f):
+        raise ValueError("The dense output requires a jitted function f")
+    if t_min > 0 or t_max < 0:
+        raise ValueError(
+            "The span must contain the initial time, "
+            f"got {t_min} and {t_max}"
+        )
+
+    u0 = np.empty(6)
+    u0[:3] = r
+    u0[3:] = v
+
+    segments = []
+    for t_bound in (float(t_max), float(t_min)):
+        ts, ys, Fs, success = dop853(f, 0.0, u0, t_bound, (k,), rtol, 1e-12)
+        if not success:
+            raise RuntimeError("Integration failed")
+        segments.append((ts, ys, Fs))
+
+    return CowellDenseOutput(*segments)
+
+
+@functools.lru_cache(maxsize=None)
+def _numerical_jacobian(f):
+    @jit
+    def jac(t0, u_, k):
+        # Analytical two-body part plus central differences of the
+        # perturbing acceleration, which is small and smooth
+        result = func_twobody_jac(t0, u_, k)
+        h_r = 1e-6 * norm(u_[:3])
+        h_v = 1e-6 * max(norm(u_[3:]), 1e-3)
+        for j in range(6):
+            h = h_r if j < 3 else h_v
+            u_plus = u_.copy()
+            u_plus[j] += h
+            u_minus = u_.copy()
+            u_minus[j] -= h
+            a_plus = f(t0, u_plus, k) - func_twobody(t0, u_plus, k)
+            a_minus = f(t0, u_minus, k) - func_twobody(t0, u_minus, k)
+            result[3:, j] += (a_plus[3:] - a_minus[3:]) / (2 * h)
+
+        return result
+
+    return jac
+
+
+@jit
+def _variational_rhs(t0, y, k, f, jac):
+    u_ = y[:6]
+    stm = np.ascontiguousarray(y[6:]).reshape(6, 6)
+
+    dy = np.empty(42)
+    dy[:6] = f(t0, u_, k)
+    dy[6:] = (jac(t0, u_, k) @ stm).reshape(-1)
+    return dy
+
+
+@jit
+def _cowell_stm_evaluate(f, jac, k, y0, t_bound, tofs, out, rtol):
+    ts, ys, Fs, success = dop853(
+        _variational_rhs, 0.0, y0, t_bound, (k, f, jac), rtol, 1e-12
+    )
+    for j in range(tofs.shape[0]):
+        if (tofs[j] >= 0.0) == (t_bound >= 0.0):
+            out[j, :] = dop853_dense_output(tofs[j], ts, ys, Fs)
+
+    return success
+
+
+def cowell_stm(k, r, v, tofs, rtol=1e-11, *, f=func_twobody, jac=None):
+    r"""Propagates an orbit together with its state transition matrix
+    integrating the variational equations.
+
+    The state transition matrix :math:`\Phi` is integrated together with
+    the state with the compiled DOP853 integrator, using
+
+    .. math::
+
+        \dot{\Phi} = \frac{\partial \vec{f}}{\partial \vec{u}}\Phi
+
+    so that one integration gives the matrices for all the times of flight,
+    instead of one integration per perturbed component of the initial state
+    needed by finite differences.
+
+    Parameters
+    ----------
+    k : float
+        Standard gravitational parameter.
+    r : numpy.ndarray
+        Initial position vector.
+    v : numpy.ndarray
+        Initial velocity vector.
+    tofs : numpy.ndarray
+        Times of flight, of any sign.
+    rtol : float, optional
+        Relative tolerance, default to 1e-11.
+    f : callable, optional
+        Jitted right-hand side of the system, with signature ``f(t0, u_, k)``.
+    jac : callable, optional
+        Jitted Jacobian of ``f`` with respect to the state, with the same
+        signature and returning an array of shape (6, 6). By default, the
+        analytical one is used for the two-body problem, and the perturbing
+        acceleration is differentiated numerically with compiled central
+        differences otherwise.
+
+    Returns
+    -------
+    rr : numpy.ndarray
+        Propagated position vectors, shape (n, 3).
+    vv : numpy.ndarray
+        Propagated velocity vectors, shape (n, 3).
+    stms : numpy.ndarray
+        State transition matrices, shape (n, 6, 6).
+
+    """
+    if not is_jitted(f):
+        raise ValueError(
+            "The variational equations require a jitted function f"
+        )
+    if jac is None:
+        jac = func_twobody_jac if f is func_twobody else _numerical_jacobian(f)
+    elif not is_jitted(jac):
+        raise ValueError(
+            "The variational equations require a jitted function jac"
+        )
+
+    tofs = np.asarray(tofs, dtype=np.float64).reshape(-1)
+
+    y0 = np.empty(42)
+    y0[:3] = r
+    y0[3:6] = v
+    y0[6:] = np.eye(6).reshape(-1)
+
+    out = np.empty((tofs.shape[0], 42))
+    if tofs.max() >= 0.0:
+        if not _cowell_stm_evaluate(
+            f, jac, k, y0, tofs.max(), tofs, out, rtol
+        ):
+            raise RuntimeError("Integration failed")
+    if tofs.min() < 0.0:
+        if not _cowell_stm_evaluate(
+            f, jac, k, y0, tofs.min(), tofs, out, rtol
+        ):
+            raise RuntimeError("Integration failed")
+
+    return out[:, :3], out[:, 3:6], out[:, 6:].reshape(-1, 6, 6)
@@ -0,0 +1,250 @@
+import sys
+
+from numba import njit as jit, prange
+import numpy as np
+
+from boinor._math.ivp import dop853, dop853_dense_output
+from boinor._math.linalg import norm
+from boinor.core.propagation.base import func_twobody
+from boinor.core.propagation.farnocchia import farnocchia_rv
+from boinor.core.propagation.vallado import _universal_anomaly
+
+_NUMITER = 50
+
+
+@jit
+def _kepler(k, r0, v0, tof):
+    # Universal variables formulation, as in vallado, but iterating
+    # until the universal anomaly converges to machine precision,
+    # since the reference conic must be more accurate than the deviation.
+    # It is faster than farnocchia, which is kept as a fallback
+    if tof == 0:
+        return r0.copy(), v0.copy()
+
+    try:
+        xi, psi, c2_psi, c3_psi, norm_r = _universal_anomaly(
+            k, r0, v0, tof, _NUMITER, 1e-13, 1e-13
+        )
+    except Exception:  # pylint: disable=broad-except
+        # Newton's method can diverge for nearly parabolic orbits
+        rr = farnocchia_rv(k, r0, v0, tof)
+        return rr[0], rr[1]
+
+    norm_r0 = norm(r0)
+    sqrt_mu = np.sqrt(k)
+    f = 1 - xi * xi / norm_r0 * c2_psi
+    g = tof - xi * xi * xi / sqrt_mu * c3_psi
+    fdot = sqrt_mu / (norm_r * norm_r0) * xi * (psi * c3_psi - 1)
+    gdot = 1 - xi * xi / norm_r * c2_psi
+
+    return f * r0 + g * v0, fdot * r0 + gdot * v0
+
+
+@jit
+def _encke_rhs(t0, du, k, f, t_ref, r_ref, v_ref):
+    # Deviation from the reference conic, which is propagated analytically
+    rho, rho_dot = _kepler(k, r_ref, v_ref, t0 - t_ref)
+    u_ = np.empty(6)
+    u_[:3] = rho + du[:3]
+    u_[3:] = rho_dot + du[3:]
+
+    norm_rho = norm(rho)
+    ddu = np.empty(6)
+    ddu[:3] = du[3:]
+    ddu[3:] = f(t0, u_, k)[3:] + k * rho / norm_rho**3
+    return ddu
+
+
+@jit
+def _check_interval(k, r, v):
+    # One period of the reference orbit, or the equivalent time scale
+    # of a circular orbit at the current radius if it is not closed
+    norm_r = norm(r)
+    energy = v @ v / 2 - k / norm_r
+    if energy < 0:
+        a = -k / (2 * energy)
+    else:
+        a = norm_r
+    return 2 * np.pi * np.sqrt(a**3 / k)
+
+
+@jit
+def _encke_evaluate(f, k, u0, t_bound, tofs, out, rtol, rectify_tol):
+    direction = 1.0 if t_bound >= 0.0 else -1.0
+    order = np.argsort(direction * tofs)
+    j = 0
+    while j < order.shape[0] and direction * tofs[order[j]] < 0.0:
+        j += 1
+
+    t_ref = 0.0
+    r_ref = u0[:3].copy()
+    v_ref = u0[3:].copy()
+    du = np.zeros(6)
+    t_a = 0.0
+    while True:
+        t_b = t_a + direction * _check_interval(k, r_ref, v_ref)
+        if direction * (t_b - t_bound) > 0.0:
+            t_b = t_bound
+
+        ts, ys, Fs, success = dop853(
+            _encke_rhs,
+            t_a,
+            du,
+            t_b,
+            (k, f, t_ref, r_ref, v_ref),
+            rtol,
+            1e-12,
+        )
+        if not success:
+            return False
+
+        while j < order.shape[0] and direction * (tofs[order[j]] - t_b) <= 0:
+            t = tofs[order[j]]
+            d = dop853_dense_output(t, ts, ys, Fs)
+            rho, rho_dot = _kepler(k, r_ref, v_ref, t - t_ref)
+            out[order[j], :3] = rho + d[:3]
+            out[order[j], 3:] = rho_dot + d[3:]
+            j += 1
+
+        if t_b == t_bound:
+            return True
+
+        du = ys[-1] + Fs[-1, 0]
+        rho, rho_dot = _kepler(k, r_ref, v_ref, t_b - t_ref)
+        if norm(du[:3]) > rectify_tol * norm(rho):
+            # Rectification: the osculating orbit becomes the new reference
+            r_ref = rho + du[:3]
+            v_ref = rho_dot + du[3:]
+            t_ref = t_b
+            du = np.zeros(6)
+
+        t_a = t_b
+
+
+@jit
+def encke(k, r0, v0, tofs, rtol=1e-11, f=func_twobody, rectify_tol=1e-3):
+    r"""Propagates an orbit with Encke's method.
+
+    Only the deviation :math:`\delta\vec{r} = \vec{r} - \vec{\rho}` from a
+    reference conic :math:`\vec{\rho}`, which is propagated analytically,
+    is integrated:
+
+    .. math::
+
+        \ddot{\delta\vec{r}} = \vec{a}(\vec{r}) + \frac{\mu}{\rho^{3}}\vec{\rho}
+
+    where :math:`\vec{a}` is the total acceleration given by ``f``.
+    Since the deviation is small and smooth for weakly perturbed orbits,
+    the integrator takes much longer steps than with Cowell's method.
+
+    Parameters
+    ----------
+    k : float
+        Standard gravitational parameter.
+    r0 : numpy.ndarray
+        Initial position vector.
+    v0 : numpy.ndarray
+        Initial velocity vector.
+    tofs : numpy.ndarray
+        Times of flight, of any sign.
+    rtol : float, optional
+        Relative tolerance of the deviation, default to 1e-11.
+    f : callable, optional
+        Jitted right-hand side of the full system,
+        with signature ``f(t0, u_, k)``.
+    rectify_tol : float, optional
+        Maximum ratio between the position deviation and the position
+        of the reference conic before rectifying, default to 1e-3.
+
+    Returns
+    -------
+    rr : numpy.ndarray
+        Propagated position vectors, shape (n, 3).
+    vv : numpy.ndarray
+        Propagated velocity vectors, shape (n, 3).
+
+    Notes
+    -----
+    The deviation is checked once per period of the reference orbit.
+    When it is too large, the orbit is rectified, that is, the osculating
+    orbit at that time becomes the new reference and the deviation is reset
+    to zero, see :cite:t:`Curtis2013`.
+
+    """
+    u0 = np.empty(6)
+    u0[:3] = r0
+    u0[3:] = v0
+
+    out = np.empty((tofs.shape[0], 6))
+    if tofs.max() >= 0.0:
+        if not _encke_evaluate(
+            f, k, u0, tofs.max(), tofs, out, rtol, rectify_tol
+        ):
+            raise RuntimeError("Integration failed")
+    if tofs.min() < 0.0:
+        if not _encke_evaluate(
+            f, k, u0, tofs.min(), tofs, out, rtol, rectify_tol
+        ):
+            raise RuntimeError("Integration failed")
+
+    return out[:, :3], out[:, 3:]
+
+
+@jit(parallel=sys.maxsize > 2**31)
+def encke_grid(k, rr0, vv0, t0, t, out, rtol, f, rectify_tol):
+    """Propagates several orbits to a common grid of times with Encke's method.
+
+    Parameters
+    ----------
+    k : float
+        Standard gravitational parameter.
+    rr0 : numpy.ndarray
+        Initial position vectors, shape (n, 3).
+    vv0 : numpy.ndarray
+        Initial velocity vectors, shape (n, 3).
+    t0 : numpy.ndarray
+        Times of the initial states, shape (n,).
+    t : numpy.ndarray
+        Times of the grid, shape (m,), with the same origin as ``t0``.
+    out : numpy.ndarray
+        Preallocated array of shape (n, m, 6) where the propagated
+        position and velocity vectors are written.
+    rtol : float
+        Relative tolerance of the deviation.
+    f : callable
+        Jitted right-hand side of the full system,
+        with signature ``f(t0, u_, k)``.
+    rectify_tol : float
+        Maximum ratio between the position deviation and the position
+        of the reference conic before rectifying.
+
+    Returns
+    -------
+    out : numpy.ndarray
+        Propagated position and velocity vectors.
+    success : numpy.ndarray
+        Whether the integration of each orbit succeeded, shape (n,).
+
+    Notes
+    -----
+    The loop over the orbits runs in parallel.
+
+    """
+    success = np.empty(rr0.shape[0], dtype=np.bool_)
+    # Disabling pylint warning, see https://github.com/PyCQA/pylint/issues/2910
+    for i in prange(rr0.shape[0]):  # pylint: disable=not-an-iterable
+        u0 = np.empty(6)
+        u0[:3] = rr0[i]
+        u0[3:] = vv0[i]
+        tofs = t - t0[i]
+        success[i] = True
+        if tofs.max() >= 0.0:
+            success[i] = _encke_evaluate(
+                f, k, u0, tofs.max(), tofs, out[i], rtol, rectify_tol
+            )
+        if tofs.min() < 0.0:
+            success[i] = success[i] and _encke_evaluate(
+                f, k, u0, tofs.min(), tofs, out[i], rtol, rectify_tol
+            )
+
+    return out, success
@@ -0,0 +1,130 @@
+from numba import njit as jit
+import numpy as np
+
+from boinor._math.ivp import dop853, dop853_dense_output
+from boinor._math.linalg import norm
+from boinor.core.elements import coe2mee, coe2rv, mee2coe, rv2coe
+from boinor.core.propagation.base import func_twobody
+
+
+@jit
+def _rsw(r, v):
+    # Radial, along-track and cross-track unit vectors
+    w = np.cross(r, v)
+    r_ = r / norm(r)
+    w_ = w / norm(w)
+    return r_, np.cross(w_, r_), w_
+
+
+@jit
+def _mee2rv(k, y):
+    p, ecc, inc, raan, argp, nu = mee2coe(y[0], y[1], y[2], y[3], y[4], y[5])
+    rv = coe2rv(k, p, ecc, inc, raan, argp, nu)
+    return rv[0], rv[1]
+
+
+@jit
+def _equinoctial_rhs(t0, y, k, f):
+    p, f_, g, h, k_, L = y
+    r, v = _mee2rv(k, y)
+    u_ = np.empty(6)
+    u_[:3] = r
+    u_[3:] = v
+
+    # Perturbing acceleration, projected into the RSW frame
+    ad = f(t0, u_, k)[3:] + k * r / norm(r) ** 3
+    r_, s_, w_ = _rsw(r, v)
+    ar = ad @ r_
+    at = ad @ s_
+    an = ad @ w_
+
+    cos_L = np.cos(L)
+    sin_L = np.sin(L)
+    q = 1 + f_ * cos_L + g * sin_L
+    s2 = 1 + h**2 + k_**2
+    sqrt_p_mu = np.sqrt(p / k)
+    hk = h * sin_L - k_ * cos_L
+
+    dy = np.empty(6)
+    dy[0] = 2 * p / q * sqrt_p_mu * at
+    dy[1] = sqrt_p_mu * (
+        ar * sin_L + ((q + 1) * cos_L + f_) * at / q - hk * g * an / q
+    )
+    dy[2] = sqrt_p_mu * (
+        -ar * cos_L + ((q + 1) * sin_L + g) * at / q + hk * f_ * an / q
+    )
+    dy[3] = sqrt_p_mu * s2 * an * cos_L / (2 * q)
+    dy[4] = sqrt_p_mu * s2 * an * sin_L / (2 * q)
+    dy[5] = np.sqrt(k * p) * (q / p) ** 2 + sqrt_p_mu * hk * an / q
+    return dy
+
+
+@jit
+def _equinoctial_evaluate(f, k, y0, t_bound, tofs, out, rtol):
+    ts, ys, Fs, success = dop853(
+        _equinoctial_rhs, 0.0, y0, t_bound, (k, f), rtol, 1e-12
+    )
+    for j in range(tofs.shape[0]):
+        if (tofs[j] >= 0.0) == (t_bound >= 0.0):
+            r, v = _mee2rv(k, dop853_dense_output(tofs[j], ts, ys, Fs))
+            out[j, :3] = r
+            out[j, 3:] = v
+
+    return success
+
+
+@jit
+def equinoctial(k, r0, v0, tofs, rtol=1e-11, f=func_twobody):
+    r"""Propagates an orbit integrating the Gauss variational equations
+    in modified equinoctial elements.
+
+    The perturbing acceleration, that is, the total acceleration given by
+    ``f`` minus the two-body one, is projected into the radial, along-track
+    and cross-track (RSW) frame, and the modified equinoctial elements
+    :math:`(p, f, g, h, k, L)` are integrated with the compiled DOP853
+    integrator. Since all of them but :math:`L` vary slowly, the integrator
+    takes much longer steps than with Cowell's method for long arcs with
+    small perturbations, like low-thrust spirals.
+
+    Parameters
+    ----------
+    k : float
+        Standard gravitational parameter.
+    r0 : numpy.ndarray
+        Initial position vector.
+    v0 : numpy.ndarray
+        Initial velocity vector.
+    tofs : numpy.ndarray
+        Times of flight, of any sign.
+    rtol : float, optional
+        Relative tolerance, default to 1e-11.
+    f : callable, optional
+        Jitted right-hand side of the full system,
+        with signature ``f(t0, u_, k)``, as for
+        :py:func:`~boinor.core.propagation.cowell`.
+
+    Returns
+    -------
+    rr : numpy.ndarray
+        Propagated position vectors, shape (n, 3).
+    vv : numpy.ndarray
+        Propagated velocity vectors, shape (n, 3).
+
+    Notes
+    -----
+    The equations are the ones of :cite:t:`Walker1985`. As the elements
+    themselves, they are singular for retrograde equatorial orbits.
+
+    """
+    p, ecc, inc, raan, argp, nu = rv2coe(k, r0, v0)
+    y0 = np.array(coe2mee(p, ecc, inc, raan, argp, nu))
+
+    out = np.empty((tofs.shape[0], 6))
+    if tofs.max() >= 0.0:
+        if not _equinoctial_evaluate(f, k, y0, tofs.max(), tofs, out, rtol):
+            raise RuntimeError("Integration failed")
+    if tofs.min() < 0.0:
+        if not _equinoctial_evaluate(f, k, y0, tofs.min(), tofs, out, rtol):
+            raise RuntimeError("Integration failed")
+
+    return out[:, :3], out[:, 3:]
@@ -1,4 +1,6 @@
-from numba import njit as jit
+import sys
+
+from numba import njit as jit, prange
 import numpy as np
 
 from boinor.core.angles import (
@@ -301,6 +303,26 @@ def farnocchia_coe(k, p, ecc, inc, raan, argp, nu, tof):
     return nu_from_delta_t(delta_t, ecc, k, q)
 
 
+@jit(parallel=sys.maxsize > 2**31)
+def farnocchia_coe_many(k, p, ecc, inc, raan, argp, nu, tof):
+    """Parallel version of farnocchia_coe.
+
+    All the arguments are arrays of the same length, one entry per state,
+    and the propagated true anomalies are returned as a new array.
+
+    """
+    n = nu.shape[0]
+    nu_new = np.zeros(n)
+
+    # Disabling pylint warning, see https://github.com/PyCQA/pylint/issues/2910
+    for i in prange(n):  # pylint: disable=not-an-iterable
+        nu_new[i] = farnocchia_coe(
+            k[i], p[i], ecc[i], inc[i], raan[i], argp[i], nu[i], tof[i]
+        )
+
+    return nu_new
+
+
 @jit
 def farnocchia_rv(k, r0, v0, tof):
     r"""Propagates orbit using mean motion.
@@ -337,3 +359,60 @@ def farnocchia_rv(k, r0, v0, tof):
     nu = farnocchia_coe(k, p, ecc, inc, raan, argp, nu0, tof)
 
     return coe2rv(k, p, ecc, inc, raan, argp, nu)
+
+
+@jit(parallel=sys.maxsize > 2**31)
+def farnocchia_rv_many(k, r0, v0, tofs, rr, vv):
+    """Parallel version of farnocchia_rv over an array of times of flight.
+
+    The propagated position and velocity vectors are written
+    into the preallocated arrays ``rr`` and ``vv`` of shape (n, 3),
+    which are also returned.
+
+    """
+    p, ecc, inc, raan, argp, nu0 = rv2coe(k, r0, v0)
+
+    # Disabling pylint warning, see https://github.com/PyCQA/pylint/issues/2910
+    for i in prange(tofs.shape[0]):  # pylint: disable=not-an-iterable
+        nu = farnocchia_coe(k, p, ecc, inc, raan, argp, nu0, tofs[i])
+        rr[i, :], vv[i, :] = coe2rv(k, p, ecc, inc, raan, argp, nu)
+
+    return rr, vv
+
+
+@jit(parallel=sys.maxsize > 2**31)
+def farnocchia_rv_grid(k, rr0, vv0, t0, t, out):
+    """Propagates several orbits to a common grid of times.
+
+    Parameters
+    ----------
+    k : float
+        Standard gravitational parameter.
+    rr0 : numpy.ndarray
+        Initial position vectors, shape (n, 3).
+    vv0 : numpy.ndarray
+        Initial velocity vectors, shape (n, 3).
+    t0 : numpy.ndarray
+        Times of the initial states, shape (n,).
+    t : numpy.ndarray
+        Times of the grid, shape (m,), with the same origin as ``t0``.
+    out : numpy.ndarray
+        Preallocated array of shape (n, m, 6) where the propagated
+        position and velocity vectors are written. It is also returned.
+
+    Notes
+    -----
+    The loop over the orbits runs in parallel, and the classical
+    elements of each orbit are computed only once.
+
+    """
+    # Disabling pylint warning, see https://github.com/PyCQA/pylint/issues/2910
+    for i in prange(rr0.shape[0]):  # pylint: disable=not-an-iterable
+        p, ecc, inc, raan, argp, nu0 = rv2coe(k, rr0[i], vv0[i])
+        for j in range(t.shape[0]):
+            nu = farnocchia_coe(k, p, ecc, inc, raan, argp, nu0, t[j] - t0[i])
+            out[i, j, :3], out[i, j, 3:] = coe2rv(
+                k, p, ecc, inc, raan, argp, nu
+            )
+
+    return out
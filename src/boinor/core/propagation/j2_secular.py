@@ -0,0 +1,212 @@
+import sys
+
+from numba import njit as jit, prange
+import numpy as np
+
+from boinor.core.angles import E_to_M, E_to_nu, M_to_E, nu_to_E
+from boinor.core.elements import coe2rv, rv2coe
+
+
+@jit
+def j2_secular_rates(k, p, ecc, inc, J2, R):
+    r"""Secular rates of the angular elements due to the J2 perturbation.
+
+    .. math::
+
+        \begin{aligned}
+            \dot{\Omega} &= -\frac{3}{2} n J_{2} \left(\frac{R}{p}\right)^{2} \cos{i} \\
+            \dot{\omega} &= \frac{3}{4} n J_{2} \left(\frac{R}{p}\right)^{2} (5\cos^{2}{i} - 1) \\
+            \dot{M} &= n \left(1 + \frac{3}{4} J_{2} \left(\frac{R}{p}\right)^{2}
+            \sqrt{1 - e^{2}} (3\cos^{2}{i} - 1)\right) \\
+        \end{aligned}
+
+    Parameters
+    ----------
+    k : float
+        Standard gravitational parameter (km^3 / s^2).
+    p : float
+        Semi-latus rectum (km).
+    ecc : float
+        Eccentricity, smaller than 1.
+    inc : float
+        Inclination (rad).
+    J2 : float
+        Oblateness factor.
+    R : float
+        Attractor radius (km).
+
+    Returns
+    -------
+    raan_dot : float
+        Rate of the right ascension of the ascending node (rad / s).
+    argp_dot : float
+        Rate of the argument of the perigee (rad / s).
+    M_dot : float
+        Rate of the mean anomaly (rad / s).
+
+    """
+    a = p / (1 - ecc**2)
+    n = np.sqrt(k / a**3)
+    factor = 3 / 4 * n * J2 * (R / p) ** 2
+    cos_inc = np.cos(inc)
+
+    raan_dot = -2 * factor * cos_inc
+    argp_dot = factor * (5 * cos_inc**2 - 1)
+    M_dot = n + factor * np.sqrt(1 - ecc**2) * (3 * cos_inc**2 - 1)
+    return raan_dot, argp_dot, M_dot
+
+
+@jit
+def j2_secular_coe(k, p, ecc, inc, raan, argp, nu, tof, J2, R):
+    """Propagates classical elements with the secular J2 rates.
+
+    Parameters
+    ----------
+    k : float
+        Standard gravitational parameter (km^3 / s^2).
+    p : float
+        Semi-latus rectum (km).
+    ecc : float
+        Eccentricity, smaller than 1.
+    inc : float
+        Inclination (rad).
+    raan : float
+        Right ascension of the ascending node (rad).
+    argp : float
+        Argument of the perigee (rad).
+    nu : float
+        True anomaly (rad).
+    tof : float
+        Time of flight (s).
+    J2 : float
+        Oblateness factor.
+    R : float
+        Attractor radius (km).
+
+    Returns
+    -------
+    raan : float
+        Propagated right ascension of the ascending node (rad).
+    argp : float
+        Propagated argument of the perigee (rad).
+    nu : float
+        Propagated true anomaly (rad).
+
+    """
+    raan_dot, argp_dot, M_dot = j2_secular_rates(k, p, ecc, inc, J2, R)
+
+    M = E_to_M(nu_to_E(nu, ecc), ecc) + M_dot * tof
+    M = (M + np.pi) % (2 * np.pi) - np.pi
+
+    return (
+        (raan + raan_dot * tof) % (2 * np.pi),
+        (argp + argp_dot * tof) % (2 * np.pi),
+        E_to_nu(M_to_E(M, ecc), ecc),
+    )
+
+
+@jit(parallel=sys.maxsize > 2**31)
+def j2_secular_coe_many(k, p, ecc, inc, raan, argp, nu, tof, J2, R):
+    """Parallel version of j2_secular_coe.
+
+    All the arguments but ``J2`` and ``R`` are arrays of the same length,
+    one entry per state, and the propagated right ascensions of the
+    ascending node, arguments of the perigee and true anomalies
+    are returned as new arrays.
+
+    """
+    n = nu.shape[0]
+    raan_new = np.empty(n)
+    argp_new = np.empty(n)
+    nu_new = np.empty(n)
+
+    # Disabling pylint warning, see https://github.com/PyCQA/pylint/issues/2910
+    for i in prange(n):  # pylint: disable=not-an-iterable
+        raan_new[i], argp_new[i], nu_new[i] = j2_secular_coe(
+            k[i],
+            p[i],
+            ecc[i],
+            inc[i],
+            raan[i],
+            argp[i],
+            nu[i],
+            tof[i],
+            J2,
+            R,
+        )
+
+    return raan_new, argp_new, nu_new
+
+
+@jit
+def j2_secular_rv_many(k, r0, v0, tofs, J2, R, rr, vv):
+    """Propagates an orbit to several times of flight with the secular J2 rates.
+
+    Parameters
+    ----------
+    k : float
+        Standard gravitational parameter (km^3 / s^2).
+    r0 : numpy.ndarray
+        Initial position vector (km).
+    v0 : numpy.ndarray
+        Initial velocity vector (km / s).
+    tofs : numpy.ndarray
+        Times of flight (s).
+    J2 : float
+        Oblateness factor.
+    R : float
+        Attractor radius (km).
+    rr : numpy.ndarray
+        Preallocated array of shape (n, 3) for the position vectors.
+    vv : numpy.ndarray
+        Preallocated array of shape (n, 3) for the velocity vectors.
+
+    """
+    p, ecc, inc, raan0, argp0, nu0 = rv2coe(k, r0, v0)
+    for i in range(tofs.shape[0]):
+        raan, argp, nu = j2_secular_coe(
+            k, p, ecc, inc, raan0, argp0, nu0, tofs[i], J2, R
+        )
+        rr[i, :], vv[i, :] = coe2rv(k, p, ecc, inc, raan, argp, nu)
+
+    return rr, vv
+
+
+@jit(parallel=sys.maxsize > 2**31)
+def j2_secular_rv_grid(k, rr0, vv0, t0, t, out, J2, R):
+    """Propagates several orbits to a common grid of times
+    with the secular J2 rates.
+
+    Parameters
+    ----------
+    k : float
+        Standard gravitational parameter (km^3 / s^2).
+    rr0 : numpy.ndarray
+        Initial position vectors, shape (n, 3).
+    vv0 : numpy.ndarray
+        Initial velocity vectors, shape (n, 3).
+    t0 : numpy.ndarray
+        Times of the initial states, shape (n,).
+    t : numpy.ndarray
+        Times of the grid, shape (m,), with the same origin as ``t0``.
+    out : numpy.ndarray
+        Preallocated array of shape (n, m, 6) where the propagated
+        position and velocity vectors are written. It is also returned.
+    J2 : float
+        Oblateness factor.
+    R : float
+        Attractor radius (km).
+
+    """
+    # Disabling pylint warning, see https://github.com/PyCQA/pylint/issues/2910
+    for i in prange(rr0.shape[0]):  # pylint: disable=not-an-iterable
+        p, ecc, inc, raan0, argp0, nu0 = rv2coe(k, rr0[i], vv0[i])
+        for j in range(t.shape[0]):
+            raan, argp, nu = j2_secular_coe(
+                k, p, ecc, inc, raan0, argp0, nu0, t[j] - t0[i], J2, R
+            )
+            out[i, j, :3], out[i, j, 3:] = coe2rv(
+                k, p, ecc, inc, raan, argp, nu
+            )
+
+    return out
@@ -0,0 +1,247 @@
+from numba import njit as jit
+import numpy as np
+
+from boinor._math.ivp import dop853, dop853_dense_output
+from boinor.core.propagation.base import func_twobody
+
+_MAXITER = 20
+
+
+@jit
+def _ks_matrix(u):
+    return np.array(
+        [
+            [u[0], -u[1], -u[2], u[3]],
+            [u[1], u[0], -u[3], -u[2]],
+            [u[2], u[3], u[0], u[1]],
+            [u[3], -u[2], u[1], -u[0]],
+        ]
+    )
+
+
+@jit
+def rv2ks(r, v):
+    """Converts position and velocity vectors to Kustaanheimo-Stiefel
+    coordinates.
+
+    Parameters
+    ----------
+    r : numpy.ndarray
+        Position vector.
+    v : numpy.ndarray
+        Velocity vector.
+
+    Returns
+    -------
+    u : numpy.ndarray
+        KS coordinates, shape (4,).
+    du : numpy.ndarray
+        Derivatives of the KS coordinates with respect to
+        the fictitious time, shape (4,).
+
+    Notes
+    -----
+    Of all the KS coordinates of the same position, the one with
+    either ``u[3]`` or ``u[2]`` equal to zero is chosen, depending on
+    the sign of ``r[0]``, to avoid the singularity of the transformation.
+
+    """
+    norm_r = np.sqrt(r @ r)
+    u = np.zeros(4)
+    if r[0] >= 0:
+        u[0] = np.sqrt((norm_r + r[0]) / 2)
+        u[1] = r[1] / (2 * u[0])
+        u[2] = r[2] / (2 * u[0])
+    else:
+        u[1] = np.sqrt((norm_r - r[0]) / 2)
+        u[0] = r[1] / (2 * u[1])
+        u[3] = r[2] / (2 * u[1])
+
+    du = _ks_matrix(u)[:3].T @ v / 2
+    return u, du
+
+
+@jit
+def ks2rv(u, du):
+    """Converts Kustaanheimo-Stiefel coordinates to position and velocity vectors.
+
+    Parameters
+    ----------
+    u : numpy.ndarray
+        KS coordinates, shape (4,).
+    du : numpy.ndarray
+        Derivatives of the KS coordinates with respect to
+        the fictitious time, shape (4,).
+
+    Returns
+    -------
+    r : numpy.ndarray
+        Position vector.
+    v : numpy.ndarray
+        Velocity vector.
+
+    """
+    L = _ks_matrix(u)[:3]
+    return L @ u, 2 / (u @ u) * (L @ du)
+
+
+@jit
+def _ks_rhs(s, y, k, f):
+    u = y[:4]
+    du = y[4:8]
+    energy = y[8]
+    t = y[9]
+
+    L = _ks_matrix(u)[:3]
+    norm_r = u @ u
+    u_ = np.empty(6)
+    u_[:3] = L @ u
+    u_[3:] = 2 / norm_r * (L @ du)
+
+    # Perturbing acceleration, embedded in four dimensions
+    ad = f(t, u_, k)[3:] + k * u_[:3] / norm_r**3
+    LT_ad = L.T @ ad
+
+    dy = np.empty(10)
+    dy[:4] = du
+    dy[4:8] = energy / 2 * u + norm_r / 2 * LT_ad
+    dy[8] = 2 * du @ LT_ad
+    dy[9] = norm_r
+    return dy
+
+
+@jit
+def _fictitious_time_step(k, y, t_remaining):
+    # Physical time is the integral of the radius over the fictitious time,
+    # so a span is estimated from the current radius, or from the semimajor
+    # axis, which is its mean value over the fictitious time, if it is smaller
+    norm_r = y[:4] @ y[:4]
+    energy = y[8]
+    if energy < 0:
+        norm_r = min(norm_r, -k / (2 * energy))
+    return t_remaining / norm_r * 1.05
+
+
+@jit
+def _solve_time(tof, s0, s1, ts, ys, Fs):
+    # Newton's method on the physical time, whose derivative is the radius
+    s = s0 + (s1 - s0) / 2
+    for _ in range(_MAXITER):
+        y = dop853_dense_output(s, ts, ys, Fs)
+        delta = (tof - y[9]) / (y[:4] @ y[:4])
+        s = min(max(s + delta, min(s0, s1)), max(s0, s1))
+        if abs(delta) <= 1e-15 * max(abs(s), 1.0):
+            break
+
+    return dop853_dense_output(s, ts, ys, Fs)
+
+
+@jit
+def _ks_evaluate(f, k, y0, t_bound, tofs, out, rtol):
+    direction = 1.0 if t_bound >= 0.0 else -1.0
+    order = np.argsort(direction * tofs)
+    j = 0
+    while j < order.shape[0] and direction * tofs[order[j]] < 0.0:
+        j += 1
+
+    y = y0
+    s_a = 0.0
+    step = 0.0
+    while j < order.shape[0]:
+        # Spans never shrink, so that the loop always reaches the bound
+        step = max(
+            step, direction * _fictitious_time_step(k, y, t_bound - y[9])
+        )
+        s_b = s_a + direction * step
+        ts, ys, Fs, success = dop853(_ks_rhs, s_a, y, s_b, (k, f), rtol, 1e-12)
+        if not success:
+            return False
+
+        y = ys[-1] + Fs[-1, 0]
+        t_steps = np.append(ys[:, 9], y[9])
+        while j < order.shape[0] and direction * (tofs[order[j]] - y[9]) <= 0:
+            tof = tofs[order[j]]
+            i = np.searchsorted(direction * t_steps, direction * tof) - 1
+            i = min(max(i, 0), ys.shape[0] - 1)
+            y_tof = _solve_time(tof, ts[i], ts[i + 1], ts, ys, Fs)
+            r, v = ks2rv(y_tof[:4], y_tof[4:8])
+            out[order[j], :3] = r
+            out[order[j], 3:] = v
+            j += 1
+
+        s_a = s_b
+
+    return True
+
+
+@jit
+def ks(k, r0, v0, tofs, rtol=1e-11, f=func_twobody):
+    r"""Propagates an orbit in Kustaanheimo-Stiefel regularized coordinates.
+
+    The position is transformed into four KS coordinates :math:`\vec{u}`,
+    and the physical time into a fictitious time :math:`s` with the Sundman
+    transformation :math:`dt = r\,ds`. The equations of motion then become
+    those of a harmonic oscillator perturbed by the acceleration :math:`\vec{P}`
+    given by ``f`` minus the two-body one:
+
+    .. math::
+
+        \begin{aligned}
+            \vec{u}'' &= \frac{E}{2}\vec{u} + \frac{r}{2}L^{T}(\vec{u})\vec{P} \\
+            E' &= 2\vec{u}' \cdot L^{T}(\vec{u})\vec{P} \\
+            t' &= r \\
+        \end{aligned}
+
+    which are integrated with the compiled DOP853 integrator, together with
+    the Keplerian energy :math:`E` and the physical time :math:`t`.
+    Since the steps in fictitious time correspond to steps in physical time
+    proportional to the radius, the perigee passages of highly eccentric
+    orbits no longer force tiny steps.
+
+    Parameters
+    ----------
+    k : float
+        Standard gravitational parameter.
+    r0 : numpy.ndarray
+        Initial position vector.
+    v0 : numpy.ndarray
+        Initial velocity vector.
+    tofs : numpy.ndarray
+        Times of flight, of any sign.
+    rtol : float, optional
+        Relative tolerance, default to 1e-11.
+    f : callable, optional
+        Jitted right-hand side of the full system,
+        with signature ``f(t0, u_, k)``, as for
+        :py:func:`~boinor.core.propagation.cowell`.
+
+    Returns
+    -------
+    rr : numpy.ndarray
+        Propagated position vectors, shape (n, 3).
+    vv : numpy.ndarray
+        Propagated velocity vectors, shape (n, 3).
+
+    Notes
+    -----
+    The states at the requested times are found from the dense output
+    by solving :math:`t(s) = t_{k}` with Newton's method.
+    See :cite:t:`Stiefel1971` for the derivation of the equations.
+
+    """
+    u, du = rv2ks(r0, v0)
+    y0 = np.empty(10)
+    y0[:4] = u
+    y0[4:8] = du
+    y0[8] = v0 @ v0 / 2 - k / np.sqrt(r0 @ r0)
+    y0[9] = 0.0
+
+    out = np.empty((tofs.shape[0], 6))
+    if tofs.max() >= 0.0:
+        if not _ks_evaluate(f, k, y0, tofs.max(), tofs, out, rtol):
+            raise RuntimeError("Integration failed")
+    if tofs.min() < 0.0:
+        if not _ks_evaluate(f, k, y0, tofs.min(), tofs, out, rtol):
+            raise RuntimeError("Integration failed")
+
+    return out[:, :3], out[:, 3:]
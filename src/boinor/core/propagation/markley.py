@@ -1,4 +1,6 @@
-from numba import njit as jit
+import sys
+
+from numba import njit as jit, prange
 import numpy as np
 
 from boinor.core.angles import (
@@ -97,3 +99,22 @@ def markley(k, r0, v0, tof):
     nu = markley_coe(k, p, ecc, inc, raan, argp, nu, tof)
 
     return coe2rv(k, p, ecc, inc, raan, argp, nu)
+
+
+@jit(parallel=sys.maxsize > 2**31)
+def markley_many(k, r0, v0, tofs, rr, vv):
+    """Parallel version of markley over an array of times of flight.
+
+    The propagated position and velocity vectors are written
+    into the preallocated arrays ``rr`` and ``vv`` of shape (n, 3),
+    which are also returned.
+
+    """
+    p, ecc, inc, raan, argp, nu0 = rv2coe(k, r0, v0)
+
+    # Disabling pylint warning, see https://github.com/PyCQA/pylint/issues/2910
+    for i in prange(tofs.shape[0]):  # pylint: disable=not-an-iterable
+        nu = markley_coe(k, p, ecc, inc, raan, argp, nu0, tofs[i])
+        rr[i, :], vv[i, :] = coe2rv(k, p, ecc, inc, raan, argp, nu)
+
+    return rr, vv
@@ -1,4 +1,6 @@
-from numba import njit as jit
+import sys
+
+from numba import njit as jit, prange
 import numpy as np
 
 from boinor.core.angles import E_to_M, E_to_nu, nu_to_E
@@ -124,3 +126,46 @@ def recseries(k, r0, v0, tof, method="rtol", order=8, numiter=100, rtol=1e-8):
     )
 
     return coe2rv(k, p, ecc, inc, raan, argp, nu)
+
+
+@jit(parallel=sys.maxsize > 2**31)
+def recseries_many(
+    k,
+    r0,
+    v0,
+    tofs,
+    rr,
+    vv,
+    method="rtol",
+    order=8,
+    numiter=100,
+    rtol=1e-8,
+):
+    """Parallel version of recseries over an array of times of flight.
+
+    The propagated position and velocity vectors are written
+    into the preallocated arrays ``rr`` and ``vv`` of shape (n, 3),
+    which are also returned.
+
+    """
+    p, ecc, inc, raan, argp, nu0 = rv2coe(k, r0, v0)
+
+    # Disabling pylint warning, see https://github.com/PyCQA/pylint/issues/2910
+    for i in prange(tofs.shape[0]):  # pylint: disable=not-an-iterable
+        nu = recseries_coe(
+            k,
+            p,
+            ecc,
+            inc,
+            raan,
+            argp,
+            nu0,
+            tofs[i],
+            method,
+            order,
+            numiter,
+            rtol,
+        )
+        rr[i, :], vv[i, :] = coe2rv(k, p, ecc, inc, raan, argp, nu)
+
+    return rr, vv
@@ -1,8 +1,80 @@
-from numba import njit as jit
+import sys
+
+from numba import njit as jit, prange
 import numpy as np
 
 from boinor._math.linalg import norm
-from boinor._math.special import stumpff_c2 as c2, stumpff_c3 as c3
+from boinor._math.special import (
+    stumpff_c2 as c2,
+    stumpff_c3 as c3,
+    stumpff_c4 as c4,
+    stumpff_c5 as c5,
+)
+
+
+@jit
+def _universal_anomaly(k, r0, v0, tof, numiter, atol=1e-7, rtol=0.0):
+    # Newton-Raphson iteration on the Kepler equation in universal variables,
+    # shared by vallado, vallado_stm and the reference conic of encke,
+    # which needs tighter tolerances on the universal anomaly
+    dot_r0v0 = r0 @ v0
+    norm_r0 = norm(r0)
+    sqrt_mu = k**0.5
+    alpha = -(v0 @ v0) / k + 2 / norm_r0
+
+    # First guess
+    if alpha > 0:
+        # Elliptic orbit
+        xi_new = sqrt_mu * tof * alpha
+    elif alpha < 0:
+        # Hyperbolic orbit
+        xi_new = (
+            np.sign(tof)
+            * (-1 / alpha) ** 0.5
+            * np.log(
+                (-2 * k * alpha * tof)
+                / (
+                    dot_r0v0
+                    + np.sign(tof)
+                    * np.sqrt(-k / alpha)
+                    * (1 - norm_r0 * alpha)
+                )
+            )
+        )
+    else:
+        # Parabolic orbit
+        # (Conservative initial guess)
+        xi_new = sqrt_mu * tof / norm_r0
+
+    # Newton-Raphson iteration on the Kepler equation
+    count = 0
+    while count < numiter:
+        xi = xi_new
+        psi = xi * xi * alpha
+        c2_psi = c2(psi)
+        c3_psi = c3(psi)
+        norm_r = (
+            xi * xi * c2_psi
+            + dot_r0v0 / sqrt_mu * xi * (1 - psi * c3_psi)
+            + norm_r0 * (1 - psi * c2_psi)
+        )
+        xi_new = (
+            xi
+            + (
+                sqrt_mu * tof
+                - xi * xi * xi * c3_psi
+                - dot_r0v0 / sqrt_mu * xi * xi * c2_psi
+                - norm_r0 * xi * (1 - psi * c3_psi)
+            )
+            / norm_r
+        )
+        if abs(xi_new - xi) < atol + rtol * abs(xi):
+            break
+        count += 1
+    else:
+        raise RuntimeError("Maximum number of iterations reached")
+
+    return xi, psi, c2_psi, c3_psi, norm_r
 
 
 @jit
@@ -71,63 +143,15 @@ def vallado(k, r0, v0, tof, numiter):
     deep detail. For analytical example, check in the same book for example 3.6.
 
     """
-    # Cache some results
-    dot_r0v0 = r0 @ v0
+    if tof == 0:
+        # Nothing to solve, and the hyperbolic first guess would be NaN
+        return 1.0, 0.0, 0.0, 1.0
+
+    xi, psi, c2_psi, c3_psi, norm_r = _universal_anomaly(
+        k, r0, v0, tof, numiter
+    )
     norm_r0 = norm(r0)
     sqrt_mu = k**0.5
-    alpha = -(v0 @ v0) / k + 2 / norm_r0
-
-    # First guess
-    if alpha > 0:
-        # Elliptic orbit
-        xi_new = sqrt_mu * tof * alpha
-    elif alpha < 0:
-        # Hyperbolic orbit
-        xi_new = (
-            np.sign(tof)
-            * (-1 / alpha) ** 0.5
-            * np.log(
-                (-2 * k * alpha * tof)
-                / (
-                    dot_r0v0
-                    + np.sign(tof)
-                    * np.sqrt(-k / alpha)
-                    * (1 - norm_r0 * alpha)
-                )
-            )
-        )
-    else:
-        # Parabolic orbit
-        # (Conservative initial guess)
-        xi_new = sqrt_mu * tof / norm_r0
-
-    # Newton-Raphson iteration on the Kepler equation
-    count = 0
-    while count < numiter:
-        xi = xi_new
-        psi = xi * xi * alpha
-        c2_psi = c2(psi)
-        c3_psi = c3(psi)
-        norm_r = (
-            xi * xi * c2_psi
-            + dot_r0v0 / sqrt_mu * xi * (1 - psi * c3_psi)
-            + norm_r0 * (1 - psi * c2_psi)
-        )
-        xi_new = (
-            xi
-            + (
-                sqrt_mu * tof
-                - xi * xi * xi * c3_psi
-                - dot_r0v0 / sqrt_mu * xi * xi * c2_psi
-                - norm_r0 * xi * (1 - psi * c3_psi)
-            )
-            / norm_r
-        )
-        if abs(xi_new - xi) < 1e-7:
-            break
-        count += 1
-    else:
-        raise RuntimeError("Maximum number of iterations reached")
 
     # Compute Lagrange coefficients
     f = 1 - xi**2 / norm_r0 * c2_psi
@@ -137,3 +161,202 @@ def vallado(k, r0, v0, tof, numiter):
     fdot = sqrt_mu / (norm_r * norm_r0) * xi * (psi * c3_psi - 1)
 
     return f, g, fdot, gdot
+
+
+@jit(parallel=sys.maxsize > 2**31)
+def vallado_many(k, r0, v0, tofs, rr, vv, numiter):
+    """Parallel version of vallado over an array of times of flight.
+
+    Instead of the Lagrange coefficients, the propagated position and
+    velocity vectors are written into the preallocated arrays ``rr`` and
+    ``vv`` of shape (n, 3), which are also returned.
+
+    """
+    # Disabling pylint warning, see https://github.com/PyCQA/pylint/issues/2910
+    for i in prange(tofs.shape[0]):  # pylint: disable=not-an-iterable
+        f, g, fdot, gdot = vallado(k, r0, v0, tofs[i], numiter)
+        rr[i, :] = f * r0 + g * v0
+        vv[i, :] = fdot * r0 + gdot * v0
+
+    return rr, vv
+
+
+@jit(parallel=sys.maxsize > 2**31)
+def vallado_grid(k, rr0, vv0, t0, t, out, numiter):
+    """Propagates several orbits to a common grid of times.
+
+    Parameters
+    ----------
+    k : float
+        Standard gravitational parameter.
+    rr0 : numpy.ndarray
+        Initial position vectors, shape (n, 3).
+    vv0 : numpy.ndarray
+        Initial velocity vectors, shape (n, 3).
+    t0 : numpy.ndarray
+        Times of the initial states, shape (n,).
+    t : numpy.ndarray
+        Times of the grid, shape (m,), with the same origin as ``t0``.
+    out : numpy.ndarray
+        Preallocated array of shape (n, m, 6) where the propagated
+        position and velocity vectors are written. It is also returned.
+    numiter : int
+        Number of iterations.
+
+    Notes
+    -----
+    The loop over the orbits runs in parallel.
+
+    """
+    # Disabling pylint warning, see https://github.com/PyCQA/pylint/issues/2910
+    for i in prange(rr0.shape[0]):  # pylint: disable=not-an-iterable
+        r0 = rr0[i]
+        v0 = vv0[i]
+        for j in range(t.shape[0]):
+            f, g, fdot, gdot = vallado(k, r0, v0, t[j] - t0[i], numiter)
+            out[i, j, :3] = f * r0 + g * v0
+            out[i, j, 3:] = fdot * r0 + gdot * v0
+
+    return out
+
+
+@jit
+def vallado_stm(k, r0, v0, tof, numiter):
+    r"""Propagates an orbit together with its state transition matrix.
+
+    The position and velocity vectors are propagated as in
+    :py:func:`vallado`, and the partial derivatives of the Lagrange
+    coefficients with respect to the initial state are found by
+    differentiating the Kepler equation in universal variables:
+
+    .. math::
+
+        \begin{aligned}
+            \sqrt{\mu}\Delta t &= r_{0}U_{1} + \sigma_{0}U_{2} + U_{3} \\
+            \frac{\partial U_{n}}{\partial \chi} &= U_{n - 1} \\
+            \frac{\partial U_{n}}{\partial \alpha} &= -\frac{1}{2}(\chi U_{n + 1} - nU_{n + 2}) \\
+        \end{aligned}
+
+    where :math:`U_{n} = \chi^{n}c_{n}(\alpha\chi^{2})` are the universal
+    functions and :math:`\sigma_{0} = \vec{r_{0}} \cdot \vec{v_{0}} / \sqrt{\mu}`.
+
+    Parameters
+    ----------
+    k : float
+        Standard gravitational parameter.
+    r0 : numpy.ndarray
+        Initial position vector.
+    v0 : numpy.ndarray
+        Initial velocity vector.
+    tof : float
+        Time of flight.
+    numiter : int
+        Number of iterations.
+
+    Returns
+    -------
+    r : numpy.ndarray
+        Propagated position vector.
+    v : numpy.ndarray
+        Propagated velocity vector.
+    stm : numpy.ndarray
+        State transition matrix, that is, the partial derivatives
+        of the propagated state with respect to the initial one, shape (6, 6).
+
+    Notes
+    -----
+    The universal functions are the ones of :cite:t:`Battin1999`.
+
+    """
+    if tof == 0:
+        return r0.copy(), v0.copy(), np.eye(6)
+
+    xi, psi, c2_psi, c3_psi, norm_r = _universal_anomaly(
+        k, r0, v0, tof, numiter
+    )
+    norm_r0 = norm(r0)
+    sqrt_mu = k**0.5
+    sigma0 = r0 @ v0 / sqrt_mu
+    alpha = -(v0 @ v0) / k + 2 / norm_r0
+
+    U0 = 1 - psi * c2_psi
+    U1 = xi * (1 - psi * c3_psi)
+    U2 = xi**2 * c2_psi
+    U3 = xi**3 * c3_psi
+    U4 = xi**4 * c4(psi)
+    U5 = xi**5 * c5(psi)
+
+    # Gradients with respect to the initial state
+    d_norm_r0 = np.zeros(6)
+    d_norm_r0[:3] = r0 / norm_r0
+    d_sigma0 = np.empty(6)
+    d_sigma0[:3] = v0 / sqrt_mu
+    d_sigma0[3:] = r0 / sqrt_mu
+    d_alpha = np.empty(6)
+    d_alpha[:3] = -2 * r0 / norm_r0**3
+    d_alpha[3:] = -2 * v0 / k
+
+    # Partial derivatives of the universal functions with respect to alpha
+    U0_alpha = -xi * U1 / 2
+    U1_alpha = -(xi * U2 - U3) / 2
+    U2_alpha = -(xi * U3 - 2 * U4) / 2
+    U3_alpha = -(xi * U4 - 3 * U5) / 2
+
+    # Implicit differentiation of the Kepler equation
+    d_xi = (
+        -(
+            U1 * d_norm_r0
+            + U2 * d_sigma0
+            + (norm_r0 * U1_alpha + sigma0 * U2_alpha + U3_alpha) * d_alpha
+        )
+        / norm_r
+    )
+    d_U0 = -alpha * U1 * d_xi + U0_alpha * d_alpha
+    d_U1 = U0 * d_xi + U1_alpha * d_alpha
+    d_U2 = U1 * d_xi + U2_alpha * d_alpha
+    d_norm_r = (
+        U0 * d_norm_r0 + norm_r0 * d_U0 + U1 * d_sigma0 + sigma0 * d_U1 + d_U2
+    )
+
+    f = 1 - U2 / norm_r0
+    g = tof - U3 / sqrt_mu
+    fdot = -sqrt_mu * U1 / (norm_r * norm_r0)
+    gdot = 1 - U2 / norm_r
+
+    d_f = -d_U2 / norm_r0 + U2 / norm_r0**2 * d_norm_r0
+    d_g = (
+        U1 * d_norm_r0 + norm_r0 * d_U1 + U2 * d_sigma0 + sigma0 * d_U2
+    ) / sqrt_mu
+    d_fdot = (
+        -sqrt_mu
+        * (d_U1 - U1 * (d_norm_r / norm_r + d_norm_r0 / norm_r0))
+        / (norm_r * norm_r0)
+    )
+    d_gdot = -d_U2 / norm_r + U2 / norm_r**2 * d_norm_r
+
+    stm = np.empty((6, 6))
+    stm[:3] = np.outer(r0, d_f) + np.outer(v0, d_g)
+    stm[3:] = np.outer(r0, d_fdot) + np.outer(v0, d_gdot)
+    for i in range(3):
+        stm[i, i] += f
+        stm[i, i + 3] += g
+        stm[i + 3, i] += fdot
+        stm[i + 3, i + 3] += gdot
+
+    return f * r0 + g * v0, fdot * r0 + gdot * v0, stm
+
+
+@jit(parallel=sys.maxsize > 2**31)
+def vallado_stm_many(k, r0, v0, tofs, rr, vv, stms, numiter):
+    """Parallel version of vallado_stm over an array of times of flight.
+
+    The propagated position and velocity vectors and the state transition
+    matrices are written into the preallocated arrays ``rr`` and ``vv``
+    of shape (n, 3) and ``stms`` of shape (n, 6, 6), which are also returned.
+
+    """
+    # Disabling pylint warning, see https://github.com/PyCQA/pylint/issues/2910
+    for i in prange(tofs.shape[0]):  # pylint: disable=not-an-iterable
+        rr[i, :], vv[i, :], stms[i] = vallado_stm(k, r0, v0, tofs[i], numiter)
+
+    return rr, vv, stms
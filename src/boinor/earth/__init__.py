@@ -1,16 +1,17 @@
 """Earth focused orbital mechanics routines."""
 
-from typing import Dict
-
 from astropy import units as u
-import numpy as np
 
 from boinor.bodies import Earth
+from boinor.core.force_model import ForceModel
 from boinor.core.perturbations import J2_perturbation
-from boinor.core.propagation import func_twobody
 from boinor.earth.enums import EarthGravity
 from boinor.twobody.propagation import CowellPropagator
 
+_TWO_BODY = ForceModel()
+_J2_PARAMS = {"J2": Earth.J2.value, "R": Earth.R.to_value(u.km)}
+_J2 = _TWO_BODY.add(J2_perturbation, **_J2_PARAMS)
+
 
 class EarthSatellite:
     """Position and velocity of a body with respect to Earth
@@ -50,7 +51,9 @@ class EarthSatellite:
         return self._spacecraft
 
     @u.quantity_input(tof=u.min)
-    def propagate(self, tof, *args, atmosphere=None, gravity=None):
+    def propagate(
+        self, tof, *args, atmosphere=None, gravity=None, force_model=None
+    ):
         """Propagates an 'EarthSatellite Orbit' at a specified time.
 
         If value is true anomaly, propagate orbit to this anomaly and return the result.
@@ -64,6 +67,9 @@ class EarthSatellite:
             a callable model from boinor.earth.atmosphere
         gravity : EarthGravity
             There are two possible values, SPHERICAL and J2. Only J2 is implemented at the moment. Default value is None.
+        force_model : ~boinor.core.force_model.ForceModel, optional
+            Perturbations to include in the propagation,
+            the J2 perturbation is added to them if requested by ``gravity``.
         *args:
             parameters used in perturbation models.
 
@@ -73,39 +79,17 @@ class EarthSatellite:
             A new EarthSatellite with the propagated Orbit
 
         """
-        ad_kwargs: Dict[object, dict] = {}
-        perturbations: Dict[object, dict] = {}
-
-        def ad(t0, state, k, perturbations):
-            if perturbations:
-                return np.sum(
-                    [
-                        f(t0=t0, state=state, k=k, **p)
-                        for f, p in perturbations.items()
-                    ],
-                    axis=0,
-                )
-
-            return np.array([0, 0, 0])
-
-        if gravity is EarthGravity.J2:
-            perturbations[J2_perturbation] = {
-                "J2": Earth.J2.value,
-                "R": Earth.R.to_value(u.km),
-            }
+        if force_model is None:
+            force_model = _J2 if gravity is EarthGravity.J2 else _TWO_BODY
+        elif gravity is EarthGravity.J2:
+            force_model = force_model.add(J2_perturbation, **_J2_PARAMS)
         if atmosphere is not None:
             # Cannot compute density without knowing the state,
             # the perturbations parameters are not always fixed
             # TODO: This whole function probably needs a refactoring
             raise NotImplementedError
 
-        def f(t0, state, k):
-            du_kep = func_twobody(t0, state, k)
-            ax, ay, az = ad(t0, state, k, perturbations)
-            du_ad = np.array([0, 0, 0, ax, ay, az])
-
-            return du_kep + du_ad
-
-        ad_kwargs.update(perturbations=perturbations)
-        new_orbit = self.orbit.propagate(tof, method=CowellPropagator(f=f))
+        new_orbit = self.orbit.propagate(
+            tof, method=CowellPropagator(f=force_model)
+        )
         return EarthSatellite(new_orbit, self.spacecraft)
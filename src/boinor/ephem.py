@@ -9,8 +9,15 @@ from astropy.coordinates import (
     get_body_barycentric_posvel,
 )
 from astroquery.jplhorizons import Horizons
-
-from boinor._math.interpolate import interp1d, sinc_interp, spline_interp
+from numba import njit as jit
+
+from boinor._math.interpolate import (
+    chebyshev_fit,
+    chebyshev_piecewise,
+    interp1d,
+    sinc_interp,
+    spline_interp,
+)
 from boinor.bodies import Earth
 from boinor.frames import Planes
 from boinor.frames.util import get_frame
@@ -48,6 +55,58 @@ def build_ephem_interpolant(body, epochs, attractor=Earth):
     return interpolant
 
 
+def build_chebyshev_interpolant(body, epochs, attractor=Earth, *, degree=12):
+    """Fits piecewise Chebyshev series to ephemerides data.
+
+    The positions of the body are computed once at the Chebyshev nodes
+    of every segment, and the result is a jitted function that can be
+    evaluated inside compiled code, for instance in the perturbations
+    of a :py:class:`~boinor.core.force_model.ForceModel`.
+
+    Parameters
+    ----------
+    body : Body
+        Source body.
+    epochs : ~astropy.time.Time
+        Boundaries of the segments, can be generated with boinor.util.time_range.
+    attractor : ~boinor.bodies.Body, optional
+        Attractor, default to Earth.
+    degree : int, optional
+        Degree of the series of every segment, default to 12.
+
+    Returns
+    -------
+    interpolant : callable
+        Jitted function that receives time increment in seconds
+        since the initial epoch and returns the position in km.
+
+    Notes
+    -----
+    Times outside of the epochs are extrapolated from the first
+    or last segment, and quickly lose accuracy.
+
+    """
+    if len(epochs) < 2:
+        raise ValueError(
+            "At least two epochs are needed to build the segments"
+        )
+
+    def positions(t):
+        ephem = Ephem.from_body(
+            body, epochs[0] + (t << u.s), attractor=attractor
+        )
+        return ephem._coordinates.xyz.to_value(u.km).T
+
+    bounds = (epochs - epochs[0]).to_value(u.s)
+    coeffs = chebyshev_fit(positions, bounds, degree)
+
+    @jit
+    def interpolant(t0):
+        return chebyshev_piecewise(t0, bounds, coeffs)
+
+    return interpolant
+
+
 class BaseInterpolator:
     def interpolate(self, epochs, reference_epochs, coordinates):
         raise NotImplementedError
@@ -136,10 +195,13 @@ class Ephem:
         Epochs corresponding to the coordinates.
     plane : ~boinor.frames.Planes
         Reference plane of the coordinates.
+    interpolator : ~boinor.ephem.BaseInterpolator, optional
+        Default interpolation method used by :py:meth:`sample`,
+        default to splines.
 
     """
 
-    def __init__(self, coordinates, epochs, plane):
+    def __init__(self, coordinates, epochs, plane, *, interpolator=None):
         if coordinates.ndim != 1 or epochs.ndim != 1:
             raise ValueError(
                 f"Coordinates and epochs must have dimension 1, got {coordinates.ndim} and {epochs.ndim}"
@@ -148,6 +210,9 @@ class Ephem:
         self._epochs = epochs
         self._coordinates = coordinates
         self._plane = Planes(plane)
+        self._interpolator = (
+            SplineInterpolator() if interpolator is None else interpolator
+        )
 
     def __str__(self):
         return EPHEM_FORMAT.format(
@@ -311,7 +376,7 @@ class Ephem:
 
         return orbit.change_plane(plane).to_ephem(strategy=EpochsArray(epochs))
 
-    def sample(self, epochs=None, *, interpolator=SplineInterpolator()):
+    def sample(self, epochs=None, *, interpolator=None):
         """Returns coordinates at specified epochs.
 
         Parameters
@@ -321,7 +386,7 @@ class Ephem:
             if not given the original one from the object will be used.
         interpolator : ~boinor.ephem.BaseInterpolator, optional
             Interpolation method to use for epochs outside of the original ones,
-            default to splines.
+            default to the one of the ephemerides.
 
         Returns
         -------
@@ -332,6 +397,9 @@ class Ephem:
         if epochs is None or epochs.isscalar and (epochs == self.epochs).all():
             return self._coordinates
 
+        if interpolator is None:
+            interpolator = self._interpolator
+
         coordinates = interpolator.interpolate(
             epochs.reshape(-1),
             self.epochs,
@@ -0,0 +1,280 @@
+"""Spherical harmonics gravity fields."""
+
+from functools import cached_property
+import re
+
+from astropy import units as u
+import numpy as np
+
+from boinor.core.perturbations import spherical_harmonics_factors
+
+_FORTRAN_EXPONENT = re.compile(r"(?<=[0-9.])[dD](?=[+-]?[0-9])")
+
+
+def _normalization_factors(max_degree):
+    n, m = np.meshgrid(
+        np.arange(max_degree + 1), np.arange(max_degree + 1), indexing="ij"
+    )
+    log_factorial = np.concatenate(
+        ([0.0], np.cumsum(np.log(np.arange(1, 2 * max_degree + 1))))
+    )
+    return np.where(
+        m <= n,
+        np.exp(
+            0.5
+            * (
+                np.log(np.where(m == 0, 1.0, 2.0) * (2 * n + 1))
+                + log_factorial[np.maximum(n - m, 0)]
+                - log_factorial[n + m]
+            )
+        ),
+        0.0,
+    )
+
+
+class GravityField:
+    """Gravity field of a body expanded in spherical harmonics.
+
+    Parameters
+    ----------
+    C : numpy.ndarray
+        Fully normalized cosine coefficients, indexed by degree and order.
+    S : numpy.ndarray
+        Fully normalized sine coefficients, indexed by degree and order.
+    k : ~astropy.units.Quantity
+        Standard gravitational parameter of the field.
+    R : ~astropy.units.Quantity
+        Reference radius of the field.
+
+    Examples
+    --------
+    The field is used through
+    :py:func:`~boinor.core.perturbations.spherical_harmonics_perturbation`,
+    truncated to the desired degree and order:
+
+    >>> from boinor.bodies import Earth
+    >>> from boinor.core.force_model import ForceModel
+    >>> from boinor.core.perturbations import spherical_harmonics_perturbation
+    >>> field = GravityField.from_file("EGM96.gfc")  # doctest: +SKIP
+    >>> params = field.perturbation_params(
+    ...     20, 20, omega=Earth.angular_velocity
+    ... )  # doctest: +SKIP
+    >>> model = ForceModel().add(
+    ...     spherical_harmonics_perturbation, **params
+    ... )  # doctest: +SKIP
+
+    """
+
+    @u.quantity_input(k=u.km**3 / u.s**2, R=u.km)
+    def __init__(self, C, S, k, R):
+        C = np.asarray(C, dtype=float)
+        S = np.asarray(S, dtype=float)
+        if C.ndim != 2 or C.shape[0] != C.shape[1] or C.shape != S.shape:
+            raise ValueError(
+                "Coefficients must be square arrays of the same shape"
+            )
+
+        self._C = np.ascontiguousarray(C)
+        self._S = np.ascontiguousarray(S)
+        self._k = k
+        self._R = R
+
+    @classmethod
+    def from_file(
+        cls, filename, *, k=None, R=None, max_degree=None, normalized=True
+    ):
+        """Loads a gravity field from an ASCII table of coefficients.
+
+        Both ICGEM files (``.gfc``), whose header contains the
+        gravitational parameter and the reference radius, and plain
+        EGM/JGM-style tables with lines ``n m C S [sigma_C sigma_S]``
+        are supported. Fortran exponents (``1.0D-06``) are accepted.
+
+        Parameters
+        ----------
+        filename : str or ~pathlib.Path
+            File with the coefficients.
+        k : ~astropy.units.Quantity, optional
+            Standard gravitational parameter of the field,
+            required if the file does not contain it.
+        R : ~astropy.units.Quantity, optional
+            Reference radius of the field,
+            required if the file does not contain it.
+        max_degree : int, optional
+            Maximum degree to load, by default all the coefficients are loaded.
+        normalized : bool, optional
+            Whether the coefficients of the table are fully normalized,
+            default to True. ICGEM files specify it in their header.
+
+        """
+        header = {}
+        rows = []
+        with open(filename) as fh:
+            for line in fh:
+                tokens = _FORTRAN_EXPONENT.sub("e", line).split()
+                if not tokens:
+                    continue
+
+                if tokens[0] == "gfc":
+                    tokens = tokens[1:]
+                elif len(tokens) == 2 and not tokens[0][0].isdigit():
+                    header[tokens[0]] = tokens[1]
+                    continue
+
+                try:
+                    n, m = int(tokens[0]), int(tokens[1])
+                    C_nm, S_nm = float(tokens[2]), float(tokens[3])
+                except (ValueError, IndexError):
+                    # Comments and other header lines
+                    continue
+
+                if max_degree is None or n <= max_degree:
+                    rows.append((n, m, C_nm, S_nm))
+
+        if not rows:
+            raise ValueError(f"No coefficients found in {filename}")
+
+        if k is None:
+            if "earth_gravity_constant" in header:
+                k = (
+                    float(header["earth_gravity_constant"])
+                    * u.m**3
+                    / u.s**2
+                )
+            elif "gravity_constant" in header:
+                k = float(header["gravity_constant"]) * u.m**3 / u.s**2
+            else:
+                raise ValueError(
+                    "The file does not contain the gravitational parameter, "
+                    "please provide k"
+                )
+        if R is None:
+            if "radius" in header:
+                R = float(header["radius"]) * u.m
+            else:
+                raise ValueError(
+                    "The file does not contain the reference radius, "
+                    "please provide R"
+                )
+        if header.get("norm", "fully_normalized") == "unnormalized":
+            normalized = False
+
+        degree = max(row[0] for row in rows)
+        C = np.zeros((degree + 1, degree + 1))
+        S = np.zeros((degree + 1, degree + 1))
+        for n, m, C_nm, S_nm in rows:
+            C[n, m] = C_nm
+            S[n, m] = S_nm
+
+        if not normalized:
+            factors = _normalization_factors(degree)
+            C = np.divide(C, factors, out=np.zeros_like(C), where=factors > 0)
+            S = np.divide(S, factors, out=np.zeros_like(S), where=factors > 0)
+
+        return cls(C, S, k, R)
+
+    @property
+    def C(self):
+        """Fully normalized cosine coefficients."""
+        return self._C
+
+    @property
+    def S(self):
+        """Fully normalized sine coefficients."""
+        return self._S
+
+    @property
+    def k(self):
+        """Standard gravitational parameter of the field."""
+        return self._k
+
+    @property
+    def R(self):
+        """Reference radius of the field."""
+        return self._R
+
+    @property
+    def max_degree(self):
+        """Maximum degree of the field."""
+        return self._C.shape[0] - 1
+
+    @cached_property
+    def _factors(self):
+        return spherical_harmonics_factors(self.max_degree)
+
+    @u.quantity_input(theta0=u.rad, omega=u.rad / u.s)
+    def perturbation_params(
+        self,
+        max_degree=None,
+        max_order=None,
+        *,
+        theta0=0 * u.rad,
+        omega=None,
+    ):
+        """Parameters of the spherical harmonics perturbation for this field.
+
+        The recursion factors are computed only once per field,
+        so truncating it to different degrees and orders is cheap.
+
+        Parameters
+        ----------
+        max_degree : int, optional
+            Maximum degree of the terms to include,
+            default to the degree of the field.
+        max_order : int, optional
+            Maximum order of the terms to include, default to ``max_degree``.
+        theta0 : ~astropy.units.Quantity, optional
+            Rotation angle of the body-fixed frame at the initial time,
+            default to 0.
+        omega : ~astropy.units.Quantity, optional
+            Rotation rate of the body-fixed frame around the z axis,
+            like the ``angular_velocity`` of the body. Only optional
+            for zonal fields, which do not depend on it.
+
+        Returns
+        -------
+        dict
+            Keyword arguments of
+            :py:func:`~boinor.core.perturbations.spherical_harmonics_perturbation`,
+            including the gravitational parameter of the field.
+
+        Raises
+        ------
+        ValueError
+            If the degree or the order are out of range, or if ``omega``
+            is not given and the truncated field has tesseral terms.
+
+        """
+        if max_degree is None:
+            max_degree = self.max_degree
+        if max_order is None:
+            max_order = max_degree
+        if not 2 <= max_degree <= self.max_degree:
+            raise ValueError(
+                f"Degree must be between 2 and {self.max_degree}, "
+                f"got {max_degree}"
+            )
+        if not 0 <= max_order <= max_degree:
+            raise ValueError(
+                f"Order must be between 0 and {max_degree}, got {max_order}"
+            )
+        if omega is None:
+            tesseral = (slice(2, max_degree + 1), slice(1, max_order + 1))
+            if np.any(self._C[tesseral]) or np.any(self._S[tesseral]):
+                raise ValueError(
+                    "The rotation rate omega is required for fields "
+                    "with tesseral terms"
+                )
+            omega = 0 * u.rad / u.s
+
+        return {
+            "k_field": self._k.to_value(u.km**3 / u.s**2),
+            "R": self._R.to_value(u.km),
+            "C": self._C,
+            "S": self._S,
+            "factors": self._factors,
+            "max_degree": max_degree,
+            "max_order": max_order,
+            "theta0": theta0.to_value(u.rad),
+            "omega": omega.to_value(u.rad / u.s),
+        }
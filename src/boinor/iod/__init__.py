@@ -1,4 +1,19 @@
 # Select default algorithm
-from boinor.iod.izzo import lambert
+from boinor.core.iod import (
+    LAMBERT_CONVERGED,
+    LAMBERT_DEGENERATE,
+    LAMBERT_INVALID,
+    LAMBERT_NO_SOLUTION,
+    LAMBERT_NOT_CONVERGED,
+)
+from boinor.iod.izzo import lambert, lambert_many
 
-__all__ = ["lambert"]
+__all__ = [
+    "lambert",
+    "lambert_many",
+    "LAMBERT_CONVERGED",
+    "LAMBERT_NOT_CONVERGED",
+    "LAMBERT_NO_SOLUTION",
+    "LAMBERT_DEGENERATE",
+    "LAMBERT_INVALID",
+]
@@ -0,0 +1,29 @@
+"""Helpers for the batch Lambert solvers."""
+from astropy import units as u
+import numpy as np
+
+
+def broadcast_cases(k, r0, r, tof):
+    """Converts the boundary conditions of many Lambert problems
+    to contiguous raw arrays with one entry per case.
+
+    Position vectors of shape (3,) and scalar times of flight
+    are shared by all the cases.
+
+    """
+    r0_ = np.atleast_2d(r0.to_value(u.km))
+    r_ = np.atleast_2d(r.to_value(u.km))
+    tof_ = np.atleast_1d(tof.to_value(u.s))
+    if r0_.ndim != 2 or r_.ndim != 2 or tof_.ndim != 1:
+        raise ValueError(
+            "Expected position vectors of shape (n, 3) "
+            "and times of flight of shape (n,)"
+        )
+
+    num = np.broadcast_shapes(r0_.shape[:1], r_.shape[:1], tof_.shape)[0]
+    return (
+        k.to_value(u.km**3 / u.s**2),
+        np.ascontiguousarray(np.broadcast_to(r0_, (num, 3)), dtype=np.float64),
+        np.ascontiguousarray(np.broadcast_to(r_, (num, 3)), dtype=np.float64),
+        np.ascontiguousarray(np.broadcast_to(tof_, (num,)), dtype=np.float64),
+    )
@@ -1,7 +1,8 @@
 """Izzo's algorithm for Lambert's problem."""
 from astropy import units as u
 
-from boinor.core.iod import izzo as izzo_fast
+from boinor.core.iod import izzo as izzo_fast, izzo_many as izzo_many_fast
+from boinor.iod._batch import broadcast_cases
 
 kms = u.km / u.s
 
@@ -48,3 +49,51 @@ def lambert(
 
     v0, v = izzo_fast(k_, r0_, r_, tof_, M, prograde, lowpath, numiter, rtol)
     return v0 << kms, v << kms
+
+
+def lambert_many(
+    k, r0, r, tof, M=0, prograde=True, lowpath=True, numiter=35, rtol=1e-8
+):
+    """Solves many Lambert problems at once using the Izzo algorithm.
+
+    The cases are solved in parallel by a compiled kernel, and instead of
+    raising, the status of each one is returned.
+
+    Parameters
+    ----------
+    k : ~astropy.units.Quantity
+        Gravitational constant of main attractor (km^3 / s^2).
+    r0 : ~astropy.units.Quantity
+        Initial positions (km), shape (n, 3) or (3,) if shared by all cases.
+    r : ~astropy.units.Quantity
+        Final positions (km), shape (n, 3) or (3,) if shared by all cases.
+    tof : ~astropy.units.Quantity
+        Times of flight (s), shape (n,) or scalar if shared by all cases.
+    M : int, optional
+        Number of full revolutions, default to 0.
+    prograde: boolean
+        Controls the desired inclination of the transfer orbit.
+    lowpath: boolean
+        If `True` or `False`, gets the transfer orbit whose vacant focus is
+        below or above the chord line, respectively.
+    numiter : int, optional
+        Maximum number of iterations, default to 35.
+    rtol : float, optional
+        Relative tolerance of the algorithm, default to 1e-8.
+
+    Returns
+    -------
+    v0, v : ~astropy.units.Quantity
+        Velocity solutions, shape (n, 3), NaN for the cases
+        which did not converge.
+    status : numpy.ndarray
+        Status of each case, shape (n,), one of the ``LAMBERT_*``
+        constants of :py:mod:`boinor.core.iod`.
+
+    """
+    k_, r0_, r_, tof_ = broadcast_cases(k, r0, r, tof)
+
+    v0, v, status = izzo_many_fast(
+        k_, r0_, r_, tof_, M, prograde, lowpath, numiter, rtol
+    )
+    return v0 << kms, v << kms, status
@@ -0,0 +1,211 @@
+"""Search of multiple gravity assist trajectories over date windows."""
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import os
+
+from astropy import units as u
+import numpy as np
+
+from boinor.core.iod import izzo_many
+from boinor.core.mga import mga_search
+from boinor.iod.porkchop import get_states
+
+
+def _legs(sequence, windows, M, prograde, lowpath, numiter, rtol):
+    """Solves the Lambert transfers of every leg for all the pairs of dates
+    of its bodies, returning the hyperbolic excess velocities at both ends
+    padded to the same number of dates.
+
+    """
+    k = sequence[0].parent.k.to_value(u.km**3 / u.s**2)
+    states = [
+        get_states(body, window) for body, window in zip(sequence, windows)
+    ]
+    t = [(window - windows[0][0]).to_value(u.s) for window in windows]
+    n = max(window.size for window in windows)
+
+    v_dep = np.full((len(sequence) - 1, n, n, 3), np.nan)
+    v_arr = np.full((len(sequence) - 1, n, n, 3), np.nan)
+    for leg in range(len(sequence) - 1):
+        (rr_dpt, vv_dpt), (rr_arr, vv_arr) = states[leg], states[leg + 1]
+        a, b = np.meshgrid(
+            np.arange(t[leg].size), np.arange(t[leg + 1].size), indexing="ij"
+        )
+        a, b = a.ravel(), b.ravel()
+        v1, v2, _ = izzo_many(
+            k,
+            rr_dpt[a],
+            rr_arr[b],
+            t[leg + 1][b] - t[leg][a],
+            M,
+            prograde,
+            lowpath,
+            numiter,
+            rtol,
+        )
+        v_dep[leg, a, b] = v1 - vv_dpt[a]
+        v_arr[leg, a, b] = v2 - vv_arr[b]
+
+    return v_dep, v_arr
+
+
+def mga(
+    sequence,
+    windows,
+    *,
+    r_p_min=None,
+    max_dv=None,
+    num_solutions=1,
+    include_arrival=True,
+    workers=None,
+    M=0,
+    prograde=True,
+    lowpath=True,
+    numiter=35,
+    rtol=1e-8,
+):
+    """Finds the multiple gravity assist trajectories through a sequence
+    of bodies with the smallest total impulse, over grids of encounter dates.
+
+    The Lambert transfers of every leg are solved at once for all the pairs
+    of dates of its bodies. Legs are then patched at each intermediate body
+    with a flyby, with an impulse at periapsis if the excess velocities
+    differ or the body alone cannot turn them enough, and the sequences of
+    dates are searched with branch and bound on the cumulative impulse:
+    partial trajectories which already need more than the best complete
+    ones are not extended. Launch dates are split among a pool of threads,
+    each chunk being searched with the best bound known when it starts.
+
+    Parameters
+    ----------
+    sequence : list of ~boinor.bodies.Body
+        Bodies of the trajectory, from launch to arrival,
+        orbiting the same attractor.
+    windows : list of ~astropy.time.Time
+        Encounter dates considered for each body.
+    r_p_min : list of ~astropy.units.Quantity, optional
+        Minimum radius of periapsis of each body, only used for the flybys,
+        default to 1.05 times the radius of the bodies.
+    max_dv : ~astropy.units.Quantity, optional
+        Upper bound of the total impulse, default to None.
+    num_solutions : int, optional
+        Number of trajectories to return, default to 1.
+    include_arrival : bool, optional
+        Whether the arrival excess velocity adds to the total impulse,
+        False for a final flyby, default to True.
+    workers : int, optional
+        Number of threads, default to the number of CPUs.
+        With one, the search runs in the calling thread.
+    M : int, optional
+        Number of full revolutions of each leg, default to 0.
+    prograde : bool, optional
+        Controls the desired inclination of the transfer orbits.
+    lowpath : bool, optional
+        If `True` or `False`, gets the transfer orbits whose vacant focus is
+        below or above the chord line, respectively.
+    numiter : int, optional
+        Maximum number of iterations, default to 35.
+    rtol : float, optional
+        Relative tolerance of the algorithm, default to 1e-8.
+
+    Returns
+    -------
+    epochs : ~astropy.time.Time
+        Encounter dates of each body of the best trajectories,
+        shape (p, len(sequence)), sorted by increasing total impulse.
+    dv : ~astropy.units.Quantity
+        Total impulse of the best trajectories, shape (p,).
+    impulses : ~astropy.units.Quantity
+        Launch excess velocity, impulse of each flyby and arrival excess
+        velocity of the best trajectories, shape (p, len(sequence)).
+
+    Notes
+    -----
+    Fewer than ``num_solutions`` trajectories are returned if not enough
+    of them are feasible with a total impulse below ``max_dv``.
+
+    """
+    if len(sequence) < 2 or len(windows) != len(sequence):
+        raise ValueError(
+            "Expected at least two bodies and one window of dates per body"
+        )
+    if num_solutions < 1:
+        raise ValueError("Number of solutions must be positive")
+
+    windows = [window.reshape(-1) for window in windows]
+    if r_p_min is None:
+        r_p_min = [1.05 * body.R for body in sequence]
+
+    v_dep, v_arr = _legs(
+        sequence, windows, M, prograde, lowpath, numiter, rtol
+    )
+    arrays = (
+        v_dep,
+        v_arr,
+        np.array([window.size for window in windows]),
+        np.array([body.k.to_value(u.km**3 / u.s**2) for body in sequence]),
+        np.array([r.to_value(u.km) for r in r_p_min]),
+    )
+    bound = np.inf if max_dv is None else max_dv.to_value(u.km / u.s)
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        results = [
+            mga_search(
+                *arrays,
+                np.arange(windows[0].size),
+                include_arrival,
+                bound,
+                num_solutions,
+            )
+        ]
+    else:
+        results = []
+
+        def _bound():
+            if not results:
+                return bound
+            costs = np.sort(np.concatenate([result[0] for result in results]))
+            return min(bound, costs[num_solutions - 1])
+
+        # Chunks start with the best bound found by the previous ones
+        chunks = np.array_split(
+            np.arange(windows[0].size), min(4 * workers, windows[0].size)
+        )
+        with ThreadPoolExecutor(workers) as pool:
+            pending = set()
+            for chunk in chunks:
+                if len(pending) == workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    results += [future.result() for future in done]
+                pending.add(
+                    pool.submit(
+                        mga_search,
+                        *arrays,
+                        chunk,
+                        include_arrival,
+                        _bound(),
+                        num_solutions,
+                    )
+                )
+            results += [future.result() for future in wait(pending)[0]]
+
+    costs = np.concatenate([result[0] for result in results])
+    paths = np.concatenate([result[1] for result in results])
+    impulses = np.concatenate([result[2] for result in results])
+    # Unused slots hold the bound of their chunk, which may tie real costs
+    costs[paths[:, 0] < 0] = np.inf
+    best = np.argsort(costs, kind="stable")[:num_solutions]
+    best = best[paths[best, 0] >= 0]
+
+    t = np.stack(
+        [
+            (window[paths[best, leg]] - windows[0][0]).to_value(u.s)
+            for leg, window in enumerate(windows)
+        ],
+        axis=-1,
+    )
+    return (
+        windows[0][0] + (t << u.s),
+        costs[best] << u.km / u.s,
+        impulses[best] << u.km / u.s,
+    )
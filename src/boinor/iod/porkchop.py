@@ -0,0 +1,430 @@
+"""Lambert transfers between two bodies over grids of dates."""
+from astropy import coordinates as coord, units as u
+import numpy as np
+
+from boinor.bodies import (
+    Earth,
+    Jupiter,
+    Mars,
+    Mercury,
+    Moon,
+    Neptune,
+    Pluto,
+    Saturn,
+    Sun,
+    Uranus,
+    Venus,
+)
+from boinor.core.porkchop import porkchop_cells, porkchop_grid
+from boinor.twobody.propagation import FarnocchiaPropagator
+
+SOLAR_SYSTEM_BODIES = [
+    Sun,
+    Mercury,
+    Venus,
+    Earth,
+    Moon,
+    Mars,
+    Jupiter,
+    Saturn,
+    Uranus,
+    Neptune,
+    Pluto,
+]
+
+
+def get_states(body, epochs):
+    """Computes the states of a body at several epochs at once.
+
+    Parameters
+    ----------
+    body : ~boinor.bodies.Body or ~boinor.twobody.orbit.Orbit
+        Solar system body, whose barycentric state is taken from the
+        ephemerides, or orbit of any other body, propagated
+        with Farnocchia's method.
+    epochs : ~astropy.time.Time
+        Epochs, shape (n,).
+
+    Returns
+    -------
+    rr : numpy.ndarray
+        Positions (km), shape (n, 3).
+    vv : numpy.ndarray
+        Velocities (km / s), shape (n, 3).
+
+    """
+    epochs = epochs.reshape(-1)
+    if body in SOLAR_SYSTEM_BODIES:
+        rr, vv = coord.get_body_barycentric_posvel(body.name, epochs)
+        rr, vv = rr.xyz.T, vv.xyz.T
+    else:
+        rr, vv = FarnocchiaPropagator().propagate_many(
+            body._state, (epochs - body.epoch).to(u.s)
+        )
+
+    return (
+        np.ascontiguousarray(rr.to_value(u.km)),
+        np.ascontiguousarray(vv.to_value(u.km / u.s)),
+    )
+
+
+def porkchop(
+    departure_body,
+    target_body,
+    launch_span,
+    arrival_span,
+    *,
+    M=0,
+    prograde=True,
+    lowpath=True,
+    numiter=35,
+    rtol=1e-8,
+    all_branches=False,
+):
+    """Solves the Lambert transfers for all the pairs of launch
+    and arrival dates.
+
+    The states of both bodies are computed once for each date, and all
+    the transfers are solved by a parallel compiled kernel, so the cost
+    of a cell is the one of the Lambert solver only.
+
+    With ``all_branches``, every feasible number of revolutions up to ``M``
+    and both paths are solved in the same pass, keeping for each cell
+    the branch with the smallest sum of the launch and arrival delta v.
+
+    Parameters
+    ----------
+    departure_body : ~boinor.bodies.Body
+        Body from which departure is done.
+    target_body : ~boinor.bodies.Body or ~boinor.twobody.orbit.Orbit
+        Body for targetting.
+    launch_span : ~astropy.time.Time
+        Launch dates, shape (n,).
+    arrival_span : ~astropy.time.Time
+        Arrival dates, shape (m,).
+    M : int, optional
+        Number of full revolutions, or the maximum one
+        if ``all_branches``, default to 0.
+    prograde : bool, optional
+        Controls the desired inclination of the transfer orbit.
+    lowpath : bool, optional
+        If `True` or `False`, gets the transfer orbit whose vacant focus is
+        below or above the chord line, respectively.
+        Ignored if ``all_branches``.
+    numiter : int, optional
+        Maximum number of iterations, default to 35.
+    rtol : float, optional
+        Relative tolerance of the algorithm, default to 1e-8.
+    all_branches : bool, optional
+        Whether to keep the best branch of each cell, default to False.
+
+    Returns
+    -------
+    dv_launch : ~astropy.units.Quantity
+        Launch delta v, shape (m, n).
+    dv_arrival : ~astropy.units.Quantity
+        Arrival delta v, shape (m, n).
+    c3_launch : ~astropy.units.Quantity
+        Characteristic launch energy, shape (m, n).
+    c3_arrival : ~astropy.units.Quantity
+        Characteristic arrival energy, shape (m, n).
+    tof : ~astropy.units.Quantity
+        Time of flight of each transfer, shape (m, n).
+    revs : numpy.ndarray
+        Only if ``all_branches``, number of revolutions of the best branch
+        of each cell, shape (m, n), -1 if no branch converged.
+    lowpath : numpy.ndarray
+        Only if ``all_branches``, path of the best branch
+        of each cell, shape (m, n).
+
+    Notes
+    -----
+    Transfers arriving before launch or for which the Lambert problem
+    could not be solved are NaN.
+
+    """
+    k = departure_body.parent.k.to_value(u.km**3 / u.s**2)
+    launch_span = launch_span.reshape(-1)
+    arrival_span = arrival_span.reshape(-1)
+    t_dpt = (launch_span - launch_span[0]).to_value(u.s)
+    t_arr = (arrival_span - launch_span[0]).to_value(u.s)
+
+    dv_launch, dv_arrival, _, revs, lowpaths = porkchop_grid(
+        k,
+        *get_states(departure_body, launch_span),
+        t_dpt,
+        *get_states(target_body, arrival_span),
+        t_arr,
+        M,
+        prograde,
+        lowpath,
+        numiter,
+        rtol,
+        all_branches,
+    )
+
+    tof = np.where(
+        np.isnan(dv_launch), np.nan, t_arr[:, None] - t_dpt[None, :]
+    )
+    result = (
+        dv_launch << u.km / u.s,
+        dv_arrival << u.km / u.s,
+        dv_launch**2 << u.km**2 / u.s**2,
+        dv_arrival**2 << u.km**2 / u.s**2,
+        (tof << u.s).to(u.d),
+    )
+    if all_branches:
+        result += (revs, lowpaths)
+
+    return result
+
+
+def _fine_times(span, scale):
+    """Times (s) of the nodes of ``span`` subdivided ``scale`` times,
+    from the first date of the span.
+
+    """
+    t = (span - span[0]).to_value(u.s)
+    if t.size < 2:
+        raise ValueError("Spans must contain at least two dates")
+
+    step = np.diff(t)
+    if not (step > 0).all() or not np.allclose(step, step[0]):
+        raise ValueError("Spans must be increasing and evenly spaced")
+
+    return np.arange((t.size - 1) * scale + 1) * (step[0] / scale)
+
+
+def launch_windows(
+    departure_body,
+    target_body,
+    launch_span,
+    arrival_span,
+    *,
+    levels=4,
+    objective="dv",
+    threshold=None,
+    M=0,
+    prograde=True,
+    lowpath=True,
+    numiter=35,
+    rtol=1e-8,
+    return_samples=False,
+):
+    """Finds the local minima of a porkchop plot by refining
+    a coarse grid around them.
+
+    The grid given by ``launch_span`` and ``arrival_span`` is evaluated
+    first. Then, ``levels`` times, the spacing of the dates is halved only
+    around the cells which are local minima of the objective among their
+    neighbours, or below ``threshold``, and missing neighbours of these
+    cells are evaluated until every local minimum is surrounded,
+    so minima can move towards lower values between the coarse cells.
+    The Lambert iterations of each new cell start from the solution of
+    the cell it was refined from.
+
+    The result has the resolution of a porkchop plot with
+    ``2**levels`` times as many dates on each axis, at the cost of
+    a small fraction of its cells when the threshold is not too loose.
+    Minima lying in valleys narrower than the coarse spacing can be
+    missed, unless the threshold is loose enough to refine them.
+
+    Parameters
+    ----------
+    departure_body : ~boinor.bodies.Body
+        Body from which departure is done.
+    target_body : ~boinor.bodies.Body or ~boinor.twobody.orbit.Orbit
+        Body for targetting.
+    launch_span : ~astropy.time.Time
+        Evenly spaced launch dates of the coarse grid, shape (n,).
+    arrival_span : ~astropy.time.Time
+        Evenly spaced arrival dates of the coarse grid, shape (m,).
+    levels : int, optional
+        Number of times the spacing is halved, default to 4.
+    objective : str, optional
+        Quantity to minimize, either ``"dv"``, the sum of the launch and
+        arrival delta v, or ``"c3"``, the characteristic launch energy.
+        Default to ``"dv"``.
+    threshold : ~astropy.units.Quantity, optional
+        Cells with an objective below this value are refined as well,
+        to get the contours of the feasible region. Default to None.
+    M : int, optional
+        Number of full revolutions, default to 0.
+    prograde : bool, optional
+        Controls the desired inclination of the transfer orbit.
+    lowpath : bool, optional
+        If `True` or `False`, gets the transfer orbit whose vacant focus is
+        below or above the chord line, respectively.
+    numiter : int, optional
+        Maximum number of iterations, default to 35.
+    rtol : float, optional
+        Relative tolerance of the algorithm, default to 1e-8.
+    return_samples : bool, optional
+        Whether to also return every evaluated cell, default to False.
+
+    Returns
+    -------
+    minima : tuple
+        Launch dates, arrival dates, launch delta v, arrival delta v,
+        characteristic launch energy, characteristic arrival energy and
+        time of flight of the local minima, shape (p,),
+        sorted by increasing objective.
+    samples : tuple
+        Only if ``return_samples``, the same quantities for every
+        evaluated cell, for instance to draw the contours
+        with :py:func:`matplotlib.pyplot.tricontour`.
+
+    """
+    if objective not in ("dv", "c3"):
+        raise ValueError("Objective must be either 'dv' or 'c3'")
+    if levels < 0:
+        raise ValueError("Number of levels must be positive or zero")
+
+    k = departure_body.parent.k.to_value(u.km**3 / u.s**2)
+    launch_span = launch_span.reshape(-1)
+    arrival_span = arrival_span.reshape(-1)
+    t_offset = (arrival_span[0] - launch_span[0]).to_value(u.s)
+    scale = 2**levels
+    t_dpt = _fine_times(launch_span, scale)
+    t_arr = _fine_times(arrival_span, scale) + t_offset
+
+    if threshold is None:
+        threshold = np.nan
+    elif objective == "dv":
+        threshold = threshold.to_value(u.km / u.s)
+    else:
+        threshold = threshold.to_value(u.km**2 / u.s**2)
+
+    states = []
+    for body, t in ((departure_body, t_dpt), (target_body, t_arr)):
+        rr = np.full((t.size, 3), np.nan)
+        states.append((body, t, rr, np.full((t.size, 3), np.nan)))
+
+    def _states(state, idx):
+        body, t, rr, vv = state
+        missing = np.unique(idx[np.isnan(rr[idx, 0])])
+        if missing.size:
+            rr[missing], vv[missing] = get_states(
+                body, launch_span[0] + (t[missing] << u.s)
+            )
+        return rr[idx], vv[idx]
+
+    # Evaluated cells, by their indices on the finest grid
+    samples = {}
+
+    def _evaluate(cells, x_0):
+        new = {}
+        for cell, x in zip(cells, x_0):
+            i, j = cell
+            if (
+                cell not in samples
+                and 0 <= i < t_dpt.size
+                and 0 <= j < t_arr.size
+            ):
+                new.setdefault(cell, x)
+        if not new:
+            return []
+
+        i, j = np.array(list(new)).T
+        dv_dpt, dv_arr, x, _ = porkchop_cells(
+            k,
+            *_states(states[0], i),
+            *_states(states[1], j),
+            t_arr[j] - t_dpt[i],
+            np.fromiter(new.values(), float, len(new)),
+            M,
+            prograde,
+            lowpath,
+            numiter,
+            rtol,
+        )
+        value = dv_dpt + dv_arr if objective == "dv" else dv_dpt**2
+        for n, cell in enumerate(new):
+            samples[cell] = (value[n], x[n], dv_dpt[n], dv_arr[n])
+        return list(new)
+
+    def _around(cell, step, reach):
+        i, j = cell
+        return [
+            (i + a * step, j + b * step)
+            for a in range(-reach, reach + 1)
+            for b in range(-reach, reach + 1)
+            if a or b
+        ]
+
+    coarse_i, coarse_j = np.meshgrid(
+        np.arange(0, t_dpt.size, scale), np.arange(0, t_arr.size, scale)
+    )
+    active = _evaluate(
+        list(zip(coarse_i.ravel().tolist(), coarse_j.ravel().tolist())),
+        np.full(coarse_i.size, np.nan),
+    )
+
+    step = scale
+    while True:
+        # Surrounds the candidates of this level with evaluated neighbours,
+        # following the minima wherever they move
+        while True:
+            minima, candidates, missing = [], [], []
+            for cell in active:
+                value, x = samples[cell][:2]
+                if np.isnan(value):
+                    continue
+
+                neighbours = [
+                    other
+                    for other in _around(cell, step, 1)
+                    if 0 <= other[0] < t_dpt.size
+                    and 0 <= other[1] < t_arr.size
+                ]
+                if all(
+                    not samples[other][0] < value
+                    for other in neighbours
+                    if other in samples
+                ):
+                    minima.append(cell)
+                elif not value < threshold:
+                    continue
+                candidates.append(cell)
+                missing += [
+                    (other, x) for other in neighbours if other not in samples
+                ]
+
+            if not missing:
+                break
+            cells, x_0 = zip(*missing)
+            active += _evaluate(cells, x_0)
+
+        if step == 1:
+            break
+
+        step //= 2
+        active = list(candidates)
+        for cell in candidates:
+            cells = _around(cell, step, 2)
+            active += _evaluate(cells, [samples[cell][1]] * len(cells))
+        active = list(dict.fromkeys(active))
+
+    def _result(cells):
+        i, j = np.array(cells, dtype=int).reshape(-1, 2).T
+        dv_dpt, dv_arr = (
+            np.array([samples[cell][2:] for cell in cells], dtype=float)
+            .reshape(-1, 2)
+            .T
+        )
+        tof = np.where(np.isnan(dv_dpt), np.nan, t_arr[j] - t_dpt[i])
+        return (
+            launch_span[0] + (t_dpt[i] << u.s),
+            launch_span[0] + (t_arr[j] << u.s),
+            dv_dpt << u.km / u.s,
+            dv_arr << u.km / u.s,
+            dv_dpt**2 << u.km**2 / u.s**2,
+            dv_arr**2 << u.km**2 / u.s**2,
+            (tof << u.s).to(u.d),
+        )
+
+    minima.sort(key=lambda cell: samples[cell][0])
+    if return_samples:
+        return _result(minima), _result(list(samples))
+
+    return _result(minima)
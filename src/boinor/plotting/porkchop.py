@@ -1,104 +1,9 @@
 """This is the implementation of porkchop plot."""
-from astropy import coordinates as coord, units as u
+from astropy import units as u
 from matplotlib import pyplot as plt
 import numpy as np
 
-from boinor.bodies import (
-    Earth,
-    Jupiter,
-    Mars,
-    Mercury,
-    Moon,
-    Neptune,
-    Pluto,
-    Saturn,
-    Sun,
-    Uranus,
-    Venus,
-)
-from boinor.maneuver import Maneuver
-from boinor.twobody.orbit import Orbit
-from boinor.util import norm
-
-
-def _get_state(body, time):
-    """Computes the position of a body for a given time."""
-    solar_system_bodies = [
-        Sun,
-        Mercury,
-        Venus,
-        Earth,
-        Moon,
-        Mars,
-        Jupiter,
-        Saturn,
-        Uranus,
-        Neptune,
-        Pluto,
-    ]
-
-    # We check if body belongs to boinor.bodies
-    if body in solar_system_bodies:
-        rr, vv = coord.get_body_barycentric_posvel(body.name, time)
-    else:
-        rr, vv = body.propagate(time).rv()
-        rr = coord.CartesianRepresentation(rr)
-        vv = coord.CartesianRepresentation(vv)
-
-    return rr.xyz, vv.xyz
-
-
-def _targetting(departure_body, target_body, t_launch, t_arrival):
-    """This function returns the increment in departure and arrival velocities."""
-    # Get position and velocities for departure and arrival
-    rr_dpt_body, vv_dpt_body = _get_state(departure_body, t_launch)
-    rr_arr_body, vv_arr_body = _get_state(target_body, t_arrival)
-
-    # Transform into Orbit objects
-    attractor = departure_body.parent
-    orb_dpt = Orbit.from_vectors(
-        attractor, rr_dpt_body, vv_dpt_body, epoch=t_launch
-    )
-    orb_arr = Orbit.from_vectors(
-        attractor, rr_arr_body, vv_arr_body, epoch=t_arrival
-    )
-
-    # Define time of flight
-    tof = orb_arr.epoch - orb_dpt.epoch
-
-    if tof.to_value(u.s) <= 0:
-        return None, None, None, None, None
-
-    try:
-        # Lambert is now a Maneuver object
-        man_lambert = Maneuver.lambert(orb_dpt, orb_arr)
-
-        # Get norm delta velocities
-        dv_dpt = norm(man_lambert.impulses[0][1])
-        dv_arr = norm(man_lambert.impulses[1][1])
-
-        # Compute all the output variables
-        c3_launch = dv_dpt**2
-        c3_arrival = dv_arr**2
-
-        return (
-            dv_dpt.to_value(u.km / u.s),
-            dv_arr.to_value(u.km / u.s),
-            c3_launch.to_value(u.km**2 / u.s**2),
-            c3_arrival.to_value(u.km**2 / u.s**2),
-            tof.jd,
-        )
-
-    except AssertionError:
-        return None, None, None, None, None
-
-
-# numpy.vectorize is amazing
-targetting_vec = np.vectorize(
-    _targetting,
-    otypes=[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray],
-    excluded=[0, 1],
-)
+from boinor.iod.porkchop import porkchop
 
 
 class PorkchopPlotter:
@@ -124,6 +29,12 @@ class PorkchopPlotter:
         Sets the maximum C3 value for porkchop
     max_vhp: float
         Sets the maximum arrival velocity for porkchop
+    M: int
+        Number of full revolutions of the transfers,
+        or the maximum one if ``all_branches``
+    all_branches: bool
+        Whether to keep the branch with the smallest delta v of each cell
+        among all the feasible numbers of revolutions up to ``M`` and paths
 
     """
 
@@ -138,6 +49,8 @@ class PorkchopPlotter:
         vhp=True,
         max_c3=45.0 * u.km**2 / u.s**2,
         max_vhp=5 * u.km / u.s,
+        M=0,
+        all_branches=False,
     ):
         self.departure_body = departure_body
         self.target_body = target_body
@@ -148,6 +61,8 @@ class PorkchopPlotter:
         self.vhp = vhp
         self.max_c3 = max_c3
         self.max_vhp = max_vhp
+        self.M = M
+        self.all_branches = all_branches
 
     def plot(self):
         """Plots porkchop between two bodies.
@@ -176,12 +91,14 @@ class PorkchopPlotter:
         >>> dv_launch, dev_dpt, c3dpt, c3arr, tof = porkchop_plot.porkchop()
 
         """
-        dv_launch, dv_arrival, c3_launch, c3_arrival, tof = targetting_vec(
+        dv_launch, dv_arrival, c3_launch, c3_arrival, tof = porkchop(
             self.departure_body,
             self.target_body,
-            self.launch_span[np.newaxis, :],
-            self.arrival_span[:, np.newaxis],
-        )
+            self.launch_span,
+            self.arrival_span,
+            M=self.M,
+            all_branches=self.all_branches,
+        )[:5]
 
         # Start drawing porkchop
 
@@ -197,14 +114,14 @@ class PorkchopPlotter:
         c = self.ax.contourf(
             [D.to_datetime() for D in self.launch_span],
             [A.to_datetime() for A in self.arrival_span],
-            c3_launch.astype("float64"),
+            c3_launch.to_value(u.km**2 / u.s**2),
             c3_levels.astype("float64"),
         )
 
         line = self.ax.contour(
             [D.to_datetime() for D in self.launch_span],
             [A.to_datetime() for A in self.arrival_span],
-            c3_launch.astype("float64"),
+            c3_launch.to_value(u.km**2 / u.s**2),
             c3_levels.astype("float64"),
             colors="black",
             linestyles="solid",
@@ -220,7 +137,7 @@ class PorkchopPlotter:
             tfl_contour = self.ax.contour(
                 [D.to_datetime() for D in self.launch_span],
                 [A.to_datetime() for A in self.arrival_span],
-                tof.astype("float64"),
+                tof.to_value(u.d),
                 time_levels.astype("float64"),
                 colors="red",
                 linestyles="dashed",
@@ -237,7 +154,7 @@ class PorkchopPlotter:
             vhp_contour = self.ax.contour(
                 [D.to_datetime() for D in self.launch_span],
                 [A.to_datetime() for A in self.arrival_span],
-                dv_arrival.astype("float64"),
+                dv_arrival.to_value(u.km / u.s),
                 vhp_levels.astype("float64"),
                 colors="navy",
                 linewidths=2.0,
@@ -266,13 +183,7 @@ class PorkchopPlotter:
         self.ax.set_xlabel("Launch date", fontsize=10, fontweight="bold")
         self.ax.set_ylabel("Arrival date", fontsize=10, fontweight="bold")
 
-        return (
-            dv_launch * u.km / u.s,
-            dv_arrival * u.km / u.s,
-            c3_launch * u.km**2 / u.s**2,
-            c3_arrival * u.km**2 / u.s**2,
-            tof * u.d,
-        )
+        return dv_launch, dv_arrival, c3_launch, c3_arrival, tof
 
     def porkchop(self):
         return self.plot()
@@ -1,6 +1,10 @@
 from astropy import units as u
+import numpy as np
 
-from boinor.core.flybys import compute_flyby as compute_flyby_fast
+from boinor.core.flybys import (
+    compute_flyby as compute_flyby_fast,
+    powered_flyby as powered_flyby_fast,
+)
 
 
 @u.quantity_input(
@@ -45,3 +49,53 @@ def compute_flyby(v_spacecraft, v_body, k, r_p, theta=0 * u.deg):
     )
 
     return v_spacecraft_out * u.km / u.s, delta * u.rad
+
+
+@u.quantity_input(
+    v_inf_in=u.km / u.s,
+    v_inf_out=u.km / u.s,
+    k=u.km**3 / u.s**2,
+    r_p_min=u.km,
+)
+def powered_flyby(v_inf_in, v_inf_out, k, r_p_min):
+    """Computes the impulse at periapsis needed to connect an inbound
+    and an outbound hyperbolic excess velocity with a flyby.
+
+    Parameters
+    ----------
+    v_inf_in : ~astropy.units.Quantity
+        Inbound hyperbolic excess velocity.
+    v_inf_out : ~astropy.units.Quantity
+        Outbound hyperbolic excess velocity.
+    k : ~astropy.units.Quantity
+        Standard gravitational parameter of the body.
+    r_p_min : ~astropy.units.Quantity
+        Minimum radius of periapsis, measured from the center of the body.
+
+    Returns
+    -------
+    dv : ~astropy.units.Quantity
+        Impulse at periapsis, zero for unpowered flybys.
+    r_p : ~astropy.units.Quantity
+        Radius of periapsis.
+
+    Raises
+    ------
+    ValueError
+        If the body cannot turn the excess velocity enough
+        without going below ``r_p_min``.
+
+    """
+    dv, r_p = powered_flyby_fast(
+        v_inf_in.to_value(u.km / u.s),
+        v_inf_out.to_value(u.km / u.s),
+        k.to_value(u.km**3 / u.s**2),
+        r_p_min.to_value(u.km),
+    )
+    if np.isnan(dv):
+        raise ValueError(
+            "The body cannot turn the excess velocity enough "
+            "above the minimum radius of periapsis"
+        )
+
+    return dv * u.km / u.s, r_p * u.km
@@ -1,3 +1,4 @@
-from boinor.twobody.orbit import Orbit
+from boinor.twobody.orbit import Orbit, OrbitArray
+from boinor.twobody.trajectory import Trajectory
 
-__all__ = ["Orbit"]
+__all__ = ["Orbit", "OrbitArray", "Trajectory"]
@@ -1,18 +1,94 @@
 from warnings import warn
 
 from astropy import units as u
-from astropy.coordinates import get_body_barycentric_posvel
+from astropy.coordinates import get_body_barycentric
 import numpy as np
 
+from boinor._math.interpolate import chebyshev_fit, chebyshev_piecewise
 from boinor._math.linalg import norm
+from boinor.core.access import find_events_many
 from boinor.core.events import (
+    ALTITUDE_EVENT,
+    LATITUDE_EVENT,
+    LOS_EVENT,
+    NODE_EVENT,
+    PENUMBRA_EVENT,
+    UMBRA_EVENT,
+    CompiledEvents,
     eclipse_function as eclipse_function_fast,
     line_of_sight as line_of_sight_fast,
 )
+from boinor.core.propagation.farnocchia import (
+    farnocchia_rv_many as farnocchia_rv_many_fast,
+)
 from boinor.core.spheroid_location import (
     cartesian_to_ellipsoidal as cartesian_to_ellipsoidal_fast,
 )
 
+# Default length (s) and degree of the segments of the Chebyshev fits
+# of the positions of other bodies
+_SEGMENT = 86400.0
+_DEGREE = 10
+
+
+def compile_events(events, t_min, t_max, epoch=None):
+    """Compiles events to be evaluated inside the compiled integrator.
+
+    The positions of other bodies needed by the events, like the secondary
+    body of the eclipse events, are fitted once over the whole span of the
+    integration, so that evaluating the events never returns to Python.
+
+    Parameters
+    ----------
+    events : list
+        Events, which must support compilation.
+    t_min : float
+        Earliest time of the integration (s).
+    t_max : float
+        Latest time of the integration (s).
+    epoch : ~astropy.time.Time, optional
+        Origin of the times, default to the epoch of the orbit
+        of each event.
+
+    Returns
+    -------
+    ~boinor.core.events.CompiledEvents
+        Compiled events, in the same order.
+
+    """
+    kinds, params, tables = [], [], []
+    for event in events:
+        offset = 0.0
+        if epoch is not None and isinstance(event, _FittedPositionEvent):
+            offset = (epoch - event._epoch).to_value(u.s)
+
+        kind, param, table = event._compile(t_min + offset, t_max + offset)
+        if table is not None:
+            bounds, coeffs = table
+            param = (len(tables), len(bounds) - 1) + param
+            # The series are the same on the shifted segments
+            tables.append((bounds - offset, coeffs))
+        kinds.append(kind)
+        params.append(param + (0.0,) * (4 - len(param)))
+
+    # Tables are padded to the largest number of segments
+    num_segments = max((len(bounds) - 1 for bounds, _ in tables), default=1)
+    all_bounds = np.zeros((len(tables), num_segments + 1))
+    all_coeffs = np.zeros((len(tables), num_segments, _DEGREE + 1, 3))
+    for i, (bounds, coeffs) in enumerate(tables):
+        all_bounds[i, : len(bounds)] = bounds
+        all_bounds[i, len(bounds) :] = bounds[-1]
+        all_coeffs[i, : len(coeffs)] = coeffs
+
+    return CompiledEvents(
+        kinds,
+        np.array(params).reshape(len(events), 4),
+        [event.direction for event in events],
+        [event.terminal for event in events],
+        all_bounds,
+        all_coeffs,
+    )
+
 
 class Event:
     """Base class for event functionalities.
@@ -45,6 +121,18 @@ class Event:
     def __call__(self, t, uu, k):
         raise NotImplementedError
 
+    def _compile(self, t_min, t_max):
+        """Compiled form of the event, see :py:func:`compile_events`.
+
+        Returns the kind of event, its parameters and the bounds and
+        coefficients of the Chebyshev fit of the positions of the body
+        it depends on between ``t_min`` and ``t_max``, or None.
+
+        """
+        raise ValueError(
+            f"{self.__class__.__name__} does not support compilation"
+        )
+
 
 class AltitudeCrossEvent(Event):
     """Detect if a satellite crosses a specific threshold altitude.
@@ -77,6 +165,9 @@ class AltitudeCrossEvent(Event):
             r_norm - self._R - self._alt
         )  # If this goes from +ve to -ve, altitude is decreasing.
 
+    def _compile(self, t_min, t_max):
+        return ALTITUDE_EVENT, (self._R + self._alt,), None
+
 
 class LithobrakeEvent(AltitudeCrossEvent):
     """Terminal event that detects impact with the attractor surface.
@@ -128,10 +219,85 @@ class LatitudeCrossEvent(Event):
 
         return np.rad2deg(lat_) - self._lat
 
+    def _compile(self, t_min, t_max):
+        return LATITUDE_EVENT, (self._R, self._R_polar, self._lat), None
 
-class EclipseEvent(Event):
+
+class _FittedPositionEvent(Event):
+    """Base class for events depending on the position of another body.
+
+    The position is not computed on every evaluation. Instead, it is fitted
+    with piecewise Chebyshev series, either once over the span where it is
+    known, or with segments of ``_segment`` seconds which are extended
+    whenever the integration leaves the covered span.
+
+    Subclasses set ``_epoch`` and implement ``_positions``, which receives
+    an array of times (s) since that epoch and returns the positions (km)
+    of the body with respect to its attractor, with shape (p, 3).
+
+    """
+
+    _segment = _SEGMENT
+    # Times (s) between which the positions are known, if limited
+    _span = None
+
+    def __init__(self, terminal, direction):
+        super().__init__(terminal, direction)
+        self._bounds = None
+        self._coeffs = None
+
+    def _positions(self, t):
+        raise NotImplementedError
+
+    def _fit(self, t_min, t_max):
+        if self._span is not None and (
+            t_min < self._span[0] or t_max > self._span[1]
+        ):
+            raise ValueError(
+                "The position of the other body is only known "
+                f"between {self._span[0]} s and {self._span[1]} s "
+                f"from the epoch, got {t_min} s to {t_max} s"
+            )
+
+        start = np.floor(t_min / self._segment)
+        end = max(np.ceil(t_max / self._segment), start + 1)
+        bounds = np.arange(start, end + 1) * self._segment
+        if self._span is not None:
+            bounds = np.unique(np.clip(bounds, *self._span))
+
+        return bounds, chebyshev_fit(self._positions, bounds, _DEGREE)
+
+    def _position(self, t):
+        if self._bounds is None or not (
+            self._bounds[0] <= t <= self._bounds[-1]
+        ):
+            # Covers t doubling the span of the previous fit, if any,
+            # so that long integrations only need a few fits
+            t_min = t_max = t
+            if self._bounds is not None:
+                span = self._bounds[-1] - self._bounds[0]
+                if t < self._bounds[0]:
+                    t_min = min(t, self._bounds[0] - span)
+                    t_max = self._bounds[-1]
+                else:
+                    t_min = self._bounds[0]
+                    t_max = max(t, self._bounds[-1] + span)
+            if self._span is not None:
+                t_min = max(t_min, min(t, self._span[0]))
+                t_max = min(t_max, max(t, self._span[1]))
+
+            self._bounds, self._coeffs = self._fit(t_min, t_max)
+
+        return chebyshev_piecewise(t, self._bounds, self._coeffs)
+
+
+class EclipseEvent(_FittedPositionEvent):
     """Base class for the eclipse event.
 
+    The position of the secondary body is not computed on every evaluation.
+    Instead, it is fitted once with piecewise Chebyshev series of one day,
+    and the fit is extended whenever the integration leaves the covered span.
+
     Parameters
     ----------
     orbit: boinor.twobody.orbit.Orbit
@@ -152,16 +318,18 @@ class EclipseEvent(Event):
         self.R_sec = self._secondary_body.R.to_value(u.km)
         self.R_primary = self._primary_body.R.to_value(u.km)
 
-    def __call__(self, t, u_, k):
-        # Solve for primary and secondary bodies position w.r.t. solar system
-        # barycenter at a particular epoch.
-        (r_primary_wrt_ssb, _), (r_secondary_wrt_ssb, _) = (
-            get_body_barycentric_posvel(body.name, self._epoch + t * u.s)
+    def _positions(self, t):
+        # Position of the secondary body with respect to the primary body,
+        # computed from their positions w.r.t. the solar system barycenter.
+        epochs = self._epoch + t * u.s
+        r_primary_wrt_ssb, r_secondary_wrt_ssb = (
+            get_body_barycentric(body.name, epochs)
             for body in (self._primary_body, self._secondary_body)
         )
-        r_sec = ((r_secondary_wrt_ssb - r_primary_wrt_ssb).xyz << u.km).value
+        return (r_secondary_wrt_ssb - r_primary_wrt_ssb).xyz.to_value(u.km).T
 
-        return r_sec
+    def __call__(self, t, u_, k):
+        return self._position(t)
 
 
 class PenumbraEvent(EclipseEvent):
@@ -197,6 +365,13 @@ class PenumbraEvent(EclipseEvent):
 
         return shadow_function
 
+    def _compile(self, t_min, t_max):
+        return (
+            PENUMBRA_EVENT,
+            (self.R_sec, self.R_primary),
+            self._fit(t_min, t_max),
+        )
+
 
 class UmbraEvent(EclipseEvent):
     """Detect whether a satellite is in umbra or not.
@@ -226,6 +401,13 @@ class UmbraEvent(EclipseEvent):
 
         return shadow_function
 
+    def _compile(self, t_min, t_max):
+        return (
+            UMBRA_EVENT,
+            (self.R_sec, self.R_primary),
+            self._fit(t_min, t_max),
+        )
+
 
 class NodeCrossEvent(Event):
     """Detect equatorial node (ascending or descending) crossings.
@@ -249,28 +431,95 @@ class NodeCrossEvent(Event):
         # Check if the z coordinate of the satellite is zero.
         return u_[2]
 
+    def _compile(self, t_min, t_max):
+        return NODE_EVENT, (), None
 
-class LosEvent(Event):
+
+class LosEvent(_FittedPositionEvent):
     """Detect whether there exists a LOS between two satellites.
 
+    The position of the other satellite is evaluated at the time of every
+    evaluation of the event, from a piecewise Chebyshev fit of its orbit or
+    of its ephemerides, so the event can also be compiled,
+    see :py:func:`compile_events`.
+
     Parameters
     ----------
-    attractor: ~boinor.bodies.body
-        The central attractor with respect to which the position vectors of the satellites are defined.
-    pos_coords: ~astropy.quantity.Quantity
-        A list of position coordinates for the secondary body. These coordinates
-        can be found by propagating the body for a desired amount of time.
+    orbit: ~boinor.twobody.orbit.Orbit
+        Orbit of the satellite.
+    secondary: ~boinor.twobody.orbit.Orbit or ~boinor.ephem.Ephem
+        Orbit or ephemerides of the other satellite, with respect to the same
+        attractor and plane. Orbits are propagated with Farnocchia's method,
+        perturbed motion can be given as ephemerides, which must then cover
+        the whole propagation.
+    terminal: bool, optional
+        Whether to terminate integration when the event occurs, defaults to False.
+    direction: float, optional
+        Handle triggering of event based on whether the line of sight is gained
+        or lost, defaults to 0, i.e. event is triggered in both cases.
 
     """
 
-    def __init__(self, attractor, pos_coords, terminal=False, direction=0):
+    def __init__(self, orbit, secondary, terminal=False, direction=0):
+        # Imported here to avoid circular imports
+        from boinor.ephem import Ephem  # pylint: disable=C0415
+        from boinor.twobody.orbit import Orbit  # pylint: disable=C0415
+
         super().__init__(terminal, direction)
-        self._attractor = attractor
-        self._pos_coords = (pos_coords << u.km).value.tolist()
-        self._last_coord = (
-            self._pos_coords[-1] << u.km
-        ).value  # Used to prevent any errors if `self._pos_coords` gets exhausted early.
-        self._R = self._attractor.R.to_value(u.km)
+        self._epoch = orbit.epoch
+        self._R = orbit.attractor.R.to_value(u.km)
+
+        if isinstance(secondary, Orbit):
+            if secondary.attractor != orbit.attractor:
+                raise ValueError(
+                    "The orbits of both satellites must have the same attractor"
+                )
+            if secondary.plane != orbit.plane:
+                raise ValueError(
+                    "The orbits of both satellites must have the same plane"
+                )
+
+            self._k = orbit.attractor.k.to_value(u.km**3 / u.s**2)
+            self._rv = (
+                secondary.r.to_value(u.km),
+                secondary.v.to_value(u.km / u.s),
+            )
+            self._offset = (self._epoch - secondary.epoch).to_value(u.s)
+            # Segments shorter than the fastest pass through the periapsis
+            self._segment = (
+                2
+                * np.pi
+                * np.sqrt(secondary.r_p.to_value(u.km) ** 3 / self._k)
+            ) / 16
+        elif isinstance(secondary, Ephem):
+            if secondary.plane != orbit.plane:
+                raise ValueError(
+                    "The ephemerides must have the same plane as the orbit"
+                )
+
+            self._ephem = secondary
+            t = (secondary.epochs - self._epoch).to_value(u.s)
+            self._span = (t[0], t[-1])
+            # Segments spanning a few samples of the ephemerides
+            self._segment = 8 * np.min(np.diff(t))
+        else:
+            raise ValueError(
+                "The other satellite must be given as an Orbit or an Ephem"
+            )
+
+    def _positions(self, t):
+        if self._span is not None:
+            coordinates = self._ephem.sample(self._epoch + t * u.s)
+            return coordinates.xyz.to_value(u.km).T
+
+        rr, _ = farnocchia_rv_many_fast(
+            self._k,
+            *self._rv,
+            t + self._offset,
+            np.empty((len(t), 3)),
+            np.empty((len(t), 3)),
+        )
+        return rr
 
     def __call__(self, t, u_, k):
         self._last_t = t
@@ -280,10 +529,89 @@ class LosEvent(Event):
                 "The norm of the position vector of the primary body is less than the radius of the attractor."
             )
 
-        pos_coord = (
-            self._pos_coords.pop(0) if self._pos_coords else self._last_coord
+        return line_of_sight_fast(u_[:3], self._position(t), self._R)
+
+    def _compile(self, t_min, t_max):
+        return LOS_EVENT, (self._R,), self._fit(t_min, t_max)
+
+
+def find_events(orbits, events, start, end, *, J2=None, samples_per_period=36):
+    """Finds the crossings of events for a whole catalog of orbits
+    without integrating them.
+
+    The orbits are propagated analytically, either unperturbed or with the
+    secular J2 rates, see
+    :py:class:`~boinor.twobody.propagation.J2SecularPropagator`. The events
+    are sampled with ``samples_per_period`` steps per period of the circular
+    orbit of the radius of the periapsis, to bracket their sign changes,
+    which are then located on the propagated states.
+
+    Parameters
+    ----------
+    orbits : ~boinor.twobody.orbit.array.OrbitArray
+        Orbits of the catalog.
+    events : list
+        Events to find, which must support compilation,
+        see :py:func:`compile_events`.
+    start : ~astropy.time.Time
+        Beginning of the search.
+    end : ~astropy.time.Time
+        End of the search.
+    J2 : ~astropy.units.Quantity, optional
+        Oblateness factor used for the secular rates of elliptic orbits,
+        default to unperturbed motion.
+    samples_per_period : int, optional
+        Number of samples per period used to bracket the crossings,
+        default to 36. Events which may cross twice within a sample
+        need more samples.
+
+    Returns
+    -------
+    list
+        For each event, the indices of the orbits and the times of the
+        crossings (s) since ``start``, sorted by orbit and by time.
+        The crossings of each orbit stop at its first terminal event.
+
+    """
+    attractor = orbits.attractor
+    k = attractor.k.to_value(u.km**3 / u.s**2)
+    p, ecc, inc, raan, argp, nu = orbits._state.to_classical().to_value()
+    if J2 is not None and not np.all(ecc < 1):
+        raise ValueError("The secular J2 rates only support elliptic orbits")
+
+    t0 = (orbits.epochs - start).to_value(u.s)
+    t_max = (end - start).to_value(u.s)
+    steps = 2 * np.pi * np.sqrt((p / (1 + ecc)) ** 3 / k) / samples_per_period
+
+    compiled = compile_events(events, 0.0, t_max, epoch=start)
+    orbit_indices, event_indices, t_events = find_events_many(
+        k,
+        p,
+        ecc,
+        inc,
+        raan,
+        argp,
+        nu,
+        t0,
+        0.0,
+        t_max,
+        steps,
+        0.0 if J2 is None else J2.to_value(u.one),
+        attractor.R.to_value(u.km),
+        compiled.kinds,
+        compiled.params,
+        compiled.directions,
+        compiled.terminal,
+        compiled.bounds,
+        compiled.coeffs,
+    )
+
+    crossings = []
+    for i in range(len(events)):
+        found = event_indices == i
+        order = np.lexsort((t_events[found], orbit_indices[found]))
+        crossings.append(
+            (orbit_indices[found][order], t_events[found][order] << u.s)
         )
 
-        # Need to cast `pos_coord` to array since `norm` inside numba only works for arrays, not lists.
-        delta_angle = line_of_sight_fast(u_[:3], np.array(pos_coord), self._R)
-        return delta_angle
+    return crossings
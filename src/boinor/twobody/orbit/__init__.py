@@ -1,3 +1,4 @@
+from boinor.twobody.orbit.array import OrbitArray
 from boinor.twobody.orbit.scalar import Orbit
 
-__all__ = ["Orbit"]
+__all__ = ["Orbit", "OrbitArray"]
@@ -0,0 +1,451 @@
+from functools import cached_property
+
+from astropy import time, units as u
+from astropy.coordinates import CartesianDifferential, CartesianRepresentation
+import numpy as np
+
+from boinor.constants import J2000
+from boinor.ephem import Ephem
+from boinor.frames import Planes
+from boinor.twobody.elements import mean_motion, period
+from boinor.twobody.orbit.scalar import Orbit
+from boinor.twobody.propagation import FarnocchiaPropagator
+from boinor.twobody.states import ClassicalStateArray, RVStateArray
+
+ORBIT_ARRAY_FORMAT = "Array of {num} orbits around {body} ({plane})"
+
+
+def _broadcast_epochs(epochs, num):
+    """Repeats a scalar epoch to get one epoch per orbit."""
+    if epochs.isscalar:
+        return epochs.reshape(1)[np.zeros(num, dtype=int)]
+
+    if epochs.shape != (num,):
+        raise ValueError(
+            f"Expected {num} epochs, got array of shape {epochs.shape}"
+        )
+
+    return epochs
+
+
+def _get_buffer(out, shape):
+    """Allocates an output buffer or checks the one given by the caller."""
+    if out is None:
+        return np.empty(shape)
+
+    if out.shape != shape or out.dtype != np.float64:
+        raise ValueError(
+            f"Output array must be float64 with shape {shape}, "
+            f"got {out.dtype} with shape {out.shape}"
+        )
+
+    return out
+
+
+class OrbitArray:
+    """Array of orbits around the same attractor and in the same plane.
+
+    The elements of all the orbits are stored as contiguous arrays,
+    so that whole catalogs can be converted and propagated
+    with a single call to the low level functions in :py:mod:`boinor.core`
+    instead of creating one :py:class:`~boinor.twobody.orbit.scalar.Orbit`
+    per object.
+
+    """
+
+    def __init__(self, state, epochs):
+        """Constructor.
+
+        Parameters
+        ----------
+        state : ~boinor.twobody.states.BaseStateArray
+            Positions and velocities or orbital elements.
+        epochs : ~astropy.time.Time
+            Epochs of the orbits, one per state.
+
+        """
+        self._state = state  # type: BaseStateArray
+        self._epochs = _broadcast_epochs(epochs, len(state))  # type: time.Time
+
+    @classmethod
+    @u.quantity_input(r=u.m, v=u.m / u.s)
+    def from_vectors(
+        cls, attractor, r, v, epochs=J2000, plane=Planes.EARTH_EQUATOR
+    ):
+        """Return `OrbitArray` from arrays of position and velocity vectors.
+
+        Parameters
+        ----------
+        attractor : Body
+            Main attractor.
+        r : ~astropy.units.Quantity
+            Position vectors wrt attractor center, shape (n, 3).
+        v : ~astropy.units.Quantity
+            Velocity vectors, shape (n, 3).
+        epochs : ~astropy.time.Time, optional
+            Epochs, either scalar or one per orbit, default to J2000.
+        plane : ~boinor.frames.Planes
+            Fundamental plane of the frame.
+
+        """
+        if r.ndim != 2 or r.shape[1] != 3 or r.shape != v.shape:
+            raise ValueError(
+                f"Vectors must have shape (n, 3), got {r.shape} and {v.shape}"
+            )
+
+        state = RVStateArray(
+            attractor, (r.to_value(u.km), v.to_value(u.km / u.s)), plane
+        )
+        return cls(state, epochs)
+
+    @classmethod
+    @u.quantity_input(
+        a=u.m, ecc=u.one, inc=u.rad, raan=u.rad, argp=u.rad, nu=u.rad
+    )
+    def from_classical(
+        cls,
+        attractor,
+        a,
+        ecc,
+        inc,
+        raan,
+        argp,
+        nu,
+        epochs=J2000,
+        plane=Planes.EARTH_EQUATOR,
+    ):
+        """Return `OrbitArray` from arrays of classical orbital elements.
+
+        Parameters
+        ----------
+        attractor : Body
+            Main attractor.
+        a : ~astropy.units.Quantity
+            Semi-major axes.
+        ecc : ~astropy.units.Quantity
+            Eccentricities.
+        inc : ~astropy.units.Quantity
+            Inclinations.
+        raan : ~astropy.units.Quantity
+            Right ascensions of the ascending node.
+        argp : ~astropy.units.Quantity
+            Arguments of the pericenter.
+        nu : ~astropy.units.Quantity
+            True anomalies.
+        epochs : ~astropy.time.Time, optional
+            Epochs, either scalar or one per orbit, default to J2000.
+        plane : ~boinor.frames.Planes
+            Fundamental plane of the frame.
+
+        """
+        a, ecc, inc, raan, argp, nu = np.broadcast_arrays(
+            a, ecc, inc, raan, argp, nu, subok=True
+        )
+        if a.ndim != 1:
+            raise ValueError(f"Elements must have dimension 1, got {a.ndim}")
+
+        if np.any(ecc == 1.0 * u.one):
+            raise ValueError(
+                "Parabolic orbits are not supported, use Orbit.parabolic instead"
+            )
+
+        if np.any((inc < 0 * u.deg) | (inc > 180 * u.deg)):
+            raise ValueError("Inclination must be between 0 and 180 degrees")
+
+        if np.any((ecc > 1) & (a > 0)):
+            raise ValueError("Hyperbolic orbits have negative semimajor axis")
+
+        # Silently wrap anomalies, to avoid warning once per orbit
+        nu = (nu + np.pi * u.rad) % (2 * np.pi * u.rad) - np.pi * u.rad
+
+        state = ClassicalStateArray(
+            attractor,
+            (
+                (a * (1 - ecc**2)).to_value(u.km),
+                ecc.to_value(u.one),
+                inc.to_value(u.rad),
+                raan.to_value(u.rad),
+                argp.to_value(u.rad),
+                nu.to_value(u.rad),
+            ),
+            plane,
+        )
+        return cls(state, epochs)
+
+    @classmethod
+    def from_orbits(cls, orbits):
+        """Return `OrbitArray` from a sequence of `Orbit` objects.
+
+        Parameters
+        ----------
+        orbits : list
+            Orbits sharing the same attractor and plane.
+
+        """
+        if not orbits:
+            raise ValueError("At least one orbit is required")
+
+        attractor = orbits[0].attractor
+        plane = orbits[0].plane
+        for orbit in orbits:
+            if orbit.attractor != attractor or orbit.plane != plane:
+                raise ValueError(
+                    "All orbits must share the same attractor and plane"
+                )
+
+        r = np.array([orbit.r.to_value(u.km) for orbit in orbits])
+        v = np.array([orbit.v.to_value(u.km / u.s) for orbit in orbits])
+        epochs = time.Time([orbit.epoch for orbit in orbits])
+
+        return cls(RVStateArray(attractor, (r, v), plane), epochs)
+
+    @property
+    def attractor(self):
+        """Main attractor."""
+        return self._state.attractor
+
+    @property
+    def epochs(self):
+        """Epochs of the orbits."""
+        return self._epochs
+
+    @property
+    def plane(self):
+        """Fundamental plane of the frame."""
+        return self._state.plane
+
+    @cached_property
+    def r(self):
+        """Position vectors."""
+        return self._state.to_vectors().r
+
+    @cached_property
+    def v(self):
+        """Velocity vectors."""
+        return self._state.to_vectors().v
+
+    @cached_property
+    def a(self):
+        """Semimajor axes."""
+        return self._state.to_classical().a
+
+    @cached_property
+    def p(self):
+        """Semilatus rectum."""
+        return self._state.to_classical().p
+
+    @cached_property
+    def ecc(self):
+        """Eccentricities."""
+        return self._state.to_classical().ecc
+
+    @cached_property
+    def inc(self):
+        """Inclinations."""
+        return self._state.to_classical().inc
+
+    @cached_property
+    def raan(self):
+        """Right ascensions of the ascending node."""
+        return self._state.to_classical().raan
+
+    @cached_property
+    def argp(self):
+        """Arguments of the perigee."""
+        return self._state.to_classical().argp
+
+    @cached_property
+    def nu(self):
+        """True anomalies."""
+        return self._state.to_classical().nu
+
+    @cached_property
+    def period(self):
+        """Periods of the orbits."""
+        return period(self.attractor.k, self.a)
+
+    @cached_property
+    def n(self):
+        """Mean motions."""
+        return mean_motion(self.attractor.k, self.a)
+
+    def __len__(self):
+        return len(self._state)
+
+    def __getitem__(self, index):
+        if np.ndim(index) == 0 and not isinstance(index, slice):
+            return Orbit(self._state[index], self.epochs[index])
+
+        return self.__class__(self._state[index], self.epochs[index])
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def __str__(self):
+        return ORBIT_ARRAY_FORMAT.format(
+            num=len(self), body=self.attractor, plane=self.plane.name
+        )
+
+    def __repr__(self):
+        return self.__str__()
+
+    def to_vectors(self):
+        """Returns an equivalent `OrbitArray` backed by position and velocity vectors."""
+        return self.__class__(self._state.to_vectors(), self.epochs)
+
+    def to_classical(self):
+        """Returns an equivalent `OrbitArray` backed by classical orbital elements."""
+        return self.__class__(self._state.to_classical(), self.epochs)
+
+    def _time_of_flight(self, value):
+        if isinstance(value, time.Time) and not isinstance(
+            value, time.TimeDelta
+        ):
+            return value - self.epochs
+
+        # Works for both Quantity and TimeDelta objects
+        return time.TimeDelta(value)
+
+    def propagate(self, value, method=FarnocchiaPropagator()):
+        """Propagates all the orbits.
+
+        Parameters
+        ----------
+        value : ~astropy.units.Quantity, ~astropy.time.Time, ~astropy.time.TimeDelta
+            Time to propagate, either scalar or one per orbit.
+            If epochs are given, each orbit is propagated to them.
+        method : optional
+            Propagator implementing ``propagate_array``,
+            default to Farnocchia's method.
+
+        Returns
+        -------
+        OrbitArray
+            New orbits after propagation.
+
+        """
+        time_of_flight = self._time_of_flight(value)
+        tofs = np.broadcast_to(
+            time_of_flight.to_value(u.s), (len(self),)
+        ).astype(np.float64)
+
+        new_state = method.propagate_array(self._state, tofs)
+        return self.__class__(new_state, self.epochs + time_of_flight)
+
+    def _grid_times(self, epochs):
+        # Both time arrays share the first epoch of the grid as origin,
+        # so that the full (n, m) array of times of flight is never built
+        epochs = epochs.reshape(-1)
+        t0 = (self.epochs - epochs[0]).to(u.s)
+        t = (epochs - epochs[0]).to(u.s)
+        return t0, t
+
+    def to_grid(self, epochs, *, out=None, method=FarnocchiaPropagator()):
+        """Propagates all the orbits to a common grid of epochs.
+
+        Parameters
+        ----------
+        epochs : ~astropy.time.Time
+            Epochs of the grid, shape (m,).
+        out : numpy.ndarray, optional
+            Preallocated float64 array of shape (n, m, 6)
+            where the result is written.
+        method : optional
+            Propagator implementing ``propagate_grid``,
+            default to Farnocchia's method.
+
+        Returns
+        -------
+        numpy.ndarray
+            Positions (km) and velocities (km / s), shape (n, m, 6).
+
+        """
+        t0, t = self._grid_times(epochs)
+        shape = (len(self), len(t), 6)
+
+        out = _get_buffer(out, shape)
+
+        return method.propagate_grid(self._state, t0, t, out)
+
+    def iter_grid(
+        self, epochs, chunk_size, *, out=None, method=FarnocchiaPropagator()
+    ):
+        """Propagates the orbits to a common grid of epochs in chunks.
+
+        Only ``chunk_size`` orbits are propagated at a time,
+        and the same buffer is reused for all the chunks
+        to bound the memory usage for large catalogs.
+
+        Parameters
+        ----------
+        epochs : ~astropy.time.Time
+            Epochs of the grid, shape (m,).
+        chunk_size : int
+            Maximum number of orbits per chunk.
+        out : numpy.ndarray, optional
+            Preallocated float64 array of shape (chunk_size, m, 6)
+            used as buffer.
+        method : optional
+            Propagator implementing ``propagate_grid``,
+            default to Farnocchia's method.
+
+        Yields
+        ------
+        start : int
+            Index of the first orbit of the chunk.
+        values : numpy.ndarray
+            View of the buffer with the positions (km) and velocities (km / s)
+            of the orbits of the chunk. It is overwritten by the next chunk.
+
+        """
+        t0, t = self._grid_times(epochs)
+        shape = (chunk_size, len(t), 6)
+
+        out = _get_buffer(out, shape)
+
+        for start in range(0, len(self), chunk_size):
+            stop = min(start + chunk_size, len(self))
+            values = method.propagate_grid(
+                self._state[start:stop],
+                t0[start:stop],
+                t,
+                out[: stop - start],
+            )
+            yield start, values
+
+    def to_ephem(self, epochs, method=FarnocchiaPropagator()):
+        """Samples all the orbits at common epochs.
+
+        Parameters
+        ----------
+        epochs : ~astropy.time.Time
+            Epochs to sample the orbits.
+        method : optional
+            Propagator implementing ``propagate_grid``,
+            default to Farnocchia's method.
+
+        Returns
+        -------
+        list
+            One :py:class:`~boinor.ephem.Ephem` per orbit.
+
+        """
+        epochs = epochs.reshape(-1)
+        values = self.to_grid(epochs, method=method)
+
+        rr = values[..., :3] << u.km
+        vv = values[..., 3:] << (u.km / u.s)
+
+        return [
+            Ephem(
+                CartesianRepresentation(
+                    rr[i],
+                    differentials=CartesianDifferential(vv[i], xyz_axis=1),
+                    xyz_axis=1,
+                ),
+                epochs,
+                self.plane,
+            )
+            for i in range(len(self))
+        ]
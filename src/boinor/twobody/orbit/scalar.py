@@ -17,8 +17,13 @@ from boinor.frames.util import get_frame
 from boinor.threebody.soi import laplace_radius
 from boinor.twobody.elements import eccentricity_vector, energy, t_p
 from boinor.twobody.orbit.creation import OrbitCreationMixin
-from boinor.twobody.propagation import FarnocchiaPropagator, PropagatorKind
+from boinor.twobody.propagation import (
+    CowellPropagator,
+    FarnocchiaPropagator,
+    PropagatorKind,
+)
 from boinor.twobody.sampling import TrueAnomalyBounds
+from boinor.twobody.trajectory import Trajectory
 from boinor.util import norm, wrap_angle
 from boinor.warnings import PatchedConicsWarning
 
@@ -534,6 +539,50 @@ class Orbit(OrbitCreationMixin):
         coordinates, epochs = strategy.sample(self)
         return Ephem(coordinates, epochs, self.plane)
 
+    def to_trajectory(self, end, *, start=None, method=CowellPropagator()):
+        """Integrates the orbit once to return a continuous trajectory.
+
+        The dense output of the integrator is kept, so that the trajectory can
+        be evaluated at any epoch between ``start`` and ``end`` without
+        integrating again, unlike repeated calls to :py:meth:`propagate`.
+
+        Parameters
+        ----------
+        end : ~astropy.time.Time, ~astropy.units.Quantity, ~astropy.time.TimeDelta
+            Latest epoch of the trajectory, or time since the epoch of the orbit.
+        start : ~astropy.time.Time, ~astropy.units.Quantity, ~astropy.time.TimeDelta, optional
+            Earliest epoch of the trajectory, or time since the epoch
+            of the orbit, default to the epoch of the orbit.
+        method : optional
+            Propagator implementing ``propagate_dense``,
+            default to Cowell's method.
+
+        Returns
+        -------
+        ~boinor.twobody.trajectory.Trajectory
+            Trajectory of the orbit.
+
+        """
+
+        def _time_of_flight(value):
+            if isinstance(value, time.Time) and not isinstance(
+                value, time.TimeDelta
+            ):
+                return (value - self.epoch).to(u.s)
+
+            # Works for both Quantity and TimeDelta objects
+            return time.TimeDelta(value).to(u.s)
+
+        tof_max = _time_of_flight(end)
+        tof_min = 0 * u.s if start is None else _time_of_flight(start)
+        if tof_min > 0 * u.s or tof_max < 0 * u.s:
+            raise ValueError(
+                "The trajectory must contain the epoch of the orbit"
+            )
+
+        dense_output = method.propagate_dense(self._state, tof_min, tof_max)
+        return Trajectory(self.attractor, self.epoch, self.plane, dense_output)
+
     def sample(self, values=100, *, min_anomaly=None, max_anomaly=None):
         r"""Samples an orbit to some specified time values.
 
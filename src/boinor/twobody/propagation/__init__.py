@@ -20,15 +20,36 @@ different propagators available at boinor:
 +-------------+------------+-----------------+-----------------+
 |    cowell   |      ✓     |        ✓        |        ✓        |
 +-------------+------------+-----------------+-----------------+
+|    encke    |      ✓     |        ✓        |        ✓        |
++-------------+------------+-----------------+-----------------+
+| equinoctial |      ✓     |        ✓        |        ✓        |
++-------------+------------+-----------------+-----------------+
+|      ks     |      ✓     |        ✓        |        ✓        |
++-------------+------------+-----------------+-----------------+
 |  recseries  |      ✓     |        x        |        x        |
 +-------------+------------+-----------------+-----------------+
+|     auto    |      ✓     |        ✓        |        ✓        |
++-------------+------------+-----------------+-----------------+
+
+Besides, :py:class:`~boinor.twobody.propagation.J2SecularPropagator` gives
+an analytical approximation of the J2 perturbed motion of elliptic orbits,
+for instance to propagate catalogs for long periods of time.
+
+:py:class:`~boinor.twobody.propagation.AutoPropagator` chooses, for every
+propagation, the cheapest of the analytical propagators which is accurate
+for the eccentricity and the number of revolutions.
 
 """
+from boinor.twobody.propagation.auto import AutoPropagator
 from boinor.twobody.propagation.cowell import CowellPropagator
 from boinor.twobody.propagation.danby import DanbyPropagator
+from boinor.twobody.propagation.encke import EnckePropagator
 from boinor.twobody.propagation.enums import PropagatorKind
+from boinor.twobody.propagation.equinoctial import EquinoctialPropagator
 from boinor.twobody.propagation.farnocchia import FarnocchiaPropagator
 from boinor.twobody.propagation.gooding import GoodingPropagator
+from boinor.twobody.propagation.j2_secular import J2SecularPropagator
+from boinor.twobody.propagation.ks import KSPropagator
 from boinor.twobody.propagation.markley import MarkleyPropagator
 from boinor.twobody.propagation.mikkola import MikkolaPropagator
 from boinor.twobody.propagation.pimienta import PimientaPropagator
@@ -38,10 +59,14 @@ from boinor.twobody.propagation.vallado import ValladoPropagator
 from ._compat import propagate
 
 ALL_PROPAGATORS = [
+    AutoPropagator,
     CowellPropagator,
     DanbyPropagator,
+    EnckePropagator,
+    EquinoctialPropagator,
     FarnocchiaPropagator,
     GoodingPropagator,
+    KSPropagator,
     MarkleyPropagator,
     MikkolaPropagator,
     PimientaPropagator,
@@ -65,4 +90,7 @@ HYPERBOLIC_PROPAGATORS = [
 ]
 
 
-__all__ = [item.__name__ for item in ALL_PROPAGATORS] + ["propagate"]
+__all__ = [item.__name__ for item in ALL_PROPAGATORS] + [
+    "J2SecularPropagator",
+    "propagate",
+]
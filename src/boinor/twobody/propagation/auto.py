@@ -0,0 +1,506 @@
+import sys
+import timeit
+
+from astropy import units as u
+import numpy as np
+
+from boinor.bodies import Earth
+from boinor.core.elements import coe2rv
+from boinor.core.propagation import cowell
+from boinor.frames import Planes
+from boinor.twobody.propagation.danby import DanbyPropagator
+from boinor.twobody.propagation.enums import PropagatorKind
+from boinor.twobody.propagation.farnocchia import FarnocchiaPropagator
+from boinor.twobody.propagation.gooding import GoodingPropagator
+from boinor.twobody.propagation.markley import MarkleyPropagator
+from boinor.twobody.propagation.mikkola import MikkolaPropagator
+from boinor.twobody.propagation.pimienta import PimientaPropagator
+from boinor.twobody.propagation.recseries import RecseriesPropagator
+from boinor.twobody.propagation.vallado import ValladoPropagator
+from boinor.twobody.states import BaseStateArray, ClassicalState
+
+from ._compat import OldPropagatorModule
+
+sys.modules[__name__].__class__ = OldPropagatorModule
+
+# Upper eccentricity of each regime
+ECC_REGIMES = {
+    "elliptic": 0.9,
+    "high_elliptic": 0.99,
+    "near_parabolic": 1.01,
+    "hyperbolic": np.inf,
+}
+# Eccentricities of the orbits used to calibrate each regime
+CALIBRATION_ECCS = {
+    "elliptic": (0.0, 0.5),
+    "high_elliptic": (0.95,),
+    "near_parabolic": (0.999, 1.0, 1.001),
+    "hyperbolic": (1.5,),
+}
+# Number of revolutions of the times of flight used to calibrate
+# the short and long propagations
+CALIBRATION_REVOLUTIONS = {"short": 0.9, "long": 10.0}
+
+# Overhead per call and cost per time of flight (µs) of the propagators
+# applicable and accurate in each regime, measured with
+# calibrate_cost_table through the high level propagate_many.
+# The overheads are dominated by the Python code around the compiled
+# kernels, so they only rank the propagators approximately
+DEFAULT_COST_TABLE = {
+    ("elliptic", "short"): {
+        "DanbyPropagator": (86, 0.96),
+        "FarnocchiaPropagator": (88, 1.02),
+        "GoodingPropagator": (169, 0.94),
+        "MarkleyPropagator": (89, 1.00),
+        "PimientaPropagator": (87, 1.13),
+        "ValladoPropagator": (86, 0.64),
+    },
+    ("elliptic", "long"): {
+        "DanbyPropagator": (85, 1.01),
+        "FarnocchiaPropagator": (86, 0.99),
+        "GoodingPropagator": (164, 0.93),
+        "MarkleyPropagator": (85, 1.00),
+        "ValladoPropagator": (85, 0.27),
+    },
+    ("high_elliptic", "short"): {
+        "DanbyPropagator": (82, 1.02),
+        "FarnocchiaPropagator": (84, 1.01),
+        "GoodingPropagator": (164, 0.96),
+        "MarkleyPropagator": (84, 0.99),
+        "PimientaPropagator": (85, 1.13),
+        "ValladoPropagator": (82, 0.57),
+    },
+    ("high_elliptic", "long"): {
+        "DanbyPropagator": (89, 0.93),
+        "FarnocchiaPropagator": (83, 1.04),
+        "GoodingPropagator": (161, 1.01),
+        "MarkleyPropagator": (85, 0.96),
+        "ValladoPropagator": (84, 0.29),
+    },
+    ("near_parabolic", "short"): {
+        "FarnocchiaPropagator": (87, 1.20),
+        "GoodingPropagator": (168, 0.91),
+        "MarkleyPropagator": (84, 0.98),
+        "PimientaPropagator": (83, 1.14),
+    },
+    ("near_parabolic", "long"): {},
+    ("hyperbolic", "short"): {
+        "FarnocchiaPropagator": (84, 1.14),
+        "ValladoPropagator": (87, 1.14),
+    },
+    ("hyperbolic", "long"): {
+        "FarnocchiaPropagator": (86, 1.12),
+        "ValladoPropagator": (87, 0.38),
+    },
+}
+
+
+def _propagator_names(propagators):
+    return {
+        type(propagator).__name__: propagator for propagator in propagators
+    }
+
+
+def _ecc_regimes(ecc):
+    return np.array(list(ECC_REGIMES))[
+        np.searchsorted(list(ECC_REGIMES.values()), ecc, side="right")
+    ]
+
+
+def _revolutions(k, r, v, tofs):
+    # Mean motion from the energy, zero for parabolic orbits,
+    # so that it also works for hyperbolic orbits
+    energy = (v * v).sum(axis=-1) / 2 - k / np.linalg.norm(r, axis=-1)
+    n = np.sqrt(np.abs(2 * energy) ** 3) / k
+    return np.abs(tofs) * n / (2 * np.pi)
+
+
+def _kind(ecc):
+    if ecc < 1:
+        return PropagatorKind.ELLIPTIC
+    elif ecc == 1:
+        return PropagatorKind.PARABOLIC
+    else:
+        return PropagatorKind.HYPERBOLIC
+
+
+def _is_finite(result):
+    if isinstance(result, tuple):
+        return all(np.all(np.isfinite(value)) for value in result)
+    elif isinstance(result, np.ndarray):
+        return np.all(np.isfinite(result))
+    else:
+        return all(np.all(np.isfinite(value)) for value in result.to_value())
+
+
+def _reference(k, r0, v0, tofs, period):
+    if np.isfinite(period):
+        # Elliptic orbits repeat every period, so the integration
+        # is kept within the first one to avoid accumulating errors
+        tofs = tofs % period
+
+    rr = np.empty((len(tofs), 3))
+    vv = np.empty((len(tofs), 3))
+
+    # Integrates forward and backward separately,
+    # since cowell only integrates from zero to the largest time
+    for sign in (1, -1):
+        mask = sign * tofs >= 0
+        if mask.any():
+            rr[mask], vv[mask] = cowell(
+                k, r0, sign * v0, sign * tofs[mask], rtol=1e-13
+            )
+            vv[mask] *= sign
+
+    return rr, vv
+
+
+def calibrate_cost_table(
+    propagators=None, attractor=None, num_tofs=100, repeat=5, rtol=1e-8
+):
+    """Measures the cost of the propagators in each regime on this host.
+
+    For each regime of eccentricity and number of revolutions, the
+    propagators are run on sample orbits against a tight numerical
+    integration. Those which fail or are less accurate than ``rtol``
+    are left out of the regime, and the rest are timed with a single
+    time of flight and with ``num_tofs`` of them, to estimate their
+    overhead per call and their cost per time of flight.
+
+    Parameters
+    ----------
+    propagators : list, optional
+        Propagators to calibrate, default to the analytical
+        two-body propagators.
+    attractor : ~boinor.bodies.Body, optional
+        Attractor of the sample orbits, default to the Earth.
+    num_tofs : int, optional
+        Number of times of flight of the batch propagations, default to 100.
+    repeat : int, optional
+        Number of repetitions of each timing, of which the fastest
+        is kept, default to 5.
+    rtol : float, optional
+        Relative tolerance of the positions and velocities, default to 1e-8.
+
+    Returns
+    -------
+    dict
+        Cost table, mapping ``(ecc_regime, revolutions_regime)`` tuples
+        to dictionaries of propagator names and
+        ``(overhead, cost_per_tof)`` tuples in microseconds,
+        which can be given to :py:class:`AutoPropagator`.
+
+    """
+    if propagators is None:
+        propagators = AutoPropagator.default_propagators()
+    if attractor is None:
+        attractor = Earth
+
+    k = attractor.k.to_value(u.km**3 / u.s**2)
+    r_p = 1.2 * attractor.R.to_value(u.km)
+
+    table = {}
+    for ecc_regime, eccs in CALIBRATION_ECCS.items():
+        for rev_regime, revolutions in CALIBRATION_REVOLUTIONS.items():
+            costs = {}
+            for ecc in eccs:
+                p = r_p * (1 + ecc)
+                r0, v0 = coe2rv(k, p, ecc, 1.0, 0.5, 0.5, 0.0)
+                if ecc == 1:
+                    if rev_regime == "long":
+                        continue
+                    # Parabolic orbits have no mean motion,
+                    # so the time of flight of the sample is arbitrary
+                    tof_max = 10 * np.sqrt(r_p**3 / k)
+                else:
+                    n = np.sqrt(k / np.abs(p / (1 - ecc**2)) ** 3)
+                    tof_max = revolutions * 2 * np.pi / n
+                period = 2 * np.pi / n if ecc < 1 else np.inf
+                tofs = np.linspace(-tof_max, tof_max, num_tofs)
+                rr_ref, vv_ref = _reference(k, r0, v0, tofs, period)
+
+                state = ClassicalState(
+                    attractor,
+                    (
+                        p * u.km,
+                        ecc * u.one,
+                        1.0 * u.rad,
+                        0.5 * u.rad,
+                        0.5 * u.rad,
+                        0.0 * u.rad,
+                    ),
+                    Planes.EARTH_EQUATOR,
+                )
+                for name, propagator in _propagator_names(propagators).items():
+                    if not propagator.kind & _kind(ecc):
+                        continue
+                    if costs.get(name, ()) is None:
+                        continue
+
+                    try:
+                        rr, vv = propagator.propagate_many(state, tofs << u.s)
+                        rr = rr.to_value(u.km)
+                        vv = vv.to_value(u.km / u.s)
+                    except Exception:  # pylint: disable=broad-except
+                        costs[name] = None
+                        continue
+
+                    accurate = np.allclose(
+                        rr, rr_ref, rtol=rtol, atol=rtol * r_p
+                    ) and np.allclose(
+                        vv,
+                        vv_ref,
+                        rtol=rtol,
+                        atol=rtol * np.sqrt(k / r_p),
+                    )
+                    if not accurate:
+                        costs[name] = None
+                        continue
+
+                    single = min(
+                        timeit.repeat(
+                            lambda: propagator.propagate_many(
+                                state, tofs[-1:] << u.s
+                            ),
+                            number=1,
+                            repeat=repeat,
+                        )
+                    )
+                    batch = min(
+                        timeit.repeat(
+                            lambda: propagator.propagate_many(
+                                state, tofs << u.s
+                            ),
+                            number=1,
+                            repeat=repeat,
+                        )
+                    )
+                    per_tof = max(batch - single, 0) / (num_tofs - 1)
+                    overhead = max(single - per_tof, 0)
+
+                    # The slowest sample of the regime is kept
+                    previous = costs.get(name, (0, 0))
+                    costs[name] = (
+                        max(previous[0], overhead * 1e6),
+                        max(previous[1], per_tof * 1e6),
+                    )
+
+            table[(ecc_regime, rev_regime)] = {
+                name: cost for name, cost in costs.items() if cost is not None
+            }
+
+    return table
+
+
+class AutoPropagator:
+    """Propagates orbit with the cheapest applicable analytical method.
+
+    The cost of every propagation is estimated from the regime of
+    eccentricity of the orbits, the number of revolutions of the
+    times of flight and the number of times of flight, with the
+    overhead per call and the cost per time of flight of each
+    propagator in a cost table. The propagators missing from the
+    cost table of a regime, because they are not applicable or not
+    accurate enough there, are not used for it.
+
+    Parameters
+    ----------
+    propagators : list, optional
+        Candidate propagators, default to the analytical two-body propagators.
+    cost_table : dict, optional
+        Cost table, see :py:func:`calibrate_cost_table`,
+        which regenerates it on the current host.
+        Default to the one measured when calibrating boinor.
+    fallback : object, optional
+        Propagator used if the chosen one fails to converge or
+        no candidate is applicable, default to
+        :py:class:`~boinor.twobody.propagation.FarnocchiaPropagator`.
+
+    Notes
+    -----
+    The times of flight of the regimes are split between those shorter
+    than a revolution and the longer ones, with the revolutions given by
+    the mean motion of the energy of the orbit, which extends them
+    to hyperbolic orbits.
+
+    The default cost table is only approximate: it was measured through
+    ``propagate_many``, whose overhead of about 85 µs per call is mostly
+    Python code shared by all the propagators, so the costs of their
+    kernels differ less than the table and the choice may not be the
+    cheapest on other hosts. Regenerate it with
+    :py:func:`calibrate_cost_table` when the choice matters.
+
+    """
+
+    kind = (
+        PropagatorKind.ELLIPTIC
+        | PropagatorKind.PARABOLIC
+        | PropagatorKind.HYPERBOLIC
+    )
+
+    def __init__(self, propagators=None, cost_table=None, fallback=None):
+        if propagators is None:
+            propagators = self.default_propagators()
+        if cost_table is None:
+            cost_table = DEFAULT_COST_TABLE
+        if fallback is None:
+            fallback = FarnocchiaPropagator()
+
+        self._propagators = _propagator_names(propagators)
+        self._cost_table = cost_table
+        self._fallback = fallback
+
+    @staticmethod
+    def default_propagators():
+        """Analytical two-body propagators considered by default."""
+        return [
+            DanbyPropagator(),
+            FarnocchiaPropagator(),
+            GoodingPropagator(),
+            MarkleyPropagator(),
+            MikkolaPropagator(),
+            PimientaPropagator(),
+            RecseriesPropagator(),
+            ValladoPropagator(),
+        ]
+
+    def _regimes(self, state, tofs):
+        if isinstance(state, BaseStateArray):
+            vectors = state.to_vectors()
+            r, v = vectors.to_value()
+            k = vectors._k
+            ecc = state.to_classical().ecc.value
+            if tofs.ndim > 1:
+                # Grids are costed with their longest propagation
+                tofs = np.abs(tofs).max(axis=1)
+        else:
+            r, v = state.to_vectors().to_value()
+            k = state.attractor.k.to_value(u.km**3 / u.s**2)
+            ecc = np.full(tofs.shape, state.to_classical().ecc.value)
+
+        revolutions = np.where(
+            _revolutions(k, r, v, tofs) < 1, "short", "long"
+        )
+        regimes, counts = np.unique(
+            np.stack([_ecc_regimes(ecc), revolutions]),
+            axis=1,
+            return_counts=True,
+        )
+        kind = PropagatorKind(0)
+        for value in np.unique(ecc):
+            kind |= _kind(value)
+
+        return dict(zip(map(tuple, regimes.T), counts)), kind
+
+    def select(self, state, tofs, method="propagate_many"):
+        """Returns the cheapest applicable propagator.
+
+        Parameters
+        ----------
+        state : ~boinor.twobody.states.BaseState, ~boinor.twobody.states.BaseStateArray
+            Initial state, or states.
+        tofs : numpy.ndarray
+            Times of flight (s), shape (n,) for a single state and
+            (n,) or (n, m) for an array of them.
+        method : str, optional
+            Method of the propagator which will be called,
+            default to ``"propagate_many"``.
+
+        """
+        counts, kind = self._regimes(state, np.asarray(tofs, dtype=float))
+
+        best, best_cost = None, np.inf
+        for name, propagator in self._propagators.items():
+            if (propagator.kind & kind) != kind or not hasattr(
+                propagator, method
+            ):
+                continue
+
+            costs = [
+                self._cost_table.get(regime, {}).get(name) for regime in counts
+            ]
+            if None in costs:
+                continue
+
+            # A single call pays the largest overhead once
+            cost = max(overhead for overhead, _ in costs) + sum(
+                count * per_tof
+                for count, (_, per_tof) in zip(counts.values(), costs)
+            )
+            if cost < best_cost:
+                best, best_cost = propagator, cost
+
+        if best is None:
+            return self._fallback
+
+        return best
+
+    def _call(self, method, state, tofs, *args):
+        propagator = self.select(state, tofs, method)
+        if propagator is not self._fallback:
+            try:
+                result = getattr(propagator, method)(*args)
+            # Compiled solvers may report their RuntimeError
+            # as a SystemError when they fail to converge
+            except (
+                ArithmeticError,
+                AssertionError,
+                NotImplementedError,
+                RuntimeError,
+                SystemError,
+                ValueError,
+            ):
+                pass
+            else:
+                if _is_finite(result):
+                    return result
+
+        return getattr(self._fallback, method)(*args)
+
+    def propagate(self, state, tof):
+        return self._call(
+            "propagate", state, tof.to_value(u.s).reshape(-1), state, tof
+        )
+
+    def propagate_many(self, state, tofs):
+        return self._call(
+            "propagate_many", state, tofs.to_value(u.s), state, tofs
+        )
+
+    def propagate_array(self, state, tofs):
+        """Propagates an array of states, each one by its own time of flight.
+
+        Parameters
+        ----------
+        state : ~boinor.twobody.states.BaseStateArray
+            Initial states.
+        tofs : numpy.ndarray
+            Times of flight (s), shape (n,).
+
+        """
+        return self._call("propagate_array", state, tofs, state, tofs)
+
+    def propagate_grid(self, state, t0, t, out):
+        """Propagates an array of states to a common grid of times.
+
+        Parameters
+        ----------
+        state : ~boinor.twobody.states.BaseStateArray
+            Initial states.
+        t0 : ~astropy.units.Quantity
+            Times of the initial states, shape (n,).
+        t : ~astropy.units.Quantity
+            Times of the grid, shape (m,), with the same origin as ``t0``.
+        out : numpy.ndarray
+            Preallocated array of shape (n, m, 6) where the positions (km)
+            and velocities (km / s) are written.
+
+        """
+        # Grids are costed with their longest propagation, which avoids
+        # building the times of flight of the whole grid
+        t0_value = t0.to_value(u.s)
+        tofs = np.maximum(
+            np.abs(t.max().to_value(u.s) - t0_value),
+            np.abs(t.min().to_value(u.s) - t0_value),
+        )
+        return self._call("propagate_grid", state, tofs, state, t0, t, out)
@@ -1,9 +1,14 @@
 import sys
 
 from astropy import units as u
+from numba.extending import is_jitted
+import numpy as np
 
-from boinor.core.propagation import cowell
+from boinor.core.events import CompiledEvents
+from boinor.core.force_model import ForceModel
+from boinor.core.propagation import cowell, cowell_dense, cowell_grid
 from boinor.core.propagation.base import func_twobody
+from boinor.twobody.events import compile_events
 from boinor.twobody.propagation.enums import PropagatorKind
 from boinor.twobody.states import RVState
 
@@ -21,6 +26,17 @@ class CowellPropagator:
     If multiple tofs are provided, the method propagates to the maximum value
     (unless a terminal event is defined) and calculates the other values via dense output.
 
+    With ``engine="numba"`` the same method runs in compiled code, which avoids
+    the Python overhead of every step. It requires ``f`` to be a jitted function.
+    The events are compiled too, see :py:func:`~boinor.twobody.events.compile_events`,
+    and located inside the integration loop, so that tracking them is almost free.
+
+    ``f`` can also be a :py:class:`~boinor.core.force_model.ForceModel`,
+    whose compiled right-hand side is used by both engines.
+
+    Arrays of states are always propagated with the compiled integrator,
+    one orbit per thread, see :py:meth:`propagate_batch`.
+
     """
 
     kind = (
@@ -29,23 +45,40 @@ class CowellPropagator:
         | PropagatorKind.HYPERBOLIC
     )
 
-    def __init__(self, rtol=1e-11, events=None, f=func_twobody):
+    def __init__(
+        self, rtol=1e-11, events=None, f=func_twobody, engine="scipy"
+    ):
         self._rtol = rtol
         self._events = events
-        self._f = f
+        self._f = f.f if isinstance(f, ForceModel) else f
+        self._engine = engine
 
-    def propagate(self, state, tof):
-        state = state.to_vectors()
-        tofs = tof.reshape(-1)
+    def _cowell(self, state, tofs):
+        tofs = tofs.to_value(u.s)
+        events = self._events
+        if self._engine == "numba" and events is not None:
+            events = compile_events(events, 0.0, np.max(tofs))
 
         rrs, vvs = cowell(
             state.attractor.k.to_value(u.km**3 / u.s**2),
             *state.to_value(),
-            tofs.to_value(u.s),
+            tofs,
             self._rtol,
-            events=self._events,
+            events=events,
             f=self._f,
+            engine=self._engine,
         )
+
+        if isinstance(events, CompiledEvents):
+            for event in self._events:
+                event._last_t = events.last_t
+
+        return rrs, vvs
+
+    def propagate(self, state, tof):
+        state = state.to_vectors()
+
+        rrs, vvs = self._cowell(state, tof.reshape(-1))
         r = rrs[-1] << u.km
         v = vvs[-1] << (u.km / u.s)
 
@@ -55,14 +88,7 @@ class CowellPropagator:
     def propagate_many(self, state, tofs):
         state = state.to_vectors()
 
-        rrs, vvs = cowell(
-            state.attractor.k.to_value(u.km**3 / u.s**2),
-            *state.to_value(),
-            tofs.to_value(u.s),
-            self._rtol,
-            events=self._events,
-            f=self._f,
-        )
+        rrs, vvs = self._cowell(state, tofs)
 
         # TODO: This should probably return a RVStateArray instead,
         # see discussion at https://github.com/boinor/boinor/pull/1492
@@ -70,3 +96,97 @@ class CowellPropagator:
             rrs << u.km,
             vvs << (u.km / u.s),
         )
+
+    def propagate_dense(self, state, tof_min, tof_max):
+        """Integrates a state keeping the dense output of the integrator.
+
+        Parameters
+        ----------
+        state : ~boinor.twobody.states.BaseState
+            Initial state.
+        tof_min : ~astropy.units.Quantity
+            Earliest time of flight, not positive.
+        tof_max : ~astropy.units.Quantity
+            Latest time of flight, not negative.
+
+        Returns
+        -------
+        ~boinor.core.propagation.cowell.CowellDenseOutput
+            Interpolant of the orbit, in km, km / s and s.
+
+        """
+        if self._events is not None:
+            raise ValueError("Events are not supported by the dense output")
+
+        state = state.to_vectors()
+
+        return cowell_dense(
+            state.attractor.k.to_value(u.km**3 / u.s**2),
+            *state.to_value(),
+            tof_min.to_value(u.s),
+            tof_max.to_value(u.s),
+            self._rtol,
+            f=self._f,
+        )
+
+    def propagate_grid(self, state, t0, t, out):
+        """Propagates an array of states to a common grid of times.
+
+        Parameters
+        ----------
+        state : ~boinor.twobody.states.BaseStateArray
+            Initial states.
+        t0 : ~astropy.units.Quantity
+            Times of the initial states, shape (n,).
+        t : ~astropy.units.Quantity
+            Times of the grid, shape (m,), with the same origin as ``t0``.
+        out : numpy.ndarray
+            Preallocated array of shape (n, m, 6) where the positions (km)
+            and velocities (km / s) are written.
+
+        """
+        if self._events is not None:
+            raise ValueError("Events are not supported for arrays of states")
+        if not is_jitted(self._f):
+            raise ValueError("Arrays of states require a jitted function f")
+
+        state = state.to_vectors()
+
+        out, success = cowell_grid(
+            state.attractor.k.to_value(u.km**3 / u.s**2),
+            *state.to_value(),
+            t0.to_value(u.s),
+            t.to_value(u.s),
+            out,
+            self._rtol,
+            self._f,
+        )
+        if not success.all():
+            raise RuntimeError(
+                f"Integration failed for orbits {np.flatnonzero(~success)}"
+            )
+
+        return out
+
+    def propagate_batch(self, state, tofs):
+        """Propagates an array of states to the same times of flight.
+
+        Parameters
+        ----------
+        state : ~boinor.twobody.states.BaseStateArray
+            Initial states, shape (n,).
+        tofs : ~astropy.units.Quantity
+            Times of flight, shape (m,).
+
+        Returns
+        -------
+        rrs : ~astropy.units.Quantity
+            Propagated position vectors, shape (n, m, 3).
+        vvs : ~astropy.units.Quantity
+            Propagated velocity vectors, shape (n, m, 3).
+
+        """
+        out = np.empty((len(state), len(tofs), 6))
+        self.propagate_grid(state, np.zeros(len(state)) << u.s, tofs, out)
+
+        return out[..., :3] << u.km, out[..., 3:] << (u.km / u.s)
@@ -0,0 +1,109 @@
+import sys
+
+from astropy import units as u
+from numba.extending import is_jitted
+import numpy as np
+
+from boinor.core.force_model import ForceModel
+from boinor.core.propagation import encke, encke_grid
+from boinor.core.propagation.base import func_twobody
+from boinor.twobody.propagation.enums import PropagatorKind
+from boinor.twobody.states import RVState
+
+from ._compat import OldPropagatorModule
+
+sys.modules[__name__].__class__ = OldPropagatorModule
+
+
+class EnckePropagator:
+    """Propagates orbit using Encke's method.
+
+    Notes
+    -----
+    Only the deviation from a reference conic, propagated analytically,
+    is integrated with the compiled Dormand & Prince integrator of order 8(5,3).
+    The reference is rectified when the deviation grows too large.
+
+    For weakly perturbed orbits, like the ones perturbed only by drag or by
+    a third body, this needs fewer evaluations of ``f`` than
+    :py:class:`~boinor.twobody.propagation.CowellPropagator` for the same
+    accuracy. For perturbations as large as the J2 of a low orbit the
+    deviation grows too fast and Cowell's method is usually cheaper.
+
+    ``f`` must be a jitted function or a
+    :py:class:`~boinor.core.force_model.ForceModel`.
+
+    """
+
+    kind = (
+        PropagatorKind.ELLIPTIC
+        | PropagatorKind.PARABOLIC
+        | PropagatorKind.HYPERBOLIC
+    )
+
+    def __init__(self, rtol=1e-11, f=func_twobody, rectify_tol=1e-3):
+        f = f.f if isinstance(f, ForceModel) else f
+        if not is_jitted(f):
+            raise ValueError("Encke's method requires a jitted function f")
+
+        self._rtol = rtol
+        self._f = f
+        self._rectify_tol = rectify_tol
+
+    def propagate(self, state, tof):
+        rrs, vvs = self.propagate_many(state, tof.reshape(-1))
+
+        new_state = RVState(state.attractor, (rrs[-1], vvs[-1]), state.plane)
+        return new_state
+
+    def propagate_many(self, state, tofs):
+        state = state.to_vectors()
+
+        rrs, vvs = encke(
+            state.attractor.k.to_value(u.km**3 / u.s**2),
+            *state.to_value(),
+            tofs.to_value(u.s),
+            self._rtol,
+            self._f,
+            self._rectify_tol,
+        )
+
+        return (
+            rrs << u.km,
+            vvs << (u.km / u.s),
+        )
+
+    def propagate_grid(self, state, t0, t, out):
+        """Propagates an array of states to a common grid of times.
+
+        Parameters
+        ----------
+        state : ~boinor.twobody.states.BaseStateArray
+            Initial states.
+        t0 : ~astropy.units.Quantity
+            Times of the initial states, shape (n,).
+        t : ~astropy.units.Quantity
+            Times of the grid, shape (m,), with the same origin as ``t0``.
+        out : numpy.ndarray
+            Preallocated array of shape (n, m, 6) where the positions (km)
+            and velocities (km / s) are written.
+
+        """
+        state = state.to_vectors()
+
+        out, success = encke_grid(
+            state.attractor.k.to_value(u.km**3 / u.s**2),
+            *state.to_value(),
+            t0.to_value(u.s),
+            t.to_value(u.s),
+            out,
+            self._rtol,
+            self._f,
+            self._rectify_tol,
+        )
+        if not success.all():
+            raise RuntimeError(
+                f"Integration failed for orbits {np.flatnonzero(~success)}"
+            )
+
+        return out
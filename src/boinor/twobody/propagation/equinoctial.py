@@ -0,0 +1,73 @@
+import sys
+
+from astropy import units as u
+from numba.extending import is_jitted
+
+from boinor.core.force_model import ForceModel
+from boinor.core.propagation import equinoctial
+from boinor.core.propagation.base import func_twobody
+from boinor.twobody.propagation.enums import PropagatorKind
+from boinor.twobody.states import RVState
+
+from ._compat import OldPropagatorModule
+
+sys.modules[__name__].__class__ = OldPropagatorModule
+
+
+class EquinoctialPropagator:
+    """Propagates orbit integrating the Gauss variational equations
+    in modified equinoctial elements.
+
+    Notes
+    -----
+    The perturbing acceleration is projected into the RSW frame and the
+    modified equinoctial elements are integrated with the compiled Dormand &
+    Prince integrator of order 8(5,3). Five of the six elements vary slowly,
+    so for low-thrust spirals, like the ones of the guidance laws of
+    :py:mod:`boinor.twobody.thrust`, and other long arcs with small
+    perturbations it takes several times fewer steps than
+    :py:class:`~boinor.twobody.propagation.CowellPropagator`.
+
+    ``f`` is the same right-hand side used by Cowell's method, either a jitted
+    function or a :py:class:`~boinor.core.force_model.ForceModel`.
+    Retrograde equatorial orbits are not supported.
+
+    """
+
+    kind = (
+        PropagatorKind.ELLIPTIC
+        | PropagatorKind.PARABOLIC
+        | PropagatorKind.HYPERBOLIC
+    )
+
+    def __init__(self, rtol=1e-11, f=func_twobody):
+        f = f.f if isinstance(f, ForceModel) else f
+        if not is_jitted(f):
+            raise ValueError(
+                "The equinoctial propagator requires a jitted function f"
+            )
+
+        self._rtol = rtol
+        self._f = f
+
+    def propagate(self, state, tof):
+        rrs, vvs = self.propagate_many(state, tof.reshape(-1))
+
+        new_state = RVState(state.attractor, (rrs[-1], vvs[-1]), state.plane)
+        return new_state
+
+    def propagate_many(self, state, tofs):
+        state = state.to_vectors()
+
+        rrs, vvs = equinoctial(
+            state.attractor.k.to_value(u.km**3 / u.s**2),
+            *state.to_value(),
+            tofs.to_value(u.s),
+            self._rtol,
+            self._f,
+        )
+
+        return (
+            rrs << u.km,
+            vvs << (u.km / u.s),
+        )
@@ -5,10 +5,12 @@ import numpy as np
 
 from boinor.core.propagation.farnocchia import (
     farnocchia_coe as farnocchia_coe_fast,
-    farnocchia_rv as farnocchia_rv_fast,
+    farnocchia_coe_many as farnocchia_coe_many_fast,
+    farnocchia_rv_grid as farnocchia_rv_grid_fast,
+    farnocchia_rv_many as farnocchia_rv_many_fast,
 )
 from boinor.twobody.propagation.enums import PropagatorKind
-from boinor.twobody.states import ClassicalState
+from boinor.twobody.states import ClassicalState, ClassicalStateArray
 
 from ._compat import OldPropagatorModule
 
@@ -51,15 +53,69 @@ class FarnocchiaPropagator:
 
     def propagate_many(self, state, tofs):
         state = state.to_vectors()
-        k = state.attractor.k.to_value(u.km**3 / u.s**2)
-        rv0 = state.to_value()
+        tofs = tofs.to_value(u.s)
 
         # TODO: This should probably return a ClassicalStateArray instead,
         # see discussion at https://github.com/boinor/boinor/pull/1492
-        results = np.array(
-            [farnocchia_rv_fast(k, *rv0, tof) for tof in tofs.to_value(u.s)]
+        rrs, vvs = farnocchia_rv_many_fast(
+            state.attractor.k.to_value(u.km**3 / u.s**2),
+            *state.to_value(),
+            tofs,
+            np.empty((len(tofs), 3)),
+            np.empty((len(tofs), 3)),
         )
         return (
-            results[:, 0] << u.km,
-            results[:, 1] << (u.km / u.s),
+            rrs << u.km,
+            vvs << (u.km / u.s),
+        )
+
+    def propagate_array(self, state, tofs):
+        """Propagates an array of states, each one by its own time of flight.
+
+        Parameters
+        ----------
+        state : ~boinor.twobody.states.BaseStateArray
+            Initial states.
+        tofs : numpy.ndarray
+            Times of flight (s), shape (n,).
+
+        Returns
+        -------
+        ~boinor.twobody.states.ClassicalStateArray
+            Propagated states.
+
+        """
+        state = state.to_classical()
+        elements = state.to_value()
+
+        nu = farnocchia_coe_many_fast(state._k, *elements, tofs)
+
+        return ClassicalStateArray(
+            state.attractor, elements[:5] + (nu,), state.plane
+        )
+
+    def propagate_grid(self, state, t0, t, out):
+        """Propagates an array of states to a common grid of times.
+
+        Parameters
+        ----------
+        state : ~boinor.twobody.states.BaseStateArray
+            Initial states.
+        t0 : ~astropy.units.Quantity
+            Times of the initial states, shape (n,).
+        t : ~astropy.units.Quantity
+            Times of the grid, shape (m,), with the same origin as ``t0``.
+        out : numpy.ndarray
+            Preallocated array of shape (n, m, 6) where the positions (km)
+            and velocities (km / s) are written.
+
+        """
+        state = state.to_vectors()
+
+        return farnocchia_rv_grid_fast(
+            state.attractor.k.to_value(u.km**3 / u.s**2),
+            *state.to_value(),
+            t0.to_value(u.s),
+            t.to_value(u.s),
+            out,
         )
@@ -0,0 +1,169 @@
+import sys
+
+from astropy import units as u
+import numpy as np
+
+from boinor.core.propagation.j2_secular import (
+    j2_secular_coe,
+    j2_secular_coe_many,
+    j2_secular_rv_grid,
+    j2_secular_rv_many,
+)
+from boinor.twobody.propagation.enums import PropagatorKind
+from boinor.twobody.states import (
+    ClassicalState,
+    ClassicalStateArray,
+    RVStateArray,
+)
+
+from ._compat import OldPropagatorModule
+
+sys.modules[__name__].__class__ = OldPropagatorModule
+
+
+def _check_elliptic(state):
+    if isinstance(state, RVStateArray):
+        # Cheaper than computing the eccentricities of the whole array
+        r, v = state.to_value()
+        closed = (v * v).sum(axis=1) / 2 < state._k / np.linalg.norm(r, axis=1)
+    else:
+        closed = state.to_classical().ecc.value < 1
+
+    if not np.all(closed):
+        raise ValueError(
+            "The J2 secular propagator only supports elliptic orbits"
+        )
+
+
+class J2SecularPropagator:
+    r"""Propagates orbit applying the secular J2 rates to the orbital elements.
+
+    Parameters
+    ----------
+    J2 : ~astropy.units.Quantity, optional
+        Oblateness factor, default to the one of the attractor.
+    R : ~astropy.units.Quantity, optional
+        Attractor radius, default to the one of the attractor.
+
+    Notes
+    -----
+    The right ascension of the ascending node, the argument of the perigee
+    and the mean anomaly drift with the first order secular rates
+    of the J2 perturbation, while the rest of the elements are constant,
+    see :cite:t:`Vallado2013`. The initial elements are taken as mean
+    elements, so the short periodic terms, of the order of :math:`J_{2}`,
+    are neglected, but the nodal and apsidal precession are kept.
+    Since the mean motion depends on the semimajor axis, the along-track
+    error grows linearly with time unless mean elements are given.
+
+    Every propagation is analytical, so whole catalogs can be propagated
+    months ahead much faster than with
+    :py:class:`~boinor.twobody.propagation.CowellPropagator`,
+    for instance with :py:meth:`~boinor.twobody.orbit.array.OrbitArray.propagate`
+    and :py:meth:`~boinor.twobody.orbit.array.OrbitArray.to_grid`.
+
+    """
+
+    kind = PropagatorKind.ELLIPTIC
+
+    @u.quantity_input(J2=u.one, R=u.km)
+    def __init__(self, J2=None, R=None):
+        self._J2 = J2
+        self._R = R
+
+    def _params(self, attractor):
+        J2 = attractor.J2 if self._J2 is None else self._J2
+        R = attractor.R if self._R is None else self._R
+        return J2.to_value(u.one), R.to_value(u.km)
+
+    def propagate(self, state, tof):
+        _check_elliptic(state)
+        state = state.to_classical()
+
+        raan, argp, nu = j2_secular_coe(
+            state.attractor.k.to_value(u.km**3 / u.s**2),
+            *state.to_value(),
+            tof.to_value(u.s),
+            *self._params(state.attractor),
+        )
+
+        new_state = ClassicalState(
+            state.attractor,
+            state.to_tuple()[:3] + (raan << u.rad, argp << u.rad, nu << u.rad),
+            state.plane,
+        )
+        return new_state
+
+    def propagate_many(self, state, tofs):
+        _check_elliptic(state)
+        state = state.to_vectors()
+        tofs = tofs.to_value(u.s)
+
+        rrs, vvs = j2_secular_rv_many(
+            state.attractor.k.to_value(u.km**3 / u.s**2),
+            *state.to_value(),
+            tofs,
+            *self._params(state.attractor),
+            np.empty((len(tofs), 3)),
+            np.empty((len(tofs), 3)),
+        )
+        return (
+            rrs << u.km,
+            vvs << (u.km / u.s),
+        )
+
+    def propagate_array(self, state, tofs):
+        """Propagates an array of states, each one by its own time of flight.
+
+        Parameters
+        ----------
+        state : ~boinor.twobody.states.BaseStateArray
+            Initial states.
+        tofs : numpy.ndarray
+            Times of flight (s), shape (n,).
+
+        Returns
+        -------
+        ~boinor.twobody.states.ClassicalStateArray
+            Propagated states.
+
+        """
+        _check_elliptic(state)
+        state = state.to_classical()
+        elements = state.to_value()
+
+        raan, argp, nu = j2_secular_coe_many(
+            state._k, *elements, tofs, *self._params(state.attractor)
+        )
+
+        return ClassicalStateArray(
+            state.attractor, elements[:3] + (raan, argp, nu), state.plane
+        )
+
+    def propagate_grid(self, state, t0, t, out):
+        """Propagates an array of states to a common grid of times.
+
+        Parameters
+        ----------
+        state : ~boinor.twobody.states.BaseStateArray
+            Initial states.
+        t0 : ~astropy.units.Quantity
+            Times of the initial states, shape (n,).
+        t : ~astropy.units.Quantity
+            Times of the grid, shape (m,), with the same origin as ``t0``.
+        out : numpy.ndarray
+            Preallocated array of shape (n, m, 6) where the positions (km)
+            and velocities (km / s) are written.
+
+        """
+        _check_elliptic(state)
+        state = state.to_vectors()
+
+        return j2_secular_rv_grid(
+            state.attractor.k.to_value(u.km**3 / u.s**2),
+            *state.to_value(),
+            t0.to_value(u.s),
+            t.to_value(u.s),
+            out,
+            *self._params(state.attractor),
+        )
@@ -0,0 +1,69 @@
+import sys
+
+from astropy import units as u
+from numba.extending import is_jitted
+
+from boinor.core.force_model import ForceModel
+from boinor.core.propagation import ks
+from boinor.core.propagation.base import func_twobody
+from boinor.twobody.propagation.enums import PropagatorKind
+from boinor.twobody.states import RVState
+
+from ._compat import OldPropagatorModule
+
+sys.modules[__name__].__class__ = OldPropagatorModule
+
+
+class KSPropagator:
+    """Propagates orbit in Kustaanheimo-Stiefel regularized coordinates.
+
+    Notes
+    -----
+    The equations of motion are regularized with the Kustaanheimo-Stiefel
+    transformation and the Sundman time transformation ``dt = r ds``, and
+    integrated with the compiled Dormand & Prince integrator of order 8(5,3).
+    The steps are then proportional to the radius, so highly eccentric
+    orbits like Molniya, GTO or HEO ones need several times fewer steps than
+    with :py:class:`~boinor.twobody.propagation.CowellPropagator`,
+    which is forced into tiny steps near perigee, for a better accuracy.
+
+    ``f`` is the same right-hand side used by Cowell's method, either a jitted
+    function or a :py:class:`~boinor.core.force_model.ForceModel`.
+
+    """
+
+    kind = (
+        PropagatorKind.ELLIPTIC
+        | PropagatorKind.PARABOLIC
+        | PropagatorKind.HYPERBOLIC
+    )
+
+    def __init__(self, rtol=1e-11, f=func_twobody):
+        f = f.f if isinstance(f, ForceModel) else f
+        if not is_jitted(f):
+            raise ValueError("The KS propagator requires a jitted function f")
+
+        self._rtol = rtol
+        self._f = f
+
+    def propagate(self, state, tof):
+        rrs, vvs = self.propagate_many(state, tof.reshape(-1))
+
+        new_state = RVState(state.attractor, (rrs[-1], vvs[-1]), state.plane)
+        return new_state
+
+    def propagate_many(self, state, tofs):
+        state = state.to_vectors()
+
+        rrs, vvs = ks(
+            state.attractor.k.to_value(u.km**3 / u.s**2),
+            *state.to_value(),
+            tofs.to_value(u.s),
+            self._rtol,
+            self._f,
+        )
+
+        return (
+            rrs << u.km,
+            vvs << (u.km / u.s),
+        )
@@ -1,8 +1,12 @@
 import sys
 
 from astropy import units as u
+import numpy as np
 
-from boinor.core.propagation import markley_coe as markley_fast
+from boinor.core.propagation import (
+    markley_coe as markley_fast,
+    markley_many as markley_many_fast,
+)
 from boinor.twobody.propagation.enums import PropagatorKind
 from boinor.twobody.states import ClassicalState
 
@@ -40,3 +44,19 @@ class MarkleyPropagator:
             state.attractor, state.to_tuple()[:5] + (nu,), state.plane
         )
         return new_state
+
+    def propagate_many(self, state, tofs):
+        state = state.to_vectors()
+        tofs = tofs.to_value(u.s)
+
+        rrs, vvs = markley_many_fast(
+            state.attractor.k.to_value(u.km**3 / u.s**2),
+            *state.to_value(),
+            tofs,
+            np.empty((len(tofs), 3)),
+            np.empty((len(tofs), 3)),
+        )
+        return (
+            rrs << u.km,
+            vvs << (u.km / u.s),
+        )
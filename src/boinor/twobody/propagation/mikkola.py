@@ -1,8 +1,12 @@
 import sys
 
 from astropy import units as u
+import numpy as np
 
-from boinor.core.propagation import mikkola_coe as mikkola_fast
+from boinor.core.propagation import (
+    mikkola_coe as mikkola_fast,
+    mikkola_many as mikkola_many_fast,
+)
 from boinor.twobody.propagation.enums import PropagatorKind
 from boinor.twobody.states import ClassicalState
 
@@ -39,3 +43,19 @@ class MikkolaPropagator:
             state.attractor, state.to_tuple()[:5] + (nu,), state.plane
         )
         return new_state
+
+    def propagate_many(self, state, tofs):
+        state = state.to_vectors()
+        tofs = tofs.to_value(u.s)
+
+        rrs, vvs = mikkola_many_fast(
+            state.attractor.k.to_value(u.km**3 / u.s**2),
+            *state.to_value(),
+            tofs,
+            np.empty((len(tofs), 3)),
+            np.empty((len(tofs), 3)),
+        )
+        return (
+            rrs << u.km,
+            vvs << (u.km / u.s),
+        )
@@ -1,8 +1,12 @@
 import sys
 
 from astropy import units as u
+import numpy as np
 
-from boinor.core.propagation import recseries_coe as recseries_fast
+from boinor.core.propagation import (
+    recseries_coe as recseries_fast,
+    recseries_many as recseries_many_fast,
+)
 from boinor.twobody.propagation.enums import PropagatorKind
 from boinor.twobody.states import ClassicalState
 
@@ -59,3 +63,23 @@ class RecseriesPropagator:
             state.attractor, state.to_tuple()[:5] + (nu,), state.plane
         )
         return new_state
+
+    def propagate_many(self, state, tofs):
+        state = state.to_vectors()
+        tofs = tofs.to_value(u.s)
+
+        rrs, vvs = recseries_many_fast(
+            state.attractor.k.to_value(u.km**3 / u.s**2),
+            *state.to_value(),
+            tofs,
+            np.empty((len(tofs), 3)),
+            np.empty((len(tofs), 3)),
+            method=self._method,
+            order=self._order,
+            numiter=self._numiter,
+            rtol=self._rtol,
+        )
+        return (
+            rrs << u.km,
+            vvs << (u.km / u.s),
+        )
@@ -3,7 +3,11 @@ import sys
 from astropy import units as u
 import numpy as np
 
-from boinor.core.propagation import vallado as vallado_fast
+from boinor.core.propagation import (
+    vallado as vallado_fast,
+    vallado_grid as vallado_grid_fast,
+    vallado_many as vallado_many_fast,
+)
 from boinor.twobody.propagation.enums import PropagatorKind
 from boinor.twobody.states import RVState
 
@@ -62,3 +66,47 @@ class ValladoPropagator:
 
         new_state = RVState(state.attractor, (r, v), state.plane)
         return new_state
+
+    def propagate_many(self, state, tofs):
+        state = state.to_vectors()
+        tofs = tofs.to_value(u.s)
+
+        rrs, vvs = vallado_many_fast(
+            state.attractor.k.to_value(u.km**3 / u.s**2),
+            *state.to_value(),
+            tofs,
+            np.empty((len(tofs), 3)),
+            np.empty((len(tofs), 3)),
+            self._numiter,
+        )
+        return (
+            rrs << u.km,
+            vvs << (u.km / u.s),
+        )
+
+    def propagate_grid(self, state, t0, t, out):
+        """Propagates an array of states to a common grid of times.
+
+        Parameters
+        ----------
+        state : ~boinor.twobody.states.BaseStateArray
+            Initial states.
+        t0 : ~astropy.units.Quantity
+            Times of the initial states, shape (n,).
+        t : ~astropy.units.Quantity
+            Times of the grid, shape (m,), with the same origin as ``t0``.
+        out : numpy.ndarray
+            Preallocated array of shape (n, m, 6) where the positions (km)
+            and velocities (km / s) are written.
+
+        """
+        state = state.to_vectors()
+
+        return vallado_grid_fast(
+            state.attractor.k.to_value(u.km**3 / u.s**2),
+            *state.to_value(),
+            t0.to_value(u.s),
+            t.to_value(u.s),
+            out,
+            self._numiter,
+        )
@@ -1,8 +1,17 @@
 from functools import cached_property
 
 from astropy import units as u
-
-from boinor.core.elements import coe2mee, coe2rv, mee2coe, mee2rv, rv2coe
+import numpy as np
+
+from boinor.core.elements import (
+    coe2mee,
+    coe2rv,
+    coe2rv_many,
+    mee2coe,
+    mee2rv,
+    rv2coe,
+    rv2coe_many,
+)
 from boinor.twobody.elements import mean_motion, period, t_p
 
 
@@ -347,3 +356,199 @@ class ModifiedEquinoctialState(BaseState):
         # TODO: gives pylint abstract_method but what shall we do here?
         # this is nonsense
         return self
+
+
+class BaseStateArray:
+    """Base class for arrays of states, meant to be subclassed.
+
+    All the states share the same attractor and plane, and the elements
+    are stored as contiguous float64 arrays in km, km / s and rad
+    so that they can be passed to the core functions without conversions.
+
+    """
+
+    def __init__(self, attractor, elements, plane):
+        """Constructor.
+
+        Parameters
+        ----------
+        attractor : Body
+            Main attractor.
+        elements : tuple
+            Tuple of raw arrays of orbital elements.
+        plane : ~boinor.frames.enums.Planes
+            Reference plane for the elements.
+
+        """
+        self._attractor = attractor
+        self._elements = tuple(
+            np.ascontiguousarray(element, dtype=np.float64)
+            for element in elements
+        )
+        self._plane = plane
+
+    @property
+    def plane(self):
+        """Fundamental plane of the frame."""
+        return self._plane
+
+    @property
+    def attractor(self):
+        """Main attractor."""
+        return self._attractor
+
+    @property
+    def _k(self):
+        """Raw gravitational parameter of the attractor repeated for every state."""
+        return np.full(
+            len(self), self.attractor.k.to_value(u.km**3 / u.s**2)
+        )
+
+    def __len__(self):
+        return self._elements[0].shape[0]
+
+    def __getitem__(self, index):
+        if np.ndim(index) == 0 and not isinstance(index, slice):
+            return self._scalar_class(
+                self.attractor,
+                tuple(
+                    element[index] << unit
+                    for element, unit in zip(self._elements, self._units)
+                ),
+                self.plane,
+            )
+
+        return self.__class__(
+            self.attractor,
+            tuple(element[index] for element in self._elements),
+            self.plane,
+        )
+
+    def to_value(self):
+        """Returns the raw arrays of elements."""
+        return self._elements
+
+    def to_vectors(self):
+        """Converts to position and velocity vector representation.
+
+        Returns
+        -------
+        RVStateArray
+
+        """
+        raise NotImplementedError
+
+    def to_classical(self):
+        """Converts to classical orbital elements representation.
+
+        Returns
+        -------
+        ClassicalStateArray
+
+        """
+        raise NotImplementedError
+
+
+class ClassicalStateArray(BaseStateArray):
+    """Array of states defined by their classical orbital elements.
+
+    Orbital elements, as arrays of shape (n,):
+
+    p : numpy.ndarray
+        Semilatus rectum (km).
+    ecc : numpy.ndarray
+        Eccentricity.
+    inc : numpy.ndarray
+        Inclination (rad).
+    raan : numpy.ndarray
+        Right ascension of the ascending node (rad).
+    argp : numpy.ndarray
+        Argument of the perigee (rad).
+    nu : numpy.ndarray
+        True anomaly (rad).
+
+    """
+
+    _scalar_class = ClassicalState
+    _units = (u.km, u.one, u.rad, u.rad, u.rad, u.rad)
+
+    @property
+    def p(self):
+        """Semilatus rectum."""
+        return self._elements[0] << u.km
+
+    @property
+    def a(self):
+        """Semimajor axis."""
+        return self.p / (1 - self.ecc**2)
+
+    @property
+    def ecc(self):
+        """Eccentricity."""
+        return self._elements[1] << u.one
+
+    @property
+    def inc(self):
+        """Inclination."""
+        return self._elements[2] << u.rad
+
+    @property
+    def raan(self):
+        """Right ascension of the ascending node."""
+        return self._elements[3] << u.rad
+
+    @property
+    def argp(self):
+        """Argument of the perigee."""
+        return self._elements[4] << u.rad
+
+    @property
+    def nu(self):
+        """True anomaly."""
+        return self._elements[5] << u.rad
+
+    def to_vectors(self):
+        """Converts to position and velocity vector representation."""
+        r, v = coe2rv_many(self._k, *self._elements)
+
+        return RVStateArray(self.attractor, (r, v), self.plane)
+
+    def to_classical(self):
+        """Converts to classical orbital elements representation."""
+        return self
+
+
+class RVStateArray(BaseStateArray):
+    """Array of states defined by their position and velocity vectors.
+
+    Orbital elements, as arrays of shape (n, 3):
+
+    r : numpy.ndarray
+        Position vectors wrt attractor center (km).
+    v : numpy.ndarray
+        Velocity vectors (km / s).
+
+    """
+
+    _scalar_class = RVState
+    _units = (u.km, u.km / u.s)
+
+    @property
+    def r(self):
+        """Position vectors."""
+        return self._elements[0] << u.km
+
+    @property
+    def v(self):
+        """Velocity vectors."""
+        return self._elements[1] << (u.km / u.s)
+
+    def to_vectors(self):
+        """Converts to position and velocity vector representation."""
+        return self
+
+    def to_classical(self):
+        """Converts to classical orbital elements representation."""
+        elements = rv2coe_many(self._k, *self._elements)
+
+        return ClassicalStateArray(self.attractor, elements, self.plane)
@@ -0,0 +1,160 @@
+from astropy import time, units as u
+from astropy.coordinates import CartesianDifferential, CartesianRepresentation
+
+from boinor.ephem import Ephem
+
+TRAJECTORY_FORMAT = "Trajectory around {body} from {start} to {end} ({scale})"
+
+
+class Trajectory:
+    """Continuous trajectory of an orbit between two epochs.
+
+    It keeps the piecewise interpolant of a numerical integration, so that
+    the orbit can be evaluated at any array of epochs of its span
+    without integrating again. Instead of creating it directly,
+    use :py:meth:`~boinor.twobody.orbit.scalar.Orbit.to_trajectory`.
+
+    It also implements the interface of the interpolators of
+    :py:mod:`boinor.ephem`, so that it can back an
+    :py:class:`~boinor.ephem.Ephem`, see :py:meth:`to_ephem`.
+
+    Parameters
+    ----------
+    attractor : ~boinor.bodies.Body
+        Main attractor.
+    epoch : ~astropy.time.Time
+        Epoch of the initial state, origin of the times of the interpolant.
+    plane : ~boinor.frames.Planes
+        Fundamental plane of the frame.
+    dense_output : callable
+        Interpolant, which returns the positions (km) and velocities (km / s)
+        at an array of times (s) since ``epoch``, with attributes
+        ``t_min`` and ``t_max`` giving its span,
+        like :py:class:`~boinor.core.propagation.cowell.CowellDenseOutput`.
+
+    """
+
+    def __init__(self, attractor, epoch, plane, dense_output):
+        self._attractor = attractor
+        self._epoch = epoch
+        self._plane = plane
+        self._dense_output = dense_output
+
+    def __str__(self):
+        return TRAJECTORY_FORMAT.format(
+            body=self.attractor,
+            start=self.start,
+            end=self.end,
+            scale=self.epoch.scale.upper(),
+        )
+
+    def __repr__(self):
+        return self.__str__()
+
+    @property
+    def attractor(self):
+        """Main attractor."""
+        return self._attractor
+
+    @property
+    def epoch(self):
+        """Epoch of the initial state."""
+        return self._epoch
+
+    @property
+    def plane(self):
+        """Fundamental plane of the frame."""
+        return self._plane
+
+    @property
+    def start(self):
+        """Earliest epoch of the trajectory."""
+        return self.epoch + self._dense_output.t_min * u.s
+
+    @property
+    def end(self):
+        """Latest epoch of the trajectory."""
+        return self.epoch + self._dense_output.t_max * u.s
+
+    def _evaluate(self, epochs):
+        if isinstance(epochs, time.Time) and not isinstance(
+            epochs, time.TimeDelta
+        ):
+            tofs = (epochs - self.epoch).to_value(u.s)
+        else:
+            # Works for both Quantity and TimeDelta objects
+            tofs = time.TimeDelta(epochs).to_value(u.s)
+
+        return self._dense_output(tofs)
+
+    def rv(self, epochs):
+        """Position and velocity vectors at given epochs.
+
+        Parameters
+        ----------
+        epochs : ~astropy.time.Time, ~astropy.units.Quantity, ~astropy.time.TimeDelta
+            Epochs, or times since the initial epoch,
+            either scalar or array. They must be within the span
+            of the trajectory.
+
+        """
+        values = self._evaluate(epochs)
+        r = values[:, :3] << u.km
+        v = values[:, 3:] << (u.km / u.s)
+
+        if epochs.isscalar:
+            return r[0], v[0]
+
+        return r, v
+
+    def sample(self, epochs):
+        """Coordinates at given epochs.
+
+        Parameters
+        ----------
+        epochs : ~astropy.time.Time, ~astropy.units.Quantity, ~astropy.time.TimeDelta
+            Epochs, or times since the initial epoch.
+            They must be within the span of the trajectory.
+
+        Returns
+        -------
+        CartesianRepresentation
+            Sampled coordinates with velocities.
+
+        """
+        values = self._evaluate(epochs)
+
+        return CartesianRepresentation(
+            values[:, :3] << u.km,
+            differentials=CartesianDifferential(
+                values[:, 3:] << (u.km / u.s), xyz_axis=1
+            ),
+            xyz_axis=1,
+        )
+
+    def interpolate(self, epochs, reference_epochs, coordinates):
+        """Evaluates the trajectory, as an interpolator of :py:mod:`boinor.ephem`.
+
+        The reference epochs and coordinates are ignored,
+        since the trajectory is continuous.
+
+        """
+        return self.sample(epochs)
+
+    def to_ephem(self, epochs):
+        """Samples the trajectory to return an ephemerides.
+
+        The trajectory is kept as the interpolator of the ephemerides,
+        so sampling it at other epochs is as accurate as the integration.
+
+        Parameters
+        ----------
+        epochs : ~astropy.time.Time
+            Epochs to sample the trajectory.
+
+        """
+        epochs = epochs.reshape(-1)
+
+        return Ephem(
+            self.sample(epochs), epochs, self.plane, interpolator=self
+        )
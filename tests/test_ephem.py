@@ -9,18 +9,25 @@ from astropy.coordinates import (
 )
 from astropy.tests.helper import assert_quantity_allclose
 from astropy.time import Time
+from numba import njit as jit
 import numpy as np
+from numpy.testing import assert_allclose
 import pytest
 
-from boinor.bodies import Earth, Venus
+from boinor.bodies import Earth, Moon, Sun, Venus
+from boinor.core.force_model import ForceModel
+from boinor.core.perturbations import third_body
+from boinor.core.propagation import func_twobody
 from boinor.ephem import (
     BaseInterpolator,
     Ephem,
     SincInterpolator,
     SplineInterpolator,
+    build_chebyshev_interpolant,
 )
 from boinor.frames import Planes
 from boinor.twobody.orbit import Orbit
+from boinor.util import time_range
 from boinor.warnings import TimeScaleWarning
 
 AVAILABLE_INTERPOLATORS = [SincInterpolator(), SplineInterpolator()]
@@ -433,3 +440,59 @@ def test_from_orbit_has_desired_properties(interpolator, rtol):
 
     assert ephem.epochs is epochs
     assert_coordinates_allclose(coordinates, expected_coordinates, rtol=rtol)
+
+
+@pytest.mark.parametrize("body", [Moon, Sun])
+def test_build_chebyshev_interpolant_matches_body_positions(body):
+    epoch = Time("2020-01-01", scale="tdb")
+    epochs = time_range(epoch, num_values=11, end=epoch + 10 * u.day)
+    t = np.linspace(0, 10, num=37) * u.day
+
+    interpolant = build_chebyshev_interpolant(body, epochs)
+
+    expected = Ephem.from_body(body, epoch + t, attractor=Earth)
+    result = np.array([interpolant(t0) for t0 in t.to_value(u.s)])
+    assert_allclose(
+        result, expected._coordinates.xyz.to_value(u.km).T, rtol=1e-8
+    )
+
+
+def test_build_chebyshev_interpolant_can_be_used_in_compiled_code():
+    epoch = Time("2020-01-01", scale="tdb")
+    epochs = time_range(epoch, num_values=3, end=epoch + 2 * u.day)
+    moon_r = build_chebyshev_interpolant(Moon, epochs)
+    k_moon = Moon.k.to_value(u.km**3 / u.s**2)
+    k = Earth.k.to_value(u.km**3 / u.s**2)
+    state = np.array([7000.0, 0, 0, 0, 7.5, 0])
+
+    @jit
+    def distance(t0):
+        return np.sqrt(np.sum(moon_r(t0) ** 2))
+
+    model = ForceModel().add(
+        third_body, k_third=k_moon, perturbation_body=moon_r
+    )
+
+    expected = func_twobody(3600.0, state, k)
+    expected[3:] += third_body(3600.0, state, k, k_moon, moon_r)
+
+    assert 3.5e5 < distance(3600.0) < 4.1e5
+    assert_allclose(model(3600.0, state, k), expected)
+
+
+def test_build_chebyshev_interpolant_raises_for_single_epoch():
+    with pytest.raises(ValueError, match="two epochs"):
+        build_chebyshev_interpolant(Moon, Time(["2020-01-01"], scale="tdb"))
+
+
+def test_ephem_sample_uses_default_interpolator(epochs, coordinates):
+    interpolator = mock.Mock()
+    ephem = Ephem(
+        coordinates, epochs, Planes.EARTH_EQUATOR, interpolator=interpolator
+    )
+    new_epochs = epochs[:2] + 1 * u.h
+
+    ephem.sample(new_epochs)
+
+    interpolator.interpolate.assert_called_once()
+    assert (interpolator.interpolate.call_args[0][0] == new_epochs).all()
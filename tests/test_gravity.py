@@ -0,0 +1,252 @@
+from math import factorial
+
+from astropy import units as u
+from astropy.tests.helper import assert_quantity_allclose
+import numpy as np
+from numpy.testing import assert_allclose
+import pytest
+
+from boinor.bodies import Earth
+from boinor.core.force_model import ForceModel
+from boinor.core.perturbations import (
+    J2_perturbation,
+    spherical_harmonics_perturbation,
+)
+from boinor.gravity import GravityField
+
+ICGEM_FILE = """\
+product_type               gravity_field
+modelname                  TEST
+earth_gravity_constant     0.3986004415E+15
+radius                     0.6378136300E+07
+max_degree                 3
+errors                     formal
+norm                       fully_normalized
+
+key     L    M             C                   S           sigma C  sigma S
+end_of_head ===================================================================
+gfc     0    0  1.000000000000E+00  0.000000000000E+00  0.0000E+00  0.0000E+00
+gfc     2    0 -0.484165371736E-03  0.000000000000E+00  0.3561E-10  0.0000E+00
+gfc     2    1 -0.186987635955E-09  0.119528012031E-08  0.1000E-29  0.1000E-29
+gfc     2    2  0.243914352398E-05 -0.140016683654E-05  0.5373E-10  0.5439E-10
+gfc     3    0  0.957254173792E-06  0.000000000000E+00  0.1809E-10  0.0000E+00
+"""
+
+EGM_FILE = """\
+    2    0 -0.484165371736D-03  0.000000000000D+00
+    2    1 -0.186987635955D-09  0.119528012031D-08
+    2    2  0.243914352398D-05 -0.140016683654D-05
+    3    0  0.957254173792D-06  0.000000000000D+00
+"""
+
+
+@pytest.fixture
+def icgem_file(tmp_path):
+    filename = tmp_path / "test.gfc"
+    filename.write_text(ICGEM_FILE)
+    return filename
+
+
+def test_gravity_field_from_icgem_file(icgem_file):
+    field = GravityField.from_file(icgem_file)
+
+    assert field.max_degree == 3
+    assert_quantity_allclose(field.R, 6378.1363 * u.km)
+    assert_quantity_allclose(field.k, 398600.4415 * u.km**3 / u.s**2)
+    assert field.C[2, 2] == 0.243914352398e-05
+    assert field.S[2, 2] == -0.140016683654e-05
+
+
+def test_gravity_field_from_egm_file_with_fortran_exponents(
+    tmp_path, icgem_file
+):
+    filename = tmp_path / "test.txt"
+    filename.write_text(EGM_FILE)
+
+    field = GravityField.from_file(filename, k=Earth.k, R=Earth.R)
+    expected = GravityField.from_file(icgem_file)
+
+    assert_allclose(field.C[2:], expected.C[2:])
+    assert_allclose(field.S, expected.S)
+
+
+def test_gravity_field_from_file_truncates_degree(icgem_file):
+    field = GravityField.from_file(icgem_file, max_degree=2)
+
+    assert field.max_degree == 2
+
+
+def test_gravity_field_from_file_raises_without_radius(tmp_path):
+    filename = tmp_path / "test.txt"
+    filename.write_text(EGM_FILE)
+
+    with pytest.raises(ValueError, match="please provide R"):
+        GravityField.from_file(filename, k=Earth.k)
+
+
+def test_gravity_field_unnormalized_coefficients(tmp_path):
+    filename = tmp_path / "test.txt"
+    filename.write_text("2 0 -1.08262668e-3 0.0\n")
+
+    field = GravityField.from_file(
+        filename, k=Earth.k, R=Earth.R, normalized=False
+    )
+
+    assert_allclose(field.C[2, 0], -1.08262668e-3 / np.sqrt(5))
+
+
+def test_zonal_field_agrees_with_J2_perturbation():
+    J2 = Earth.J2.value
+    R = Earth.R.to_value(u.km)
+    C = np.zeros((3, 3))
+    C[2, 0] = -J2 / np.sqrt(5)
+    field = GravityField(C, np.zeros((3, 3)), Earth.k, Earth.R)
+    k = Earth.k.to_value(u.km**3 / u.s**2)
+    state = np.array([-2384.46, 5729.01, 3050.46, -7.36138, -2.98997, 1.64354])
+
+    model = ForceModel().add(
+        spherical_harmonics_perturbation, **field.perturbation_params()
+    )
+    expected = ForceModel().add(J2_perturbation, J2=J2, R=R)
+
+    assert_allclose(model(0.0, state, k), expected(0.0, state, k), rtol=1e-12)
+
+
+def _potential(r, k, R, C, S):
+    # Direct evaluation of the potential, excluding the central term
+    x, y, z = r
+    norm_r = np.sqrt(x * x + y * y + z * z)
+    lat, lon = np.arcsin(z / norm_r), np.arctan2(y, x)
+
+    potential = 0.0
+    for n in range(2, C.shape[0]):
+        for m in range(n + 1):
+            # Associated Legendre functions without the Condon-Shortley phase
+            P = np.polynomial.legendre.Legendre.basis(n).deriv(m)(np.sin(lat))
+            P *= np.cos(lat) ** m
+            N = np.sqrt(
+                (2 - (m == 0))
+                * (2 * n + 1)
+                * factorial(n - m)
+                / factorial(n + m)
+            )
+            potential += (
+                (R / norm_r) ** n
+                * N
+                * P
+                * (C[n, m] * np.cos(m * lon) + S[n, m] * np.sin(m * lon))
+            )
+
+    return k / norm_r * potential
+
+
+@pytest.mark.parametrize(
+    "r", [[5000.0, 3000.0, 4000.0], [-100.0, 50.0, 7000.0]]
+)
+def test_spherical_harmonics_perturbation_is_gradient_of_potential(r):
+    rng = np.random.default_rng(42)
+    C = np.tril(rng.normal(size=(7, 7))) * 1e-6
+    S = np.tril(rng.normal(size=(7, 7))) * 1e-6
+    S[:, 0] = 0
+    field = GravityField(C, S, Earth.k, Earth.R)
+    k = Earth.k.to_value(u.km**3 / u.s**2)
+    R = Earth.R.to_value(u.km)
+    r = np.array(r)
+    theta = 0.3
+
+    acceleration = spherical_harmonics_perturbation(
+        0.0,
+        np.concatenate([r, [0, 0, 0]]),
+        k,
+        **field.perturbation_params(
+            theta0=theta * u.rad, omega=Earth.angular_velocity
+        ),
+    )
+
+    # Gradient in the body-fixed frame, rotated back to the inertial frame
+    rotation = np.array(
+        [
+            [np.cos(theta), -np.sin(theta), 0],
+            [np.sin(theta), np.cos(theta), 0],
+            [0, 0, 1],
+        ]
+    )
+    r_body = rotation.T @ r
+    h = 1e-3
+    gradient = [
+        (
+            _potential(r_body + h * e, k, R, C, S)
+            - _potential(r_body - h * e, k, R, C, S)
+        )
+        / (2 * h)
+        for e in np.eye(3)
+    ]
+
+    assert_allclose(acceleration, rotation @ gradient, rtol=1e-6)
+
+
+def test_spherical_harmonics_perturbation_truncates_at_call_time():
+    rng = np.random.default_rng(0)
+    C = np.tril(rng.normal(size=(6, 6))) * 1e-6
+    S = np.tril(rng.normal(size=(6, 6))) * 1e-6
+    field = GravityField(C, S, Earth.k, Earth.R)
+    truncated = np.zeros_like(C), np.zeros_like(S)
+    truncated[0][:5, :3] = C[:5, :3]
+    truncated[1][:5, :3] = S[:5, :3]
+    truncated_field = GravityField(*truncated, Earth.k, Earth.R)
+    state = np.array([5000.0, 3000.0, 4000.0, 0, 0, 0])
+
+    omega = Earth.angular_velocity
+
+    acceleration = spherical_harmonics_perturbation(
+        0.0, state, 398600.0, **field.perturbation_params(4, 2, omega=omega)
+    )
+    expected = spherical_harmonics_perturbation(
+        0.0,
+        state,
+        398600.0,
+        **truncated_field.perturbation_params(omega=omega),
+    )
+
+    assert_allclose(acceleration, expected, rtol=1e-12)
+
+
+@pytest.mark.parametrize("max_degree, max_order", [(1, 1), (6, 0), (3, 4)])
+def test_perturbation_params_raises_for_wrong_truncation(
+    max_degree, max_order
+):
+    field = GravityField(np.zeros((6, 6)), np.zeros((6, 6)), Earth.k, Earth.R)
+
+    with pytest.raises(ValueError, match="must be between"):
+        field.perturbation_params(max_degree, max_order)
+
+
+def test_spherical_harmonics_perturbation_uses_field_gravitational_parameter():
+    C = np.zeros((3, 3))
+    C[2, 0] = -Earth.J2.value / np.sqrt(5)
+    field = GravityField(C, np.zeros((3, 3)), Earth.k, Earth.R)
+    scaled_field = GravityField(C / 2, np.zeros((3, 3)), 2 * Earth.k, Earth.R)
+    state = np.array([5000.0, 3000.0, 4000.0, 0, 0, 0])
+
+    acceleration = spherical_harmonics_perturbation(
+        0.0, state, 398600.0, **scaled_field.perturbation_params()
+    )
+    expected = spherical_harmonics_perturbation(
+        0.0, state, 398600.0, **field.perturbation_params()
+    )
+
+    assert_allclose(acceleration, expected, rtol=1e-12)
+
+
+def test_perturbation_params_requires_omega_for_tesseral_fields():
+    C = np.zeros((3, 3))
+    C[2, 0] = -Earth.J2.value / np.sqrt(5)
+    C[2, 2] = 1e-6
+    field = GravityField(C, np.zeros((3, 3)), Earth.k, Earth.R)
+
+    with pytest.raises(ValueError, match="omega is required"):
+        field.perturbation_params()
+
+    params = field.perturbation_params(max_order=0)
+
+    assert params["omega"] == 0
@@ -1,12 +1,19 @@
 from astropy import constants as c, units as u
+from astropy.coordinates import get_body_barycentric_posvel
 from astropy.tests.helper import assert_quantity_allclose
 import numpy as np
 import pytest
 
-from boinor.bodies import Earth
+from boinor.bodies import Earth, Mars, Sun, Venus
 from boinor.core import iod
 from boinor.core.iod import _compute_psi, _compute_T_min
-from boinor.iod import izzo, vallado
+from boinor.iod import izzo, lambert_many, vallado
+from boinor.iod.mga import mga
+from boinor.iod.porkchop import get_states, launch_windows, porkchop
+from boinor.maneuver import Maneuver
+from boinor.threebody.flybys import powered_flyby
+from boinor.twobody import Orbit
+from boinor.util import norm, time_range
 
 
 @pytest.mark.parametrize("lambert", [vallado.lambert, izzo.lambert])
@@ -206,3 +213,346 @@ def test_compute_t_min(ll, M, expected_x_T_min, expected_T_min):
     x_T_min, T_min = _compute_T_min(ll, M, 10, rtol)
     assert_quantity_allclose(x_T_min, expected_x_T_min, rtol=rtol)
     assert_quantity_allclose(T_min, expected_T_min, rtol=rtol)
+
+
+@pytest.mark.parametrize("solver", [vallado, izzo])
+def test_lambert_many_agrees_with_lambert(solver):
+    k = Earth.k
+    r0 = [[15945.34, 0.0, 0.0], [5000.0, 10000.0, 2100.0]] * u.km
+    r = [[12214.83399, 10249.46731, 0.0], [-14600.0, 2500.0, 7000.0]] * u.km
+    tof = [76.0, 60.0] * u.min
+
+    va, vb, status = solver.lambert_many(k, r0, r, tof)
+
+    assert list(status) == [iod.LAMBERT_CONVERGED] * 2
+    for i in range(2):
+        expected_va, expected_vb = solver.lambert(k, r0[i], r[i], tof[i])
+        assert_quantity_allclose(va[i], expected_va, rtol=1e-12)
+        assert_quantity_allclose(vb[i], expected_vb, rtol=1e-12)
+
+
+def test_lambert_many_broadcasts_shared_boundary_conditions():
+    k = Earth.k
+    r0 = [5000.0, 10000.0, 2100.0] * u.km
+    r = [-14600.0, 2500.0, 7000.0] * u.km
+    tof = [1.0, 1.5, 2.0] * u.h
+
+    va, vb, status = lambert_many(k, r0, r, tof)
+
+    assert va.shape == vb.shape == (3, 3)
+    assert np.all(status == iod.LAMBERT_CONVERGED)
+    assert_quantity_allclose(va[2], izzo.lambert(k, r0, r, tof[2])[0])
+
+
+def test_lambert_many_returns_status_instead_of_raising():
+    k = Earth.k
+    r0 = [22592.145603, -1599.915239, -19783.950506] * u.km
+    r = [
+        [1922.067697, 4054.157051, -8925.727465],
+        [22592.145603, -1599.915239, -19783.950506],
+        [1922.067697, 4054.157051, -8925.727465],
+    ] * u.km
+    tof = [5, 5, -5] * u.h
+
+    va, vb, status = izzo.lambert_many(k, r0, r, tof, M=1)
+
+    assert list(status) == [
+        iod.LAMBERT_NO_SOLUTION,
+        iod.LAMBERT_DEGENERATE,
+        iod.LAMBERT_INVALID,
+    ]
+    assert np.all(np.isnan(va)) and np.all(np.isnan(vb))
+
+
+def test_vallado_many_returns_status_for_multirev():
+    k = 1.0 * u.m**3 / u.s**2
+    r0 = [1, 0, 0] * u.m
+    r = [0, 1, 0] * u.m
+    tof = 1 * u.s
+
+    _, _, status = vallado.lambert_many(k, r0, r, tof, M=1)
+
+    assert list(status) == [iod.LAMBERT_NO_SOLUTION]
+
+
+def test_porkchop_agrees_with_lambert_maneuvers():
+    launch_span = time_range("2005-06-01", end="2005-09-01", num_values=4)
+    arrival_span = time_range("2005-08-01", end="2006-09-01", num_values=5)
+
+    dv_launch, dv_arrival, c3_launch, c3_arrival, tof = porkchop(
+        Earth, Mars, launch_span, arrival_span
+    )
+
+    assert dv_launch.shape == tof.shape == (5, 4)
+    for i, arrival in enumerate(arrival_span):
+        for j, launch in enumerate(launch_span):
+            if arrival <= launch:
+                assert np.isnan(dv_launch[i, j]) and np.isnan(tof[i, j])
+                continue
+
+            orbits = [
+                Orbit.from_vectors(
+                    Sun,
+                    *(
+                        rep.xyz
+                        for rep in get_body_barycentric_posvel(
+                            body.name, epoch
+                        )
+                    ),
+                    epoch=epoch,
+                )
+                for body, epoch in ((Earth, launch), (Mars, arrival))
+            ]
+            man = Maneuver.lambert(*orbits)
+            assert_quantity_allclose(
+                dv_launch[i, j], norm(man.impulses[0][1]), rtol=1e-10
+            )
+            assert_quantity_allclose(
+                c3_arrival[i, j], norm(man.impulses[1][1]) ** 2, rtol=1e-10
+            )
+            assert_quantity_allclose(tof[i, j], (arrival - launch).to(u.d))
+
+
+def test_porkchop_all_branches_keeps_minimum_delta_v_branch():
+    launch_span = time_range("2005-06-01", end="2005-09-01", num_values=3)
+    arrival_span = time_range("2007-06-01", end="2008-06-01", num_values=4)
+    k = Sun.k
+
+    dv_launch_0, dv_arrival_0, *_ = porkchop(
+        Earth, Mars, launch_span, arrival_span
+    )
+    dv_launch, dv_arrival, _, _, tof, revs, lowpaths = porkchop(
+        Earth, Mars, launch_span, arrival_span, M=5, all_branches=True
+    )
+
+    assert np.any(revs > 0)
+    assert np.all(dv_launch + dv_arrival <= dv_launch_0 + dv_arrival_0)
+
+    rr_dpt, vv_dpt = get_states(Earth, launch_span)
+    rr_arr, vv_arr = get_states(Mars, arrival_span)
+    for i in range(len(arrival_span)):
+        for j in range(len(launch_span)):
+            branches = [
+                (M, lowpath)
+                for M in range(6)
+                for lowpath in ([True] if M == 0 else [True, False])
+            ]
+            totals = []
+            for M, lowpath in branches:
+                try:
+                    v1, v2 = izzo.lambert(
+                        k,
+                        rr_dpt[j] << u.km,
+                        rr_arr[i] << u.km,
+                        tof[i, j],
+                        M=M,
+                        lowpath=lowpath,
+                    )
+                except ValueError:
+                    continue
+                totals.append(
+                    (
+                        norm(v1 - (vv_dpt[j] << u.km / u.s))
+                        + norm((vv_arr[i] << u.km / u.s) - v2),
+                        M,
+                        lowpath,
+                    )
+                )
+
+            total, M, lowpath = min(totals)
+            assert_quantity_allclose(
+                dv_launch[i, j] + dv_arrival[i, j], total, rtol=1e-10
+            )
+            assert (revs[i, j], lowpaths[i, j]) == (M, lowpath)
+
+
+def test_launch_windows_finds_minimum_of_dense_porkchop():
+    levels = 3
+    launch_span = time_range("2005-04-30", end="2005-10-07", num_values=11)
+    arrival_span = time_range("2005-11-16", end="2006-12-21", num_values=11)
+    dense_launch = time_range(
+        "2005-04-30", end="2005-10-07", num_values=10 * 2**levels + 1
+    )
+    dense_arrival = time_range(
+        "2005-11-16", end="2006-12-21", num_values=10 * 2**levels + 1
+    )
+
+    minima, samples = launch_windows(
+        Earth,
+        Mars,
+        launch_span,
+        arrival_span,
+        levels=levels,
+        return_samples=True,
+    )
+    dv_launch, dv_arrival, *_ = porkchop(
+        Earth, Mars, dense_launch, dense_arrival
+    )
+
+    total = (dv_launch + dv_arrival).to_value(u.km / u.s)
+    i, j = np.unravel_index(np.nanargmin(total), total.shape)
+    assert_quantity_allclose(minima[0][0].jd, dense_launch[j].jd)
+    assert_quantity_allclose(minima[1][0].jd, dense_arrival[i].jd)
+    assert_quantity_allclose(
+        minima[2][0] + minima[3][0], total[i, j] * u.km / u.s, rtol=1e-6
+    )
+    assert np.all(np.diff(minima[2] + minima[3]) >= 0)
+    assert len(samples[0]) < total.size / 20
+
+
+def test_launch_windows_refines_cells_below_threshold():
+    launch_span = time_range("2005-04-30", end="2005-10-07", num_values=6)
+    arrival_span = time_range("2005-11-16", end="2006-12-21", num_values=6)
+    threshold = 20 * u.km**2 / u.s**2
+
+    minima, samples = launch_windows(
+        Earth,
+        Mars,
+        launch_span,
+        arrival_span,
+        levels=2,
+        objective="c3",
+        return_samples=True,
+    )
+    _, thresholded = launch_windows(
+        Earth,
+        Mars,
+        launch_span,
+        arrival_span,
+        levels=2,
+        objective="c3",
+        threshold=threshold,
+        return_samples=True,
+    )
+
+    assert np.all(np.diff(minima[4]) >= 0)
+    below = thresholded[4] < threshold
+    assert np.count_nonzero(below) > np.count_nonzero(samples[4] < threshold)
+    assert_quantity_allclose(thresholded[4], thresholded[2] ** 2)
+
+
+@pytest.mark.parametrize(
+    "kwargs, expected_msg",
+    [
+        ({"objective": "tof"}, "Objective must be"),
+        ({"levels": -1}, "Number of levels"),
+    ],
+)
+def test_launch_windows_raises_for_invalid_parameters(kwargs, expected_msg):
+    span = time_range("2005-04-30", end="2005-10-07", num_values=3)
+
+    with pytest.raises(ValueError, match=expected_msg):
+        launch_windows(Earth, Mars, span, span, **kwargs)
+
+
+def test_launch_windows_raises_for_uneven_spans():
+    span = time_range("2005-04-30", end="2005-10-07", num_values=3)
+    uneven = span[[0, 1]].insert(2, span[2] + 1 * u.d)
+
+    with pytest.raises(ValueError, match="evenly spaced"):
+        launch_windows(Earth, Mars, uneven, span)
+
+
+def _mga_brute_force(sequence, windows):
+    states = [
+        get_states(body, window) for body, window in zip(sequence, windows)
+    ]
+    r_p_min = [1.05 * body.R for body in sequence]
+    best = []
+    for path in np.ndindex(*(len(window) for window in windows)):
+        v_inf = []
+        try:
+            for leg in range(len(sequence) - 1):
+                (rr_dpt, vv_dpt), (rr_arr, vv_arr) = (
+                    states[leg],
+                    states[leg + 1],
+                )
+                i, j = path[leg], path[leg + 1]
+                v1, v2 = izzo.lambert(
+                    Sun.k,
+                    rr_dpt[i] << u.km,
+                    rr_arr[j] << u.km,
+                    (windows[leg + 1][j] - windows[leg][i]).to(u.s),
+                )
+                v_inf.append(
+                    (
+                        v1 - (vv_dpt[i] << u.km / u.s),
+                        v2 - (vv_arr[j] << u.km / u.s),
+                    )
+                )
+            impulses = [norm(v_inf[0][0])]
+            for leg in range(1, len(sequence) - 1):
+                impulses.append(
+                    powered_flyby(
+                        v_inf[leg - 1][1],
+                        v_inf[leg][0],
+                        sequence[leg].k,
+                        r_p_min[leg],
+                    )[0]
+                )
+        except ValueError:
+            continue
+        impulses.append(norm(v_inf[-1][1]))
+        best.append((sum(impulses).to_value(u.km / u.s), path))
+
+    return sorted(best)
+
+
+def _galileo_windows():
+    # Around the Earth-Venus-Earth legs of Galileo
+    return [
+        time_range("1989-10-08", end="1989-10-28", num_values=4),
+        time_range("1990-01-31", end="1990-02-20", num_values=4),
+        time_range("1990-11-28", end="1990-12-18", num_values=5),
+    ]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_mga_agrees_with_brute_force(workers):
+    sequence = [Earth, Venus, Earth]
+    windows = _galileo_windows()
+
+    epochs, dv, impulses = mga(
+        sequence, windows, num_solutions=3, workers=workers
+    )
+    expected = _mga_brute_force(sequence, windows)[:3]
+
+    assert len(expected) == 3
+    assert epochs.shape == impulses.shape == (3, 3)
+    assert_quantity_allclose(
+        dv, [total for total, _ in expected] * u.km / u.s, rtol=1e-6
+    )
+    assert_quantity_allclose(impulses.sum(axis=-1), dv)
+    for epoch, (_, path) in zip(epochs, expected):
+        for leg, window in enumerate(windows):
+            assert_quantity_allclose(epoch[leg].jd, window[path[leg]].jd)
+
+
+def test_mga_returns_fewer_solutions_below_max_dv():
+    sequence = [Earth, Venus, Earth]
+    windows = _galileo_windows()
+    _, dv, _ = mga(sequence, windows, num_solutions=5, workers=1)
+
+    _, bounded_dv, _ = mga(
+        sequence, windows, num_solutions=5, max_dv=dv[1], workers=1
+    )
+
+    assert len(dv) == 5
+    assert_quantity_allclose(bounded_dv, dv[:1])
+
+
+@pytest.mark.parametrize(
+    "sequence, num_windows, kwargs, expected_msg",
+    [
+        ([Earth], 1, {}, "at least two bodies"),
+        ([Earth, Mars], 1, {}, "at least two bodies"),
+        ([Earth, Mars], 2, {"num_solutions": 0}, "must be positive"),
+    ],
+)
+def test_mga_raises_for_invalid_parameters(
+    sequence, num_windows, kwargs, expected_msg
+):
+    span = time_range("2005-04-30", end="2005-10-07", num_values=3)
+
+    with pytest.raises(ValueError, match=expected_msg):
+        mga(sequence, [span] * num_windows, **kwargs)
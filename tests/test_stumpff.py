@@ -1,7 +1,13 @@
 from numpy import cos, cosh, sin, sinh
 from numpy.testing import assert_allclose
+import pytest
 
-from boinor._math.special import stumpff_c2 as c2, stumpff_c3 as c3
+from boinor._math.special import (
+    stumpff_c2 as c2,
+    stumpff_c3 as c3,
+    stumpff_c4 as c4,
+    stumpff_c5 as c5,
+)
 
 
 def test_stumpff_functions_near_zero():
@@ -29,3 +35,14 @@ def test_stumpff_functions_under_zero():
 
     assert_allclose(c2(psi), expected_c2, rtol=1e-10)
     assert_allclose(c3(psi), expected_c3, rtol=1e-10)
+
+
+@pytest.mark.parametrize("psi", [-3.0, -0.5, 0.5, 3.0])
+def test_stumpff_functions_recursion(psi):
+    assert_allclose(c4(psi), (1 / 2 - c2(psi)) / psi, rtol=1e-10)
+    assert_allclose(c5(psi), (1 / 6 - c3(psi)) / psi, rtol=1e-10)
+
+
+def test_stumpff_functions_at_zero():
+    assert_allclose(c4(0.0), 1 / 24)
+    assert_allclose(c5(0.0), 1 / 120)
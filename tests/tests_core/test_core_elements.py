@@ -6,7 +6,7 @@ from boinor.bodies import Earth
 
 # lots of functions are already checked somewhere else
 # unfortunately mee2rv is missing
-from boinor.core.elements import coe2mee, coe2rv, mee2rv, rv2coe
+from boinor.core.elements import coe2mee, coe2rv, mee2rv, rv2coe, rv2coe_many
 
 
 def test_conversions():
@@ -37,3 +37,16 @@ def test_conversions():
     )
     assert_allclose(r, r_new)
     assert_allclose(v, v_new)
+
+
+def test_rv2coe_many_matches_rv2coe():
+    k = Earth.k.to_value(u.km**3 / u.s**2)
+    rr = np.array([[-6045.0, -3490.0, 2500.0], [7000.0, 0.0, 0.0]])
+    vv = np.array([[-3.457, 6.618, 2.533], [0.0, 7.5, 1.0]])
+
+    elements = rv2coe_many(np.full(2, k), rr, vv)
+
+    for i in range(2):
+        assert_allclose(
+            [element[i] for element in elements], rv2coe(k, rr[i], vv[i])
+        )
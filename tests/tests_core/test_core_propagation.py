@@ -1,13 +1,25 @@
 from astropy import units as u
 from astropy.tests.helper import assert_quantity_allclose
+from numba import njit as jit
+import numpy as np
+from numpy.testing import assert_allclose
 import pytest
 
+from boinor._math.linalg import norm
+from boinor.bodies import Earth
+from boinor.core.perturbations import J2_perturbation
 from boinor.core.propagation import (
+    cowell,
+    cowell_stm,
     danby_coe,
+    func_twobody,
     gooding_coe,
     markley_coe,
     mikkola_coe,
     pimienta_coe,
+    vallado,
+    vallado_stm,
+    vallado_stm_many,
 )
 from boinor.core.propagation.farnocchia import (
     M_to_D_near_parabolic,
@@ -18,7 +30,7 @@ from boinor.core.propagation.farnocchia import (
     farnocchia_coe,
     nu_from_delta_t,
 )
-from boinor.examples import iss
+from boinor.examples import iss, molniya
 
 
 @pytest.mark.parametrize(
@@ -160,3 +172,140 @@ def test_kepler_algorithm():
 #    print("cowell: ", value_cowell_r, value_cowell_v)
 #    assert_quantity_allclose(expected_r, value_cowel_r)
 #    assert_quantity_allclose(expected_v, value_cowel_v)
+
+
+def _finite_differences_stm(propagate, r0, v0, rel_step=1e-6):
+    x0 = np.concatenate([r0, v0])
+    stm = np.empty((6, 6))
+    for j in range(6):
+        h = rel_step * norm(r0 if j < 3 else v0)
+        x_plus = x0.copy()
+        x_plus[j] += h
+        x_minus = x0.copy()
+        x_minus[j] -= h
+        stm[:, j] = (
+            np.concatenate(propagate(x_plus[:3], x_plus[3:]))
+            - np.concatenate(propagate(x_minus[:3], x_minus[3:]))
+        ) / (2 * h)
+
+    return stm
+
+
+@pytest.mark.parametrize(
+    "r0, v0",
+    [
+        (iss.r.to_value(u.km), iss.v.to_value(u.km / u.s)),
+        (molniya.r.to_value(u.km), molniya.v.to_value(u.km / u.s)),
+        (np.array([7000.0, 0.0, 0.0]), np.array([0.0, 11.0, 2.0])),
+    ],
+)
+@pytest.mark.parametrize("tof", [-5000.0, 100.0, 40000.0])
+def test_vallado_stm_agrees_with_finite_differences(r0, v0, tof):
+    k = Earth.k.to_value(u.km**3 / u.s**2)
+
+    r, v, stm = vallado_stm(k, r0, v0, tof, 350)
+    expected_stm = _finite_differences_stm(
+        lambda r0, v0: vallado_stm(k, r0, v0, tof, 350)[:2], r0, v0
+    )
+
+    f, g, fdot, gdot = vallado(k, r0, v0, tof, 350)
+    assert_allclose(r, f * r0 + g * v0)
+    assert_allclose(v, fdot * r0 + gdot * v0)
+    assert_allclose(
+        stm, expected_stm, rtol=1e-6, atol=1e-7 * np.abs(stm).max()
+    )
+
+
+def test_vallado_stm_is_symplectic():
+    k = Earth.k.to_value(u.km**3 / u.s**2)
+    r0 = molniya.r.to_value(u.km)
+    v0 = molniya.v.to_value(u.km / u.s)
+    J = np.block(
+        [[np.zeros((3, 3)), np.eye(3)], [-np.eye(3), np.zeros((3, 3))]]
+    )
+
+    _, _, stm = vallado_stm(k, r0, v0, 1.3 * molniya.period.to_value(u.s), 350)
+
+    assert_allclose(stm.T @ J @ stm, J, atol=1e-9 * np.abs(stm).max() ** 2)
+
+
+def test_cowell_stm_agrees_with_vallado_stm():
+    k = Earth.k.to_value(u.km**3 / u.s**2)
+    r0 = molniya.r.to_value(u.km)
+    v0 = molniya.v.to_value(u.km / u.s)
+    tofs = np.linspace(-0.5, 2, num=6) * molniya.period.to_value(u.s)
+    n = len(tofs)
+
+    rr, vv, stms = cowell_stm(k, r0, v0, tofs)
+    expected_rr, expected_vv, expected_stms = vallado_stm_many(
+        k,
+        r0,
+        v0,
+        tofs,
+        np.empty((n, 3)),
+        np.empty((n, 3)),
+        np.empty((n, 6, 6)),
+        350,
+    )
+
+    assert_allclose(rr, expected_rr, rtol=1e-8)
+    assert_allclose(vv, expected_vv, rtol=1e-8)
+    assert_allclose(stms, expected_stms, atol=1e-8 * np.abs(stms).max())
+
+
+J2_EARTH = Earth.J2.value
+R_EARTH = Earth.R.to_value(u.km)
+
+
+@jit
+def _f_J2(t0, u_, k):
+    du = func_twobody(t0, u_, k)
+    du[3:] += J2_perturbation(t0, u_, k, J2=J2_EARTH, R=R_EARTH)
+    return du
+
+
+def test_cowell_stm_with_perturbations_agrees_with_finite_differences():
+    k = Earth.k.to_value(u.km**3 / u.s**2)
+    r0 = iss.r.to_value(u.km)
+    v0 = iss.v.to_value(u.km / u.s)
+    tof = 3 * iss.period.to_value(u.s)
+
+    _, _, stms = cowell_stm(k, r0, v0, [tof], f=_f_J2)
+
+    def propagate(r0, v0):
+        rr, vv = cowell(k, r0, v0, [tof], rtol=1e-13, f=_f_J2, engine="numba")
+        return rr[0], vv[0]
+
+    expected_stm = _finite_differences_stm(propagate, r0, v0, rel_step=1e-5)
+
+    assert_allclose(
+        stms[0], expected_stm, rtol=1e-5, atol=1e-6 * np.abs(stms).max()
+    )
+
+
+def test_cowell_stm_raises_for_python_function():
+    def f(t0, u_, k):
+        return func_twobody(t0, u_, k)
+
+    with pytest.raises(ValueError, match="jitted"):
+        cowell_stm(
+            1.0, np.array([1.0, 0, 0]), np.array([0, 1.0, 0]), [1.0], f=f
+        )
+
+
+@pytest.mark.parametrize("engine", ["scipy", "numba"])
+def test_cowell_returns_contiguous_arrays(engine):
+    k = Earth.k.to_value(u.km**3 / u.s**2)
+    r0, v0 = iss.rv()
+    r0 = r0.to_value(u.km)
+    v0 = v0.to_value(u.km / u.s)
+    tofs = np.linspace(0, 2, 11) * iss.period.to_value(u.s)
+
+    rr, vv = cowell(k, r0, v0, tofs, engine=engine)
+
+    assert rr.shape == vv.shape == (len(tofs), 3)
+    assert rr.flags.c_contiguous and vv.flags.c_contiguous
+    for i, tof in enumerate(tofs):
+        f, g, fdot, gdot = vallado(k, r0, v0, tof, 350)
+        assert_allclose(rr[i], f * r0 + g * v0, rtol=1e-7)
+        assert_allclose(vv[i], fdot * r0 + gdot * v0, rtol=1e-7)
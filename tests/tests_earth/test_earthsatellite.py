@@ -3,6 +3,8 @@ import numpy as np
 import pytest
 
 from boinor.bodies import Earth, Mars
+from boinor.core.force_model import ForceModel
+from boinor.core.perturbations import J2_perturbation
 from boinor.earth import EarthSatellite
 from boinor.earth.enums import EarthGravity
 from boinor.spacecraft import Spacecraft
@@ -58,3 +60,23 @@ def test_propagate_instance():
     assert isinstance(orbit_with_j2, EarthSatellite)
     # assert isinstance(orbit_with_atmosphere_and_j2, EarthSatellite)
     assert isinstance(orbit_without_perturbation, EarthSatellite)
+
+
+def test_propagate_with_force_model_adds_gravity():
+    orb0 = Orbit.circular(Earth, 500 * u.km, inc=45 * u.deg)
+    spacecraft = Spacecraft(
+        ((np.pi / 4.0) * (u.m**2)).to(u.km**2), 2.2 * u.one, 100 * u.kg
+    )
+    earth_satellite = EarthSatellite(orb0, spacecraft)
+    model = ForceModel().add(
+        J2_perturbation, J2=Earth.J2.value, R=Earth.R.to_value(u.km)
+    )
+
+    with_model = earth_satellite.propagate(1 * u.h, force_model=model)
+    with_gravity = earth_satellite.propagate(1 * u.h, gravity=EarthGravity.J2)
+
+    np.testing.assert_allclose(
+        with_model.orbit.r.to_value(u.km),
+        with_gravity.orbit.r.to_value(u.km),
+        rtol=1e-10,
+    )
@@ -1,9 +1,10 @@
 from astropy import units as u
 from astropy.tests.helper import assert_quantity_allclose
+import numpy as np
 import pytest
 
 from boinor.bodies import Venus
-from boinor.threebody.flybys import compute_flyby
+from boinor.threebody.flybys import compute_flyby, powered_flyby
 
 
 @pytest.mark.parametrize(
@@ -29,3 +30,42 @@ def test_flyby_curtis(theta, expected_V_2_v):
         V_2_v, expected_V_2_v, rtol=1e-3, atol=1e-15 * u.km / u.s
     )
     assert_quantity_allclose(delta, expected_delta, rtol=1e-3)
+
+
+@pytest.mark.parametrize("theta", [0 * u.deg, 180 * u.deg])
+def test_powered_flyby_of_unpowered_flyby_needs_no_impulse(theta):
+    r_p = Venus.R + 300 * u.km
+    V_1_v = [37.51, 2.782, 0] * u.km / u.s
+    V = [35.02, 0, 0] * u.km / u.s
+    V_2_v, _ = compute_flyby(V_1_v, V, Venus.k, r_p, theta)
+
+    dv, r_p_flyby = powered_flyby(V_1_v - V, V_2_v - V, Venus.k, Venus.R)
+
+    assert_quantity_allclose(dv, 0 * u.km / u.s, atol=1e-10 * u.km / u.s)
+    assert_quantity_allclose(r_p_flyby, r_p, rtol=1e-8)
+
+
+def test_powered_flyby_impulse_matches_periapsis_speeds():
+    v_inf_in = [3, 0, 0] * u.km / u.s
+    v_inf_out = [4 * np.cos(1), 4 * np.sin(1), 0] * u.km / u.s
+
+    dv, r_p = powered_flyby(v_inf_in, v_inf_out, Venus.k, Venus.R)
+
+    ecc_in = 1 + r_p * (3 * u.km / u.s) ** 2 / Venus.k
+    ecc_out = 1 + r_p * (4 * u.km / u.s) ** 2 / Venus.k
+    assert r_p > Venus.R
+    assert_quantity_allclose(
+        np.arcsin(1 / ecc_in) + np.arcsin(1 / ecc_out), 1 * u.rad
+    )
+    assert_quantity_allclose(
+        dv,
+        np.sqrt((4 * u.km / u.s) ** 2 + 2 * Venus.k / r_p)
+        - np.sqrt((3 * u.km / u.s) ** 2 + 2 * Venus.k / r_p),
+    )
+
+
+def test_powered_flyby_raises_if_turn_is_too_large():
+    v_inf_in = [10, 0, 0] * u.km / u.s
+
+    with pytest.raises(ValueError, match="cannot turn"):
+        powered_flyby(v_inf_in, -v_inf_in, Venus.k, Venus.R)
@@ -1,13 +1,21 @@
+from unittest import mock
+
 from astropy import units as u
+from astropy.coordinates import (
+    get_body_barycentric,
+    get_body_barycentric_posvel,
+)
 from astropy.tests.helper import assert_quantity_allclose
 from astropy.time import Time
 import numpy as np
 from numpy.linalg import norm
+from numpy.testing import assert_allclose
 import pytest
 
+from boinor._math.ivp import solve_ivp
 from boinor.bodies import Earth
 from boinor.constants import H0_earth, rho0_earth
-from boinor.core.events import line_of_sight
+from boinor.core.events import event_values, line_of_sight
 from boinor.core.perturbations import atmospheric_drag_exponential
 from boinor.core.propagation import func_twobody
 from boinor.twobody import Orbit
@@ -19,8 +27,12 @@ from boinor.twobody.events import (
     NodeCrossEvent,
     PenumbraEvent,
     UmbraEvent,
+    compile_events,
+    find_events,
 )
-from boinor.twobody.propagation import CowellPropagator
+from boinor.twobody.orbit.array import OrbitArray
+from boinor.twobody.propagation import CowellPropagator, J2SecularPropagator
+from boinor.twobody.sampling import EpochsArray
 
 
 @pytest.mark.slow
@@ -85,7 +97,8 @@ def test_altitude_cross_not_happening_is_ok():
     assert altitude_cross_event.last_t == tofs[-1]
 
 
-def test_latitude_cross_event():
+@pytest.mark.parametrize("engine", ["scipy", "numba"])
+def test_latitude_cross_event(engine):
     r = [-6142438.668, 3492467.56, -25767.257] << u.km
     v = [505.848, 942.781, 7435.922] << u.km / u.s
     orbit = Orbit.from_vectors(Earth, r, v)
@@ -96,7 +109,7 @@ def test_latitude_cross_event():
 
     tofs = [5] * u.d
 
-    method = CowellPropagator(events=[latitude_cross_event])
+    method = CowellPropagator(events=[latitude_cross_event], engine=engine)
     rr, _ = method.propagate_many(
         orbit._state,
         tofs,
@@ -140,7 +153,8 @@ def test_umbra_event_not_triggering_is_ok():
     assert umbra_event.last_t == tof
 
 
-def test_umbra_event_crossing():
+@pytest.mark.parametrize("engine", ["scipy", "numba"])
+def test_umbra_event_crossing(engine):
     expected_umbra_t = Time(
         "2020-01-01 00:04:51.328", scale="utc"
     )  # From Orekit.
@@ -160,7 +174,7 @@ def test_umbra_event_crossing():
 
     umbra_event = UmbraEvent(orbit, terminal=True)
 
-    method = CowellPropagator(events=[umbra_event])
+    method = CowellPropagator(events=[umbra_event], engine=engine)
     rr, _ = method.propagate_many(
         orbit._state,
         [tof] * u.s,
@@ -169,7 +183,8 @@ def test_umbra_event_crossing():
     assert expected_umbra_t.isclose(epoch + umbra_event.last_t, atol=1 * u.s)
 
 
-def test_penumbra_event_crossing():
+@pytest.mark.parametrize("engine", ["scipy", "numba"])
+def test_penumbra_event_crossing(engine):
     expected_penumbra_t = Time(
         "2020-01-01 00:04:26.060", scale="utc"
     )  # From Orekit.
@@ -188,7 +203,7 @@ def test_penumbra_event_crossing():
     )
 
     penumbra_event = PenumbraEvent(orbit, terminal=True)
-    method = CowellPropagator(events=[penumbra_event])
+    method = CowellPropagator(events=[penumbra_event], engine=engine)
     rr, _ = method.propagate_many(
         orbit._state,
         [tof] * u.s,
@@ -199,7 +214,37 @@ def test_penumbra_event_crossing():
     )
 
 
-def test_node_cross_event():
+@pytest.mark.parametrize("event_class", [PenumbraEvent, UmbraEvent])
+def test_eclipse_event_fits_secondary_body_positions_once(event_class):
+    epoch = Time("2020-01-01", scale="utc")
+    orbit = Orbit.circular(Earth, 500 * u.km, inc=87 * u.deg, epoch=epoch)
+    event = event_class(orbit)
+
+    with mock.patch(
+        "boinor.twobody.events.get_body_barycentric",
+        wraps=get_body_barycentric,
+    ) as get_body_barycentric_mock:
+        CowellPropagator(events=[event]).propagate_many(
+            orbit._state, [0.5] * u.d
+        )
+
+    # One fit for the primary and the secondary bodies
+    assert get_body_barycentric_mock.call_count == 2
+
+    t = 12345.0
+    (r_primary, _), (r_secondary, _) = (
+        get_body_barycentric_posvel(body.name, epoch + t * u.s)
+        for body in (Earth, Earth.parent)
+    )
+    assert_quantity_allclose(
+        super(event_class, event).__call__(t, None, None) << u.km,
+        (r_secondary - r_primary).xyz,
+        atol=1 * u.m,
+    )
+
+
+@pytest.mark.parametrize("engine", ["scipy", "numba"])
+def test_node_cross_event(engine):
     t_node = 3.46524036 * u.s
     r = [-6142438.668, 3492467.56, -25767.257] << u.km
     v = [505.848, 942.781, 7435.922] << u.km / u.s
@@ -207,7 +252,7 @@ def test_node_cross_event():
 
     node_event = NodeCrossEvent(terminal=True)
     tofs = [0.01, 0.1, 0.5, 0.8, 1, 3, 5, 6, 10, 15] << u.s
-    method = CowellPropagator(events=[node_event])
+    method = CowellPropagator(events=[node_event], engine=engine)
     rr, vv = method.propagate_many(
         orbit._state,
         tofs,
@@ -291,8 +336,9 @@ def test_orbit_propagation_position_vector_does_not_repeat_if_events_terminal_is
         (False, False, 6, 500 * u.s),
     ],
 )
+@pytest.mark.parametrize("engine", ["scipy", "numba"])
 def test_propagation_stops_if_atleast_one_event_has_terminal_set_to_True(
-    latitude_terminal, penumbra_terminal, rr_length, t_end
+    latitude_terminal, penumbra_terminal, rr_length, t_end, engine
 ):
     # Penumbra occurs at 266.15058s and latitude event occurs at 305.65173s.
     # `terminals` is for latitude event and penumbra event, in that order.
@@ -318,7 +364,7 @@ def test_propagation_stops_if_atleast_one_event_has_terminal_set_to_True(
     )
     events = [penumbra_event, latitude_cross_event]
 
-    method = CowellPropagator(events=events)
+    method = CowellPropagator(events=events, engine=engine)
     rr, _ = method.propagate_many(
         orbit._state,
         tofs,
@@ -352,22 +398,13 @@ def test_LOS_event_raises_warning_if_norm_of_r1_less_than_attractor_radius_durin
     v2 = np.array([5021.38, -2900.7, 1000.354]) << u.km / u.s
     orbit = Orbit.from_vectors(Earth, r2, v2)
 
-    tofs = [100, 500, 1000, 2000] << u.s
-    # Propagate the secondary body to generate its position coordinates
-    method = CowellPropagator()
-    rr, vv = method.propagate_many(
-        orbit._state,
-        tofs,
-    )
-    pos_coords = rr  # Trajectory of the secondary body.
-
     r1 = (
         np.array([0, -5010.696, -5102.509]) << u.km
     )  # This position vectors' norm gets less than attractor radius.
     v1 = np.array([736.138, 29899.7, 164.354]) << u.km / u.s
     orb = Orbit.from_vectors(Earth, r1, v1)
 
-    los_event = LosEvent(Earth, pos_coords, terminal=True)
+    los_event = LosEvent(orb, orbit, terminal=True)
     events = [los_event]
     tofs = [0.01, 0.02, 0.03, 0.04, 0.05, 0.06, 0.07, 0.5] << u.s
 
@@ -385,20 +422,11 @@ def test_LOS_event_with_lithobrake_event_raises_warning_when_satellite_cuts_attr
     v2 = np.array([5021.38, -2900.7, 1000.354]) << u.km / u.s
     orbit = Orbit.from_vectors(Earth, r2, v2)
 
-    tofs = [100, 500, 1000, 2000] << u.s
-    # Propagate the secondary body to generate its position coordinates
-    method = CowellPropagator()
-    rr, vv = method.propagate_many(
-        orbit._state,
-        tofs,
-    )
-    pos_coords = rr  # Trajectory of the secondary body.
-
     r1 = np.array([0, -5010.696, -5102.509]) << u.km
     v1 = np.array([736.138, 2989.7, 164.354]) << u.km / u.s
     orb = Orbit.from_vectors(Earth, r1, v1)
 
-    los_event = LosEvent(Earth, pos_coords, terminal=True)
+    los_event = LosEvent(orb, orbit, terminal=True)
     tofs = [
         0.003,
         0.004,
@@ -425,21 +453,8 @@ def test_LOS_event_with_lithobrake_event_raises_warning_when_satellite_cuts_attr
     assert lithobrake_event.last_t < los_event.last_t
 
 
-def test_LOS_event():
-    t_los = 2327.165 * u.s
-    r2 = np.array([-500, 1500, 4012.09]) << u.km
-    v2 = np.array([5021.38, -2900.7, 1000.354]) << u.km / u.s
-    orbit = Orbit.from_vectors(Earth, r2, v2)
-
-    tofs = [100, 500, 1000, 2000] << u.s
-    # Propagate the secondary body to generate its position coordinates
-    method = CowellPropagator()
-    rr, vv = method.propagate_many(
-        orbit._state,
-        tofs,
-    )
-    pos_coords = rr  # Trajectory of the secondary body.
-
+def _los_orbits():
+    epoch = Time("2020-01-01", scale="utc")
     orb = Orbit.from_classical(
         attractor=Earth,
         a=16000 * u.km,
@@ -448,16 +463,312 @@ def test_LOS_event():
         raan=5 * u.deg,
         argp=10 * u.deg,
         nu=30 * u.deg,
+        epoch=epoch,
+    )
+    # The other satellite is given at a different epoch
+    other = Orbit.from_classical(
+        attractor=Earth,
+        a=7000 * u.km,
+        ecc=0.01 * u.one,
+        inc=60 * u.deg,
+        raan=0 * u.deg,
+        argp=0 * u.deg,
+        nu=0 * u.deg,
+        epoch=epoch - 10 * u.min,
     )
+    return orb, other
 
-    los_event = LosEvent(Earth, pos_coords, terminal=True)
-    events = [los_event]
-    tofs = [1, 5, 10, 100, 1000, 2000, 3000, 5000] << u.s
 
-    method = CowellPropagator(events=events)
-    r, v = method.propagate_many(
-        orb._state,
-        tofs,
+def _first_los_change(orb, other, tofs):
+    R = Earth.R.to_value(u.km)
+    los = [
+        line_of_sight(
+            orb.propagate(tof).r.to_value(u.km),
+            other.propagate(orb.epoch + tof).r.to_value(u.km),
+            R,
+        )
+        for tof in tofs
+    ]
+    (changes,) = np.nonzero(np.diff(np.sign(los)))
+    return tofs[changes[0]], tofs[changes[0] + 1]
+
+
+@pytest.mark.parametrize("engine", ["scipy", "numba"])
+def test_LOS_event(engine):
+    orb, other = _los_orbits()
+    t_before, t_after = _first_los_change(
+        orb, other, np.linspace(0, 5000, 501) << u.s
+    )
+
+    los_event = LosEvent(orb, other, terminal=True)
+    method = CowellPropagator(events=[los_event], engine=engine)
+    method.propagate_many(orb._state, [1000, 5000] << u.s)
+
+    # The crossing is the one of the propagated positions at that time
+    assert t_before < los_event.last_t < t_after
+    tof = los_event.last_t
+    assert_allclose(
+        line_of_sight(
+            orb.propagate(tof).r.to_value(u.km),
+            other.propagate(orb.epoch + tof).r.to_value(u.km),
+            Earth.R.to_value(u.km),
+        ),
+        0,
+        atol=1e-3,
     )
 
-    assert_quantity_allclose(los_event.last_t, t_los)
+
+def test_LOS_event_with_ephem_agrees_with_orbit():
+    orb, other = _los_orbits()
+    ephem = other.to_ephem(
+        EpochsArray(orb.epoch + np.linspace(-100, 5100, 521) * u.s)
+    )
+
+    events = [LosEvent(orb, other), LosEvent(orb, ephem)]
+    CowellPropagator(events=events).propagate(orb._state, 5000 * u.s)
+
+    assert events[0]._bounds is not None
+    assert_allclose(
+        events[1]._position(1234.5), events[0]._position(1234.5), rtol=1e-6
+    )
+
+
+def test_LOS_event_raises_if_ephem_does_not_cover_propagation():
+    orb, other = _los_orbits()
+    ephem = other.to_ephem(
+        EpochsArray(orb.epoch + np.linspace(0, 1000, 101) * u.s)
+    )
+    los_event = LosEvent(orb, ephem)
+
+    with pytest.raises(ValueError, match="only known between"):
+        compile_events([los_event], 0.0, 2000.0)
+
+
+def test_LOS_event_raises_for_positions_without_epochs():
+    orb, _ = _los_orbits()
+    r = np.array([-500, 1500, 4012.09]) << u.km
+
+    with pytest.raises(ValueError, match="Orbit or an Ephem"):
+        LosEvent(orb, [r.value] << u.km)
+
+
+def test_compiled_events_agree_with_event_functions():
+    epoch = Time("2020-01-01", scale="utc")
+    orbit = Orbit.from_classical(
+        attractor=Earth,
+        a=6828137.0 * u.m,
+        ecc=0.0073 * u.one,
+        inc=87.0 * u.deg,
+        raan=20.0 * u.deg,
+        argp=10.0 * u.deg,
+        nu=0 * u.deg,
+        epoch=epoch,
+    )
+    R = Earth.R.to_value(u.km)
+    events = [
+        AltitudeCrossEvent(460, R, terminal=False, direction=0),
+        LatitudeCrossEvent(orbit, 30 * u.deg),
+        NodeCrossEvent(),
+        PenumbraEvent(orbit),
+        UmbraEvent(orbit),
+    ]
+    compiled = compile_events(events, 0.0, 2 * 86400.0)
+    k = Earth.k.to_value(u.km**3 / u.s**2)
+    r, v = orbit.rv()
+    u_ = np.concatenate([r.to_value(u.km), v.to_value(u.km / u.s)])
+
+    for t in [0.0, 1234.5, 86400.0, 150000.0]:
+        expected = [event(t, u_, k) for event in events]
+        assert_allclose(
+            event_values(t, u_, k, *compiled.g_args(k)[1:]),
+            expected,
+            rtol=1e-10,
+        )
+
+
+def test_compiled_events_find_same_crossings_as_scipy():
+    epoch = Time("2020-01-01", scale="utc")
+    orbit = Orbit.from_classical(
+        attractor=Earth,
+        a=6828137.0 * u.m,
+        ecc=0.0073 * u.one,
+        inc=87.0 * u.deg,
+        raan=20.0 * u.deg,
+        argp=10.0 * u.deg,
+        nu=0 * u.deg,
+        epoch=epoch,
+    )
+    tof = 6 * u.h
+    events = [
+        LatitudeCrossEvent(orbit, 30 * u.deg),
+        NodeCrossEvent(direction=1),
+        UmbraEvent(orbit),
+    ]
+    k = Earth.k.to_value(u.km**3 / u.s**2)
+    r, v = orbit.rv()
+    u0 = np.concatenate([r.to_value(u.km), v.to_value(u.km / u.s)])
+
+    expected = solve_ivp(
+        func_twobody,
+        (0, tof.to_value(u.s)),
+        u0,
+        args=(k,),
+        rtol=1e-11,
+        atol=1e-12,
+        method="DOP853",
+        events=events,
+    ).t_events
+
+    compiled = []
+
+    def spy(*args):
+        compiled.append(compile_events(*args))
+        return compiled[-1]
+
+    with mock.patch("boinor.twobody.propagation.cowell.compile_events", spy):
+        CowellPropagator(events=events, engine="numba").propagate(
+            orbit._state, tof
+        )
+    (compiled,) = compiled
+
+    for t_events, expected_t_events in zip(compiled.t_events, expected):
+        assert len(t_events) == len(expected_t_events) > 0
+        assert_allclose(t_events, expected_t_events, rtol=1e-9)
+    for event in events:
+        assert_quantity_allclose(event.last_t, tof)
+
+
+def test_compile_events_raises_for_unsupported_event():
+    class ApsisEvent(AltitudeCrossEvent):
+        def _compile(self, t_min, t_max):
+            return super(AltitudeCrossEvent, self)._compile(t_min, t_max)
+
+    with pytest.raises(ValueError, match="ApsisEvent does not support"):
+        compile_events([ApsisEvent(0, 0)], 0.0, 100.0)
+
+
+def _access_orbit(epoch):
+    return Orbit.from_classical(
+        attractor=Earth,
+        a=7000 * u.km,
+        ecc=0.05 * u.one,
+        inc=60 * u.deg,
+        raan=10 * u.deg,
+        argp=20 * u.deg,
+        nu=0 * u.deg,
+        epoch=epoch,
+    )
+
+
+def test_find_events_agrees_with_integrated_crossings():
+    epoch = Time("2020-01-01", scale="utc")
+    orbit = _access_orbit(epoch)
+    R = Earth.R.to_value(u.km)
+
+    def make_events():
+        return [
+            NodeCrossEvent(),
+            AltitudeCrossEvent(600, R, terminal=False, direction=0),
+            LatitudeCrossEvent(orbit, 30 * u.deg),
+            UmbraEvent(orbit),
+        ]
+
+    k = Earth.k.to_value(u.km**3 / u.s**2)
+    r, v = orbit.rv()
+    u0 = np.concatenate([r.to_value(u.km), v.to_value(u.km / u.s)])
+    expected = solve_ivp(
+        func_twobody,
+        (0, 6 * 3600),
+        u0,
+        args=(k,),
+        rtol=1e-12,
+        atol=1e-12,
+        method="DOP853",
+        events=make_events(),
+    ).t_events
+
+    crossings = find_events(
+        OrbitArray.from_orbits([orbit]), make_events(), epoch, epoch + 6 * u.h
+    )
+
+    for (orbit_indices, t_events), expected_t_events in zip(
+        crossings, expected
+    ):
+        assert len(t_events) == len(expected_t_events) > 0
+        assert np.all(orbit_indices == 0)
+        assert_quantity_allclose(
+            t_events, expected_t_events * u.s, atol=1e-6 * u.s
+        )
+
+
+def test_find_events_with_j2_finds_nodes_of_secular_propagation():
+    epoch = Time("2020-01-01", scale="utc")
+    orbits = OrbitArray.from_orbits(
+        [
+            _access_orbit(epoch),
+            _access_orbit(epoch - 1 * u.h),
+        ]
+    )
+    end = epoch + 2 * u.day
+
+    ((orbit_indices, t_events),) = find_events(
+        orbits, [NodeCrossEvent(direction=1)], epoch, end, J2=Earth.J2
+    )
+
+    method = J2SecularPropagator()
+    for i in range(len(orbits)):
+        tofs = t_events[orbit_indices == i] + (epoch - orbits.epochs[i]).to(
+            u.s
+        )
+        rr, _ = method.propagate_many(orbits[i]._state, tofs)
+        assert_quantity_allclose(rr[:, 2], 0 * u.km, atol=1e-6 * u.km)
+
+        # One ascending node per revolution
+        z = (
+            method.propagate_many(
+                orbits[i]._state,
+                np.linspace(0, 2 * 86400, 5001) * u.s
+                + (epoch - orbits.epochs[i]).to(u.s),
+            )[0][:, 2]
+        ).value
+        assert len(tofs) == np.sum((z[:-1] < 0) & (z[1:] >= 0))
+
+
+def test_find_events_stops_each_orbit_at_terminal_event():
+    epoch = Time("2020-01-01", scale="utc")
+    orbits = OrbitArray.from_orbits(
+        [_access_orbit(epoch), _access_orbit(epoch + 30 * u.min)]
+    )
+    events = [
+        NodeCrossEvent(),
+        LatitudeCrossEvent(orbits[0], 30 * u.deg, terminal=True, direction=-1),
+    ]
+
+    (node_indices, node_t), (lat_indices, lat_t) = find_events(
+        orbits, events, epoch, epoch + 1 * u.day
+    )
+
+    assert_quantity_allclose(lat_t[1] - lat_t[0], 30 * u.min)
+    assert list(lat_indices) == [0, 1]
+    assert len(node_t) > 0
+    for i in range(len(orbits)):
+        assert np.all(node_t[node_indices == i] <= lat_t[i])
+
+
+def test_find_events_j2_raises_for_hyperbolic_orbits():
+    epoch = Time("2020-01-01", scale="utc")
+    orbits = OrbitArray.from_classical(
+        Earth,
+        [7000, -7000] * u.km,
+        [0.1, 1.5] * u.one,
+        [0, 0] * u.deg,
+        [0, 0] * u.deg,
+        [0, 0] * u.deg,
+        [0, 0] * u.deg,
+        epochs=epoch,
+    )
+
+    with pytest.raises(ValueError, match="only support elliptic orbits"):
+        find_events(
+            orbits, [NodeCrossEvent()], epoch, epoch + 1 * u.h, J2=Earth.J2
+        )
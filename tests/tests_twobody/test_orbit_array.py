@@ -0,0 +1,276 @@
+from astropy import units as u
+from astropy.tests.helper import assert_quantity_allclose
+from astropy.time import Time
+import numpy as np
+from numpy.testing import assert_allclose
+import pytest
+
+from boinor.bodies import Earth, Sun
+from boinor.examples import iss, molniya
+from boinor.frames import Planes
+from boinor.twobody import Orbit, OrbitArray
+from boinor.twobody.propagation import (
+    AutoPropagator,
+    CowellPropagator,
+    EnckePropagator,
+    FarnocchiaPropagator,
+    J2SecularPropagator,
+    ValladoPropagator,
+)
+from boinor.twobody.sampling import EpochsArray
+from boinor.twobody.states import ClassicalStateArray, RVStateArray
+
+
+@pytest.fixture()
+def orbits():
+    return [
+        iss,
+        molniya,
+        Orbit.from_classical(
+            Earth,
+            -10000 * u.km,
+            1.5 * u.one,
+            10 * u.deg,
+            20 * u.deg,
+            30 * u.deg,
+            0 * u.deg,
+            epoch=iss.epoch + 1 * u.h,
+        ),
+    ]
+
+
+def test_orbit_array_from_orbits_keeps_elements(orbits):
+    array = OrbitArray.from_orbits(orbits)
+
+    assert len(array) == 3
+    assert array.attractor == Earth
+    assert array.plane == Planes.EARTH_EQUATOR
+    for i, orbit in enumerate(orbits):
+        assert_quantity_allclose(array.r[i], orbit.r)
+        assert_quantity_allclose(array.v[i], orbit.v)
+        assert_quantity_allclose(array.ecc[i], orbit.ecc)
+        assert_quantity_allclose(array.nu[i], orbit.nu, atol=1e-12 * u.rad)
+        assert (array.epochs[i] - orbit.epoch).to_value(u.s) == pytest.approx(
+            0, abs=1e-6
+        )
+
+
+def test_orbit_array_from_orbits_raises_for_different_attractors():
+    orbit = Orbit.circular(Sun, 1e6 * u.km)
+
+    with pytest.raises(ValueError, match="same attractor and plane"):
+        OrbitArray.from_orbits([iss, orbit])
+
+
+def test_orbit_array_from_classical_matches_scalar_orbits():
+    a = [7000, 8000, 9000] * u.km
+    ecc = [0.0, 0.1, 0.2] * u.one
+    inc = [10, 20, 30] * u.deg
+    array = OrbitArray.from_classical(
+        Earth, a, ecc, inc, 0 * u.deg, 0 * u.deg, 190 * u.deg
+    )
+
+    assert isinstance(array._state, ClassicalStateArray)
+    for i in range(3):
+        expected = Orbit.from_classical(
+            Earth, a[i], ecc[i], inc[i], 0 * u.deg, 0 * u.deg, -170 * u.deg
+        )
+        assert_quantity_allclose(array[i].r, expected.r)
+        assert_quantity_allclose(array.a[i], expected.a)
+
+
+@pytest.mark.parametrize(
+    "r, v",
+    [
+        ([1, 0, 0] * u.km, [0, 1, 0] * u.km / u.s),
+        ([[1, 0, 0]] * u.km, [[0, 1, 0], [0, 1, 0]] * u.km / u.s),
+    ],
+)
+def test_orbit_array_from_vectors_raises_for_wrong_shapes(r, v):
+    with pytest.raises(ValueError, match="shape"):
+        OrbitArray.from_vectors(Earth, r, v)
+
+
+def test_orbit_array_raises_for_wrong_number_of_epochs():
+    r = [[7000, 0, 0], [8000, 0, 0]] * u.km
+    v = [[0, 7.5, 0], [0, 7, 0]] * u.km / u.s
+    epochs = Time(["2020-01-01", "2020-01-02", "2020-01-03"], scale="tdb")
+
+    with pytest.raises(ValueError, match="Expected 2 epochs"):
+        OrbitArray.from_vectors(Earth, r, v, epochs)
+
+
+def test_orbit_array_conversions_roundtrip(orbits):
+    array = OrbitArray.from_orbits(orbits)
+
+    classical = array.to_classical()
+    vectors = classical.to_vectors()
+
+    assert isinstance(classical._state, ClassicalStateArray)
+    assert isinstance(vectors._state, RVStateArray)
+    assert_quantity_allclose(vectors.r, array.r, rtol=1e-10)
+    assert_quantity_allclose(vectors.v, array.v, rtol=1e-10)
+
+
+def test_orbit_array_getitem(orbits):
+    array = OrbitArray.from_orbits(orbits)
+
+    assert isinstance(array[1], Orbit)
+    assert_quantity_allclose(array[1].r, orbits[1].r)
+    assert len(array[1:]) == 2
+    assert len(array[array.ecc < 1]) == 2
+    assert len(list(array)) == 3
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        1 * u.h,
+        [1, 2, 3] * u.h,
+    ],
+)
+def test_orbit_array_propagate_matches_scalar_orbits(orbits, value):
+    array = OrbitArray.from_orbits(orbits)
+
+    propagated = array.propagate(value)
+
+    for i, orbit in enumerate(orbits):
+        expected = orbit.propagate(value if value.isscalar else value[i])
+        assert_quantity_allclose(propagated[i].r, expected.r, rtol=1e-10)
+        assert_quantity_allclose(propagated[i].v, expected.v, rtol=1e-10)
+        assert (propagated.epochs[i] - expected.epoch).to_value(
+            u.s
+        ) == pytest.approx(0, abs=1e-6)
+
+
+def test_orbit_array_propagate_to_common_epoch(orbits):
+    array = OrbitArray.from_orbits(orbits)
+    epoch = iss.epoch + 2 * u.h
+
+    propagated = array.propagate(epoch)
+
+    assert_allclose((propagated.epochs - epoch).to_value(u.s), 0, atol=1e-6)
+    for i, orbit in enumerate(orbits):
+        assert_quantity_allclose(
+            propagated[i].r, orbit.propagate(epoch).r, rtol=1e-10
+        )
+
+
+def test_orbit_array_to_ephem_matches_scalar_orbits(orbits):
+    array = OrbitArray.from_orbits(orbits)
+    epochs = iss.epoch + np.linspace(0, 3, num=7) * u.h
+
+    ephems = array.to_ephem(epochs)
+
+    assert len(ephems) == 3
+    for ephem, orbit in zip(ephems, orbits):
+        expected = orbit.to_ephem(EpochsArray(epochs))
+        r, v = ephem.rv()
+        expected_r, expected_v = expected.rv()
+        assert_quantity_allclose(r, expected_r, rtol=1e-10)
+        assert_quantity_allclose(v, expected_v, rtol=1e-10)
+
+
+@pytest.mark.parametrize(
+    "method", [FarnocchiaPropagator(), ValladoPropagator()]
+)
+def test_orbit_array_to_grid_matches_scalar_orbits(orbits, method):
+    array = OrbitArray.from_orbits(orbits)
+    epochs = iss.epoch + np.linspace(0, 5, num=11) * u.h
+    out = np.empty((3, 11, 6))
+
+    values = array.to_grid(epochs, out=out, method=method)
+
+    assert values is out
+    for i, orbit in enumerate(orbits):
+        rr, vv = method.propagate_many(orbit._state, epochs - orbit.epoch)
+        assert_allclose(values[i, :, :3], rr.to_value(u.km), rtol=1e-9)
+        assert_allclose(values[i, :, 3:], vv.to_value(u.km / u.s), rtol=1e-9)
+
+
+def test_orbit_array_auto_grid_matches_farnocchia(orbits):
+    array = OrbitArray.from_orbits(orbits)
+    epochs = iss.epoch + np.linspace(0, 5, num=11) * u.h
+
+    values = array.to_grid(epochs, method=AutoPropagator())
+    expected = array.to_grid(epochs, method=FarnocchiaPropagator())
+
+    assert_allclose(values, expected, rtol=1e-7)
+
+
+def test_orbit_array_to_grid_raises_for_wrong_buffer(orbits):
+    array = OrbitArray.from_orbits(orbits)
+    epochs = iss.epoch + np.linspace(0, 5, num=11) * u.h
+
+    with pytest.raises(ValueError, match="shape"):
+        array.to_grid(epochs, out=np.empty((3, 10, 6)))
+
+
+def test_orbit_array_iter_grid_reuses_buffer(orbits):
+    array = OrbitArray.from_orbits(orbits * 3)
+    epochs = iss.epoch + np.linspace(0, 5, num=11) * u.h
+    expected = array.to_grid(epochs)
+    out = np.empty((4, 11, 6))
+
+    starts = []
+    for start, values in array.iter_grid(epochs, 4, out=out):
+        assert np.shares_memory(values, out)
+        assert_allclose(values, expected[start : start + len(values)])
+        starts.append(start)
+
+    assert starts == [0, 4, 8]
+
+
+def test_orbit_array_cowell_batch_agrees_with_scalar_cowell(orbits):
+    array = OrbitArray.from_orbits(orbits)
+    tofs = np.linspace(0, 5, num=11) * u.h
+    method = CowellPropagator()
+
+    rrs, vvs = method.propagate_batch(array._state, tofs)
+
+    assert rrs.shape == vvs.shape == (3, 11, 3)
+    for i, orbit in enumerate(orbits):
+        expected_rr, expected_vv = method.propagate_many(orbit._state, tofs)
+        assert_quantity_allclose(rrs[i], expected_rr, rtol=1e-10)
+        assert_quantity_allclose(vvs[i], expected_vv, rtol=1e-10)
+
+
+@pytest.mark.parametrize("method", [CowellPropagator(), EnckePropagator()])
+def test_orbit_array_grid_integrates_backwards(orbits, method):
+    array = OrbitArray.from_orbits([orbits[0], orbits[2]])
+    epochs = iss.epoch + np.linspace(0, 5, num=11) * u.h
+
+    values = array.to_grid(epochs, method=method)
+    expected = array.to_grid(epochs)
+
+    # The epoch of the last orbit is in the middle of the grid
+    assert_allclose(values, expected, rtol=1e-7)
+
+
+def test_orbit_array_j2_secular_matches_scalar_orbits(orbits):
+    array = OrbitArray.from_orbits(orbits[:2])
+    method = J2SecularPropagator()
+    epochs = iss.epoch + [0, 30] * u.day
+
+    new_array = array.propagate(30 * u.day, method=method)
+    values = array.to_grid(epochs, method=method)
+
+    for i, orbit in enumerate(orbits[:2]):
+        expected = orbit.propagate(30 * u.day, method=method)
+        assert_quantity_allclose(new_array.r[i], expected.r, rtol=1e-7)
+        assert_quantity_allclose(new_array.v[i], expected.v, rtol=1e-7)
+
+        expected = orbit.propagate(epochs[-1], method=method)
+        assert_allclose(
+            values[i, -1, :3], expected.r.to_value(u.km), rtol=1e-7
+        )
+        assert_allclose(
+            values[i, -1, 3:], expected.v.to_value(u.km / u.s), rtol=1e-7
+        )
+
+
+def test_orbit_array_j2_secular_raises_for_hyperbolic_orbits(orbits):
+    array = OrbitArray.from_orbits(orbits)
+
+    with pytest.raises(ValueError, match="elliptic"):
+        array.propagate(1 * u.day, method=J2SecularPropagator())
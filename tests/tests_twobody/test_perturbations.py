@@ -4,13 +4,16 @@ from astropy import units as u
 from astropy.coordinates import Angle
 from astropy.tests.helper import assert_quantity_allclose
 from astropy.time import Time
+from numba import njit as jit
 import numpy as np
 from numpy.linalg import norm
+from numpy.testing import assert_allclose
 import pytest
 
 from boinor.bodies import Earth, Moon, Sun
 from boinor.constants import H0_earth, Wdivc_sun, rho0_earth
 from boinor.core.elements import rv2coe
+from boinor.core.force_model import ForceModel
 from boinor.core.perturbations import (
     J2_perturbation,
     J3_perturbation,
@@ -716,3 +719,83 @@ def test_solar_pressure(t_days, deltas_expected, sun_r):
         rtol=1e0,  # TODO: Excessively low, rewrite test?
         atol=1e-4,
     )
+
+
+def test_force_model_agrees_with_python_function():
+    orbit = Orbit.circular(Earth, 250 * u.km, inc=30 * u.deg)
+    tofs = [0.5, 1, 2] * u.h
+    R = Earth.R.to_value(u.km)
+    drag_params = dict(
+        R=R, C_D=2.2, A_over_m=1e-9, H0=H0_earth.to_value(u.km), rho0=1e-2
+    )
+
+    def f(t0, u_, k):
+        du_kep = func_twobody(t0, u_, k)
+        ax, ay, az = J2_perturbation(t0, u_, k, J2=Earth.J2.value, R=R)
+        ax, ay, az = np.array([ax, ay, az]) + atmospheric_drag_exponential(
+            t0, u_, k, **drag_params
+        )
+        du_ad = np.array([0, 0, 0, ax, ay, az])
+        return du_kep + du_ad
+
+    model = (
+        ForceModel()
+        .add(J2_perturbation, J2=Earth.J2.value, R=R)
+        .add(atmospheric_drag_exponential, **drag_params)
+    )
+
+    rr, vv = CowellPropagator(f=f).propagate_many(orbit._state, tofs)
+    rr_model, vv_model = CowellPropagator(f=model).propagate_many(
+        orbit._state, tofs
+    )
+
+    assert len(model.perturbations) == 2
+    assert_quantity_allclose(rr_model, rr, rtol=1e-10)
+    assert_quantity_allclose(vv_model, vv, rtol=1e-10)
+
+
+def test_force_model_compiles_third_body_with_jitted_position():
+    k_moon = Moon.k.to_value(u.km**3 / u.s**2)
+
+    @jit
+    def moon_r(t0):
+        return np.array([384400.0, 0.0, 0.0])
+
+    model = ForceModel(
+        [(third_body, {"k_third": k_moon, "perturbation_body": moon_r})]
+    )
+    state = np.array([7000.0, 0, 0, 0, 7.5, 0])
+    k = Earth.k.to_value(u.km**3 / u.s**2)
+
+    expected = func_twobody(0.0, state, k)
+    expected[3:] += third_body(0.0, state, k, k_moon, moon_r)
+
+    assert_allclose(model(0.0, state, k), expected)
+
+
+def test_force_model_reuses_compiled_rhs():
+    R = Earth.R.to_value(u.km)
+    model = ForceModel().add(J2_perturbation, J2=Earth.J2.value, R=R)
+    same = ForceModel().add(J2_perturbation, J2=Earth.J2.value, R=R)
+    other = ForceModel().add(J2_perturbation, J2=2 * Earth.J2.value, R=R)
+    state = np.array([7000.0, 0, 0, 0, 7.5, 0])
+    k = Earth.k.to_value(u.km**3 / u.s**2)
+
+    expected = func_twobody(0.0, state, k)
+    expected[3:] += 2 * J2_perturbation(0.0, state, k, Earth.J2.value, R)
+
+    assert same.f is model.f
+    assert other.f is not model.f
+    assert_allclose(other(0.0, state, k), expected)
+
+
+def test_force_model_raises_for_python_callable_parameter():
+    with pytest.raises(ValueError, match="must be a jitted function"):
+        ForceModel().add(
+            third_body, k_third=1.0, perturbation_body=lambda t0: t0
+        )
+
+
+def test_force_model_raises_for_wrong_parameters():
+    with pytest.raises(ValueError, match="Wrong parameters"):
+        ForceModel().add(J2_perturbation, J2=Earth.J2.value)
@@ -2,6 +2,7 @@ from astropy import time, units as u
 from astropy.coordinates import CartesianRepresentation
 from astropy.tests.helper import assert_quantity_allclose
 from hypothesis import given, settings, strategies as st
+from numba import njit as jit
 import numpy as np
 from numpy.testing import assert_allclose
 import pytest
@@ -10,23 +11,33 @@ from pytest import approx
 from boinor.bodies import Earth, Moon, Sun
 from boinor.constants import J2000
 from boinor.core.elements import rv2coe
+from boinor.core.perturbations import J2_perturbation
 from boinor.core.propagation import func_twobody
-from boinor.examples import iss
+from boinor.core.propagation.ks import ks2rv, rv2ks
+from boinor.examples import iss, molniya
 from boinor.frames import Planes
 from boinor.twobody import Orbit
+from boinor.twobody.elements import heliosynchronous
 from boinor.twobody.propagation import (
     ALL_PROPAGATORS,
     ELLIPTIC_PROPAGATORS,
     HYPERBOLIC_PROPAGATORS,
     PARABOLIC_PROPAGATORS,
+    AutoPropagator,
     CowellPropagator,
     DanbyPropagator,
+    EnckePropagator,
+    EquinoctialPropagator,
     FarnocchiaPropagator,
     GoodingPropagator,
+    J2SecularPropagator,
+    KSPropagator,
     MarkleyPropagator,
     RecseriesPropagator,
     ValladoPropagator,
 )
+from boinor.twobody.propagation.auto import calibrate_cost_table
+from boinor.twobody.sampling import EpochsArray
 from boinor.util import norm
 
 
@@ -122,6 +133,24 @@ def test_propagation(propagator):
     assert_quantity_allclose(v, expected_v, rtol=1e-4)
 
 
+@pytest.mark.parametrize("propagator", ALL_PROPAGATORS)
+def test_propagate_many_agrees_with_propagate(propagator):
+    # Data from Vallado, example 2.4
+    r0 = [1131.340, -2282.343, 6672.423] * u.km
+    v0 = [-5.64305, 4.30333, 2.42879] * u.km / u.s
+    ss0 = Orbit.from_vectors(Earth, r0, v0)
+    tofs = [0, 10, 40, 500, 3000] * u.min
+    method = propagator()
+
+    rrs, vvs = method.propagate_many(ss0._state, tofs)
+
+    assert rrs.shape == vvs.shape == (len(tofs), 3)
+    for tof, r, v in zip(tofs, rrs, vvs):
+        expected = method.propagate(ss0._state, tof).to_vectors()
+        assert_quantity_allclose(r, expected.r, rtol=1e-7)
+        assert_quantity_allclose(v, expected.v, rtol=1e-7)
+
+
 def test_propagating_to_certain_nu_is_correct():
     # Take an elliptic orbit
     a = 1.0 * u.AU
@@ -255,6 +284,23 @@ def test_propagation_hyperbolic_zero_time_returns_same_state():
     assert_quantity_allclose(v, v0, atol=1e-27 * u.km / u.s)
 
 
+def test_vallado_hyperbolic_zero_time_returns_same_state():
+    ss0 = Orbit.from_classical(
+        attractor=Earth,
+        a=-27112.5464 * u.km,
+        ecc=1.25 * u.one,
+        inc=0 * u.deg,
+        raan=0 * u.deg,
+        argp=0 * u.deg,
+        nu=0 * u.deg,
+    )
+
+    ss1 = ss0.propagate(0 * u.s, method=ValladoPropagator())
+
+    assert_quantity_allclose(ss1.r, ss0.r)
+    assert_quantity_allclose(ss1.v, ss0.v)
+
+
 def test_apply_zero_maneuver_returns_equal_state():
     _d = 1.0 * u.AU  # Unused distance
     _ = 0.5 * u.one  # Unused dimensionless value
@@ -323,6 +369,180 @@ def test_cowell_propagation_circle_to_circle():
     assert_quantity_allclose(dv, accel_dt, rtol=1e-2)
 
 
+J2_EARTH = Earth.J2.value
+R_EARTH = Earth.R.to_value(u.km)
+
+
+@jit
+def _f_J2(t0, u_, k):
+    du_kep = func_twobody(t0, u_, k)
+    ax, ay, az = J2_perturbation(t0, u_, k, J2=J2_EARTH, R=R_EARTH)
+    return du_kep + np.array([0, 0, 0, ax, ay, az])
+
+
+@pytest.mark.parametrize("f", [func_twobody, _f_J2])
+def test_cowell_numba_engine_agrees_with_scipy(f):
+    tofs = np.linspace(-1, 3, num=9) * molniya.period
+
+    rrs, vvs = CowellPropagator(f=f).propagate_many(molniya._state, tofs)
+    rrs_numba, vvs_numba = CowellPropagator(
+        f=f, engine="numba"
+    ).propagate_many(molniya._state, tofs)
+
+    assert_quantity_allclose(rrs_numba, rrs, rtol=1e-10)
+    assert_quantity_allclose(vvs_numba, vvs, rtol=1e-10)
+
+
+def test_cowell_numba_engine_raises_for_python_function():
+    def f(t0, u_, k):
+        return func_twobody(t0, u_, k)
+
+    with pytest.raises(ValueError, match="jitted"):
+        iss.propagate(1 * u.h, method=CowellPropagator(f=f, engine="numba"))
+
+
+@pytest.mark.parametrize("orbit", [iss, molniya])
+def test_encke_agrees_with_cowell(orbit):
+    tofs = np.linspace(0, 5, num=11) * orbit.period
+
+    rrs, vvs = EnckePropagator(f=_f_J2).propagate_many(orbit._state, tofs)
+    expected_rrs, expected_vvs = CowellPropagator(
+        rtol=1e-13, f=_f_J2
+    ).propagate_many(orbit._state, tofs)
+
+    assert_quantity_allclose(rrs, expected_rrs, rtol=1e-7)
+    assert_quantity_allclose(vvs, expected_vvs, rtol=1e-7)
+
+
+def test_encke_propagates_backwards():
+    method = EnckePropagator(f=_f_J2)
+
+    state = method.propagate(molniya._state, -2 * molniya.period)
+    final_state = method.propagate(state, 2 * molniya.period)
+
+    assert_quantity_allclose(final_state.r, molniya.r, rtol=1e-9)
+    assert_quantity_allclose(final_state.v, molniya.v, rtol=1e-9)
+
+
+def test_encke_without_perturbations_follows_reference_conic():
+    tofs = np.linspace(0, 10, num=11) * molniya.period
+
+    rrs, vvs = EnckePropagator().propagate_many(molniya._state, tofs)
+    expected_rrs, expected_vvs = FarnocchiaPropagator().propagate_many(
+        molniya._state, tofs
+    )
+
+    assert_quantity_allclose(rrs, expected_rrs, rtol=1e-10)
+    assert_quantity_allclose(vvs, expected_vvs, rtol=1e-10)
+
+
+def test_encke_raises_for_python_function():
+    def f(t0, u_, k):
+        return func_twobody(t0, u_, k)
+
+    with pytest.raises(ValueError, match="jitted"):
+        EnckePropagator(f=f)
+
+
+@pytest.mark.parametrize("orbit", [iss, molniya])
+def test_equinoctial_agrees_with_cowell(orbit):
+    tofs = np.linspace(0, 5, num=11) * orbit.period
+
+    rrs, vvs = EquinoctialPropagator(f=_f_J2).propagate_many(
+        orbit._state, tofs
+    )
+    expected_rrs, expected_vvs = CowellPropagator(
+        rtol=1e-13, f=_f_J2
+    ).propagate_many(orbit._state, tofs)
+
+    assert_quantity_allclose(rrs, expected_rrs, rtol=1e-6)
+    assert_quantity_allclose(vvs, expected_vvs, rtol=1e-6)
+
+
+def test_equinoctial_propagator_builds_ephem():
+    epochs = molniya.epoch + np.linspace(-1, 1, num=5) * molniya.period
+
+    ephem = molniya.to_ephem(
+        EpochsArray(epochs, method=EquinoctialPropagator(f=_f_J2))
+    )
+    expected = molniya.to_ephem(
+        EpochsArray(epochs, method=CowellPropagator(rtol=1e-13, f=_f_J2))
+    )
+
+    assert ephem.epochs.shape == (5,)
+    # Cowell's method only extrapolates before the initial epoch
+    assert_quantity_allclose(
+        ephem.sample().xyz[:, 2:], expected.sample().xyz[:, 2:], rtol=1e-7
+    )
+
+
+def test_equinoctial_raises_for_python_function():
+    def f(t0, u_, k):
+        return func_twobody(t0, u_, k)
+
+    with pytest.raises(ValueError, match="jitted"):
+        EquinoctialPropagator(f=f)
+
+
+@pytest.mark.parametrize(
+    "orbit",
+    [
+        molniya,
+        Orbit.from_classical(
+            Earth,
+            40000 * u.km,
+            0.8 * u.one,
+            10 * u.deg,
+            0 * u.deg,
+            0 * u.deg,
+            0 * u.deg,
+        ),
+    ],
+)
+def test_ks_agrees_with_cowell(orbit):
+    tofs = np.linspace(0, 5, num=11) * orbit.period
+
+    rrs, vvs = KSPropagator(f=_f_J2).propagate_many(orbit._state, tofs)
+    expected_rrs, expected_vvs = CowellPropagator(
+        rtol=1e-13, f=_f_J2
+    ).propagate_many(orbit._state, tofs)
+
+    assert_quantity_allclose(rrs, expected_rrs, rtol=1e-6)
+    assert_quantity_allclose(vvs, expected_vvs, rtol=1e-6)
+
+
+def test_ks_propagates_backwards():
+    method = KSPropagator(f=_f_J2)
+
+    state = method.propagate(molniya._state, -2 * molniya.period)
+    final_state = method.propagate(state, 2 * molniya.period)
+
+    assert_quantity_allclose(final_state.r, molniya.r, rtol=1e-9)
+    assert_quantity_allclose(final_state.v, molniya.v, rtol=1e-9)
+
+
+@pytest.mark.parametrize(
+    "r", [[7000.0, -300.0, 200.0], [-7000.0, 300.0, 200.0]]
+)
+def test_ks_coordinates_roundtrip(r):
+    r = np.array(r)
+    v = np.array([0.1, 7.0, 1.0])
+
+    u, du = rv2ks(r, v)
+    r_, v_ = ks2rv(u, du)
+
+    assert_allclose(r_, r)
+    assert_allclose(v_, v)
+
+
+def test_ks_raises_for_python_function():
+    def f(t0, u_, k):
+        return func_twobody(t0, u_, k)
+
+    with pytest.raises(ValueError, match="jitted"):
+        KSPropagator(f=f)
+
+
 def test_propagate_to_date_has_proper_epoch():
     # Data from Vallado, example 2.4
     r0 = [1131.340, -2282.343, 6672.423] * u.km
@@ -474,3 +694,163 @@ def test_propagator_with_zero_eccentricity(propagator):
     assert_quantity_allclose(orbit.inc, res.inc)
     assert_quantity_allclose(orbit.raan, res.raan)
     assert_quantity_allclose(orbit.argp, res.argp)
+
+
+def test_j2_secular_follows_nodal_precession_of_cowell():
+    orbit = Orbit.from_classical(
+        Earth,
+        7000 * u.km,
+        0.001 * u.one,
+        51.6 * u.deg,
+        0 * u.deg,
+        0 * u.deg,
+        0 * u.deg,
+    )
+    tof = 10 * u.day
+
+    state = J2SecularPropagator().propagate(orbit._state, tof)
+    expected = (
+        CowellPropagator(f=_f_J2).propagate(orbit._state, tof).to_classical()
+    )
+
+    # Only the secular drift, of about 45 degrees, is modeled,
+    # and the initial osculating elements are taken as mean elements
+    assert_quantity_allclose(state.raan, expected.raan, atol=0.25 * u.deg)
+
+
+def test_j2_secular_sun_synchronous_orbit_precesses_one_turn_per_year():
+    a = 7077 * u.km
+    _, _, inc = heliosynchronous(
+        Earth.k,
+        Earth.R,
+        Earth.J2,
+        (360 * u.deg / (365.2422 * u.day)).to(u.rad / u.s).value / u.s,
+        a=a,
+        ecc=0 * u.one,
+    )
+    state = Orbit.from_classical(
+        Earth,
+        a,
+        0 * u.one,
+        inc,
+        0 * u.deg,
+        0 * u.deg,
+        0 * u.deg,
+    )._state
+
+    state = J2SecularPropagator().propagate(state, 365.2422 * u.day / 4)
+
+    assert_quantity_allclose(state.raan, 90 * u.deg, rtol=1e-10)
+
+
+def test_j2_secular_without_J2_is_keplerian():
+    tofs = np.linspace(-3, 10, num=14) * molniya.period
+
+    rrs, vvs = J2SecularPropagator(J2=0 * u.one).propagate_many(
+        molniya._state, tofs
+    )
+    expected_rrs, expected_vvs = FarnocchiaPropagator().propagate_many(
+        molniya._state, tofs
+    )
+
+    assert_quantity_allclose(rrs, expected_rrs, rtol=1e-10)
+    assert_quantity_allclose(vvs, expected_vvs, rtol=1e-10)
+
+
+def test_j2_secular_raises_for_hyperbolic_orbits():
+    orbit = Orbit.from_classical(
+        Earth,
+        -10000 * u.km,
+        1.5 * u.one,
+        10 * u.deg,
+        0 * u.deg,
+        0 * u.deg,
+        0 * u.deg,
+    )
+
+    with pytest.raises(ValueError, match="elliptic"):
+        J2SecularPropagator().propagate(orbit._state, 1 * u.h)
+
+
+def test_auto_selects_cheapest_accurate_propagator():
+    propagator = AutoPropagator()
+    hyperbolic = Orbit.from_classical(
+        Earth,
+        -10000 * u.km,
+        1.001 * u.one,
+        0 * u.deg,
+        0 * u.deg,
+        0 * u.deg,
+        1 * u.rad,
+    )
+
+    assert isinstance(
+        propagator.select(molniya._state, np.linspace(0, 1e6, 100)),
+        ValladoPropagator,
+    )
+    # The only propagator accurate for near parabolic hyperbolic orbits
+    assert isinstance(
+        propagator.select(hyperbolic._state, np.array([60.0])),
+        FarnocchiaPropagator,
+    )
+
+
+def test_auto_follows_cost_table():
+    cost_table = {
+        ("elliptic", "short"): {
+            "GoodingPropagator": (1, 1),
+            "ValladoPropagator": (100, 0.1),
+        },
+    }
+    propagator = AutoPropagator(cost_table=cost_table)
+
+    # The overhead of a single call dominates,
+    # while the cost per time of flight dominates long batches
+    assert isinstance(
+        propagator.select(iss._state, np.array([60.0])), GoodingPropagator
+    )
+    assert isinstance(
+        propagator.select(iss._state, np.linspace(0, 5000, 1000)),
+        ValladoPropagator,
+    )
+    # Regimes missing from the table use the fallback
+    assert isinstance(
+        propagator.select(iss._state, np.array([1e6])), FarnocchiaPropagator
+    )
+
+
+def test_auto_falls_back_when_propagator_fails():
+    class FailingPropagator(ValladoPropagator):
+        def propagate_many(self, state, tofs):
+            raise RuntimeError("Maximum number of iterations reached")
+
+    cost_table = {("elliptic", "short"): {"FailingPropagator": (0, 0)}}
+    propagator = AutoPropagator(
+        propagators=[FailingPropagator()], cost_table=cost_table
+    )
+    tofs = [10, 20, 30] * u.min
+
+    rrs, vvs = propagator.propagate_many(iss._state, tofs)
+    expected_rrs, expected_vvs = FarnocchiaPropagator().propagate_many(
+        iss._state, tofs
+    )
+
+    assert_quantity_allclose(rrs, expected_rrs)
+    assert_quantity_allclose(vvs, expected_vvs)
+
+
+def test_calibrate_cost_table_leaves_out_inapplicable_propagators():
+    cost_table = calibrate_cost_table(
+        [MarkleyPropagator(), ValladoPropagator()], num_tofs=5, repeat=1
+    )
+
+    assert set(cost_table[("elliptic", "short")]) == {
+        "MarkleyPropagator",
+        "ValladoPropagator",
+    }
+    assert set(cost_table[("hyperbolic", "long")]) == {"ValladoPropagator"}
+    assert all(
+        overhead >= 0 and per_tof >= 0
+        for costs in cost_table.values()
+        for overhead, per_tof in costs.values()
+    )
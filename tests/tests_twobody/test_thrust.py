@@ -1,4 +1,5 @@
 from astropy import units as u
+from numba import njit as jit
 import numpy as np
 from numpy.testing import assert_allclose
 import pytest
@@ -11,7 +12,7 @@ from boinor.core.thrust import (
 )
 from boinor.core.thrust.change_ecc_inc import beta as beta_change_ecc_inc
 from boinor.twobody import Orbit
-from boinor.twobody.propagation import CowellPropagator
+from boinor.twobody.propagation import CowellPropagator, EquinoctialPropagator
 from boinor.twobody.thrust import (
     change_a_inc,
     change_argp,
@@ -87,6 +88,40 @@ def test_leo_geo_numerical_fast(inc_0):
     assert_allclose(sf.inc.to(u.rad).value, inc_f, atol=2e-3)
 
 
+@pytest.mark.parametrize(
+    "inc_0",
+    [np.radians(28.5), np.radians(90.0)],
+)
+def test_leo_geo_equinoctial(inc_0):
+    f = 3.5e-7  # km / s2
+
+    a_0 = 7000.0  # km
+    a_f = 42166.0  # km
+    inc_f = 0.0  # rad
+
+    k = Earth.k.to(u.km**3 / u.s**2).value
+
+    a_d, _, t_f = change_a_inc_fast(k, a_0, a_f, inc_0, inc_f, f)
+
+    # Retrieve r and v from initial orbit
+    s0 = Orbit.circular(Earth, a_0 * u.km - Earth.R, inc_0 * u.rad)
+
+    # Propagate orbit
+    @jit
+    def f_leo_geo(t0, u_, k):
+        du = func_twobody(t0, u_, k)
+        du[3:] += a_d(t0, u_, k)
+        return du
+
+    sf = s0.propagate(
+        t_f * u.s, method=EquinoctialPropagator(rtol=1e-8, f=f_leo_geo)
+    )
+
+    assert_allclose(sf.a.to(u.km).value, a_f, rtol=1e-3)
+    assert_allclose(sf.ecc.value, 0.0, atol=1e-2)
+    assert_allclose(sf.inc.to(u.rad).value, inc_f, atol=2e-3)
+
+
 @pytest.mark.parametrize(
     "ecc_0,ecc_f",
     [[0.0, 0.1245], [0.1245, 0.0]],  # Reverse-engineered from results
@@ -0,0 +1,96 @@
+from astropy import units as u
+from astropy.tests.helper import assert_quantity_allclose
+from numba import njit as jit
+import numpy as np
+import pytest
+
+from boinor.bodies import Earth
+from boinor.core.perturbations import J2_perturbation
+from boinor.core.propagation import func_twobody
+from boinor.examples import iss, molniya
+from boinor.twobody import Trajectory
+from boinor.twobody.propagation import CowellPropagator, FarnocchiaPropagator
+
+J2_EARTH = Earth.J2.value
+R_EARTH = Earth.R.to_value(u.km)
+
+
+@jit
+def _f_J2(t0, u_, k):
+    du = func_twobody(t0, u_, k)
+    du[3:] += J2_perturbation(t0, u_, k, J2=J2_EARTH, R=R_EARTH)
+    return du
+
+
+def test_trajectory_matches_keplerian_orbit():
+    trajectory = molniya.to_trajectory(
+        3 * molniya.period, start=-molniya.period
+    )
+    epochs = molniya.epoch + np.linspace(-1, 3, num=101) * molniya.period
+
+    r, v = trajectory.rv(epochs)
+    expected_r, expected_v = FarnocchiaPropagator().propagate_many(
+        molniya._state, (epochs - molniya.epoch).to(u.s)
+    )
+
+    assert isinstance(trajectory, Trajectory)
+    assert_quantity_allclose(r, expected_r, atol=1e-4 * u.km)
+    assert_quantity_allclose(v, expected_v, atol=1e-7 * u.km / u.s)
+
+
+def test_trajectory_matches_perturbed_propagation():
+    method = CowellPropagator(f=_f_J2)
+    trajectory = iss.to_trajectory(1 * u.day, method=method)
+    tofs = [1, 10, 100, 1000] * u.min
+
+    r, v = trajectory.rv(tofs)
+    expected_r, expected_v = method.propagate_many(iss._state, tofs)
+
+    assert_quantity_allclose(r, expected_r, rtol=1e-8)
+    assert_quantity_allclose(v, expected_v, rtol=1e-8)
+
+
+def test_trajectory_scalar_epoch_returns_scalar_vectors():
+    trajectory = iss.to_trajectory(iss.epoch + 1 * u.h)
+
+    r, v = trajectory.rv(iss.epoch + 30 * u.min)
+    expected = iss.propagate(30 * u.min)
+
+    assert r.shape == v.shape == (3,)
+    assert_quantity_allclose(r, expected.r, rtol=1e-8)
+    assert_quantity_allclose(v, expected.v, rtol=1e-8)
+
+
+def test_trajectory_has_expected_span():
+    trajectory = iss.to_trajectory(2 * u.h, start=-1 * u.h)
+
+    assert_quantity_allclose((trajectory.start - iss.epoch).to(u.s), -1 * u.h)
+    assert_quantity_allclose((trajectory.end - iss.epoch).to(u.s), 2 * u.h)
+    assert trajectory.attractor is Earth
+    assert trajectory.plane is iss.plane
+
+
+def test_trajectory_raises_outside_of_span():
+    trajectory = iss.to_trajectory(1 * u.h)
+
+    with pytest.raises(ValueError, match="Times must be between"):
+        trajectory.rv([-1, 30] * u.min)
+
+
+def test_to_trajectory_raises_if_epoch_is_not_contained():
+    with pytest.raises(ValueError, match="must contain the epoch"):
+        iss.to_trajectory(2 * u.h, start=1 * u.h)
+
+
+def test_trajectory_backs_ephem():
+    trajectory = molniya.to_trajectory(molniya.period)
+    epochs = molniya.epoch + np.linspace(0, 1, num=5) * molniya.period
+    new_epochs = molniya.epoch + [0.1, 0.55, 0.9] * molniya.period
+
+    ephem = trajectory.to_ephem(epochs)
+    r, v = ephem.rv(new_epochs)
+    expected_r, expected_v = trajectory.rv(new_epochs)
+
+    assert ephem.epochs.shape == (5,)
+    assert_quantity_allclose(r, expected_r)
+    assert_quantity_allclose(v, expected_v)